@@ -0,0 +1,81 @@
+"""
+Run the normalizer benchmarks without asv.
+
+Each normalizer and corpus size is measured in a separate process,
+so the peak memory of one measurement does not affect the next.
+Results are written as CSV, for example::
+
+    python -m benchmarks --max-tokens 100000 --normalizer lobanov bark
+"""
+
+import argparse
+import csv
+import json
+import subprocess
+import sys
+
+from vlnm.registration import NORMALIZERS
+
+from .normalizers import MAX_TOKENS, SIZES, measure
+
+FIELDS = [
+    'normalizer', 'tokens', 'speakers', 'seconds',
+    'peak_rss', 'peak_rss_before', 'throughput', 'error']
+
+
+def _run_case(name, n_tokens, n_speakers):
+    code = (
+        'import json, sys\n'
+        'from benchmarks.normalizers import measure\n'
+        'json.dump(measure({!r}, {}, {}), sys.stdout)\n').format(
+            name, n_tokens, n_speakers)
+    process = subprocess.run(
+        [sys.executable, '-c', code],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True, check=False)
+    if process.returncode:
+        error = process.stderr.strip().splitlines()
+        return dict(
+            normalizer=name, tokens=n_tokens, speakers=n_speakers,
+            error=error[-1] if error else 'exit code {}'.format(process.returncode))
+    return json.loads(process.stdout)
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        '--normalizer', nargs='*', default=sorted(NORMALIZERS),
+        help='Normalizers to benchmark (default: all registered normalizers)')
+    parser.add_argument(
+        '--max-tokens', type=float, default=MAX_TOKENS,
+        help='Skip corpora with more tokens than this')
+    parser.add_argument(
+        '--in-process', action='store_true',
+        help='Measure in this process (faster, but peak memory is cumulative)')
+    parser.add_argument(
+        '--output', type=argparse.FileType('w'), default=sys.stdout,
+        help='CSV output file (default: standard output)')
+    args = parser.parse_args(argv)
+
+    writer = csv.DictWriter(args.output, FIELDS)
+    writer.writeheader()
+    for n_tokens, n_speakers in SIZES:
+        if n_tokens > args.max_tokens:
+            continue
+        for name in args.normalizer:
+            if args.in_process:
+                try:
+                    row = measure(name, n_tokens, n_speakers)
+                except Exception as error:  # pylint: disable=broad-except
+                    row = dict(
+                        normalizer=name, tokens=n_tokens, speakers=n_speakers,
+                        error='{}: {}'.format(type(error).__name__, error))
+            else:
+                row = _run_case(name, n_tokens, n_speakers)
+            writer.writerow(row)
+            args.output.flush()
+
+
+if __name__ == '__main__':
+    main()
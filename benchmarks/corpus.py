@@ -0,0 +1,105 @@
+"""
+Synthetic corpora
+~~~~~~~~~~~~~~~~~
+
+Generate corpora of arbitrary size with the same shape as
+the :func:`vlnm.pb1952` dataset (the same columns, categories and
+vowel labels), for benchmarking normalizers beyond the
+size of the bundled data.
+
+Formant values are drawn from normal distributions
+with the means and standard deviations of each speaker type and vowel
+in the Peterson and Barney data,
+scaled by a random factor for each speaker
+to mimic differences in vocal tract length.
+"""
+
+import functools
+
+import numpy as np
+import pandas as pd
+
+from vlnm import pb1952
+
+FORMANTS = ['f0', 'f1', 'f2', 'f3']
+
+# Proportion of men, women and children in pb1952.
+TYPES = ['m', 'w', 'c']
+TYPE_PROPORTIONS = [33 / 76, 28 / 76, 15 / 76]
+
+
+@functools.lru_cache(maxsize=1)
+def _reference():
+    df = pb1952()
+    vowels = list(df['vowel'].cat.categories)
+    ipa = (df[['vowel', 'IPA']].drop_duplicates()
+           .set_index('vowel')['IPA'].astype(str).reindex(vowels).values)
+    grouped = df.groupby(['type', 'vowel'], observed=True)[FORMANTS]
+    index = pd.MultiIndex.from_product([TYPES, vowels])
+    means = grouped.mean().reindex(index).values.reshape(len(TYPES), len(vowels), -1)
+    stds = grouped.std().reindex(index).values.reshape(len(TYPES), len(vowels), -1)
+    return vowels, ipa, means, stds
+
+
+@functools.lru_cache(maxsize=4)
+def synthetic_corpus(
+        n_tokens: int,
+        n_speakers: int,
+        seed: int = 1952) -> pd.DataFrame:
+    """Generate a synthetic corpus shaped like :func:`vlnm.pb1952`.
+
+    Tokens are divided as evenly as possible between speakers
+    and each speaker produces the vowels in turn,
+    so every speaker has tokens for every vowel
+    whenever they have at least as many tokens as there are vowels.
+
+    Parameters
+    ----------
+    n_tokens:
+        The number of rows in the corpus.
+    n_speakers:
+        The number of speakers.
+    seed:
+        Seed for the random number generator.
+
+    Returns
+    -------
+    :
+        A data frame with the same columns and data types as
+        :func:`vlnm.pb1952`.
+        The result is cached, so callers must not modify it in place.
+    """
+    rng = np.random.default_rng(seed)
+    vowels, ipa, means, stds = _reference()
+
+    types = rng.choice(len(TYPES), size=n_speakers, p=TYPE_PROPORTIONS)
+    sexes = np.where(
+        types == 0, 'm', np.where(types == 1, 'f', rng.choice(['f', 'm'], size=n_speakers)))
+    scales = rng.lognormal(0., 0.05, size=n_speakers)
+
+    speaker = np.repeat(
+        np.arange(n_speakers),
+        np.diff(np.linspace(0, n_tokens, n_speakers + 1).astype(int)))
+    starts = np.searchsorted(speaker, speaker)
+    vowel = (np.arange(n_tokens) - starts) % len(vowels)
+    speaker_type = types[speaker]
+
+    formants = (
+        means[speaker_type, vowel] +
+        rng.standard_normal((n_tokens, len(FORMANTS))) * stds[speaker_type, vowel])
+    formants *= scales[speaker, np.newaxis]
+    formants = np.maximum(np.rint(formants), 1.).astype(np.int64)
+
+    def _categorical(codes, categories):
+        return pd.Categorical.from_codes(codes, categories=categories)
+
+    df = pd.DataFrame({
+        'type': _categorical(speaker_type, TYPES),
+        'sex': pd.Categorical(sexes[speaker], categories=['f', 'm']),
+        'speaker': _categorical(speaker, [str(i + 1) for i in range(n_speakers)]),
+        'vowel': _categorical(vowel, vowels),
+        'IPA': pd.Categorical(ipa[vowel]),
+    })
+    for j, formant in enumerate(FORMANTS):
+        df[formant] = formants[:, j]
+    return df
@@ -0,0 +1,20 @@
+"""
+Import benchmarks
+~~~~~~~~~~~~~~~~~
+
+Time taken to import :mod:`vlnm` and to look up a normalizer
+in a fresh interpreter, to guard against
+normalizer modules (and their dependencies) being imported eagerly.
+"""
+
+
+class ImportSuite:
+    """Import time of the vlnm package."""
+
+    def timeraw_import_vlnm(self):
+        """Time ``import vlnm``."""
+        return 'import vlnm'
+
+    def timeraw_get_normalizer(self):
+        """Time importing vlnm and looking up the Lobanov normalizer."""
+        return 'import vlnm; vlnm.get_normalizer("lobanov")'
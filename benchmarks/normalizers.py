@@ -0,0 +1,139 @@
+"""
+Normalizer benchmarks
+~~~~~~~~~~~~~~~~~~~~~
+
+Benchmarks for every normalizer in :data:`vlnm.registration.NORMALIZERS`
+on synthetic corpora (see :mod:`benchmarks.corpus`)
+ranging from 1 thousand to 10 million tokens.
+The classes follow the `asv <https://asv.readthedocs.io>`_ conventions,
+so the suite can be run with ``asv run`` from the repository root;
+the module can also be run without asv using ``python -m benchmarks``.
+
+Corpora larger than ``VLNM_BENCHMARK_MAX_TOKENS`` tokens
+(one million by default) are skipped.
+"""
+
+import os
+import resource
+import time
+
+from vlnm.registration import NORMALIZERS, get_normalizer
+
+from .corpus import FORMANTS, synthetic_corpus
+
+# (tokens, speakers)
+SIZES = [
+    (1_000, 10),
+    (10_000, 100),
+    (100_000, 1_000),
+    (1_000_000, 10_000),
+    (10_000_000, 100_000),
+]
+
+MAX_TOKENS = int(float(os.environ.get('VLNM_BENCHMARK_MAX_TOKENS', 1e6)))
+
+_PROJECTION = dict(columns=FORMANTS, n_components=2)
+
+# Keyword arguments needed to run each normalizer on a pb1952 shaped corpus.
+NORMALIZER_KWARGS = {
+    'bigham': dict(
+        points=dict(
+            kit='ih', goose='uw', fleece='iy',
+            start='aa', thought='ao', trap='ae')),
+    'bladen': dict(gender='sex', female='f', male='m'),
+    'factor-analysis': _PROJECTION,
+    'fast-ica': _PROJECTION,
+    'lda': dict(vowel='vowel', **_PROJECTION),
+    'nmf': _PROJECTION,
+    'nordstrom': dict(gender='sex', female='f', male='m'),
+    'pca': _PROJECTION,
+    'schwa': dict(schwa='er'),
+    'wattfab1': dict(trap='ae', fleece='iy'),
+    'wattfab2': dict(trap='ae', fleece='iy'),
+    'wattfab3': dict(trap='ae', fleece='iy'),
+}
+
+
+def make_normalizer(name: str):
+    """Instantiate a registered normalizer with benchmark settings."""
+    if name == 'chain':
+        return get_normalizer(name)(
+            [make_normalizer('bark'), make_normalizer('lobanov')])
+    return get_normalizer(name)(**NORMALIZER_KWARGS.get(name, {}))
+
+
+def measure(name: str, n_tokens: int, n_speakers: int) -> dict:
+    """Time a single normalization and record the peak memory.
+
+    The peak resident set size is reported for the whole process,
+    so this should be called in a fresh process for each measurement
+    (as the runner in :mod:`benchmarks.__main__` does).
+
+    Parameters
+    ----------
+    name:
+        The name of a registered normalizer.
+    n_tokens:
+        The number of tokens in the corpus.
+    n_speakers:
+        The number of speakers in the corpus.
+
+    Returns
+    -------
+    :
+        A dictionary with the wall time in seconds,
+        the peak resident set size in bytes (before and after normalizing)
+        and the throughput in tokens per second.
+    """
+    df = synthetic_corpus(n_tokens, n_speakers)
+    normalizer = make_normalizer(name)
+    rss_before = _peak_rss()
+    start = time.perf_counter()
+    normalizer.normalize(df.copy())
+    seconds = time.perf_counter() - start
+    return dict(
+        normalizer=name,
+        tokens=n_tokens,
+        speakers=n_speakers,
+        seconds=seconds,
+        peak_rss=_peak_rss(),
+        peak_rss_before=rss_before,
+        throughput=n_tokens / seconds)
+
+
+def _peak_rss(who=resource.RUSAGE_SELF):
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    scale = 1 if os.uname().sysname == 'Darwin' else 1024
+    return resource.getrusage(who).ru_maxrss * scale
+
+
+class NormalizerSuite:
+    """Wall time, peak memory and throughput of each normalizer."""
+
+    params = (sorted(NORMALIZERS), SIZES)
+    param_names = ['normalizer', 'size']
+    timeout = 3600
+
+    def setup(self, name, size):
+        n_tokens, n_speakers = size
+        if n_tokens > MAX_TOKENS:
+            raise NotImplementedError(
+                'Corpus larger than VLNM_BENCHMARK_MAX_TOKENS')
+        self.df = synthetic_corpus(n_tokens, n_speakers)
+        self.normalizer = make_normalizer(name)
+
+    def time_normalize(self, name, size):
+        """Wall time to normalize the corpus."""
+        self.normalizer.normalize(self.df.copy())
+
+    def peakmem_normalize(self, name, size):
+        """Peak memory while normalizing the corpus."""
+        self.normalizer.normalize(self.df.copy())
+
+    def track_throughput(self, name, size):
+        """Tokens normalized per second."""
+        start = time.perf_counter()
+        self.normalizer.normalize(self.df.copy())
+        return size[0] / (time.perf_counter() - start)
+
+    track_throughput.unit = 'tokens/s'
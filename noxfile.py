@@ -29,3 +29,13 @@ def test(session):
         '--cov=vlnm',
         '--cov-report=term-missing',
         'tests')
+
+
+@nox.session
+def benchmark(session):
+    """
+    Benchmark
+    """
+    session.install('-r', 'requirements.txt')
+    session.env['PYTHONPATH'] = '.'
+    session.run('python', '-m', 'benchmarks', *session.posargs)
@@ -72,7 +72,9 @@ def setup_vlnm():
         install_requires=REQUIREMENTS,
         classifiers=CLASSIFIERS,
         extras_require={
-            'dev': REQUIREMENTS_DEV
+            'dev': REQUIREMENTS_DEV,
+            'numba': ['numba'],
+            'arrow': ['pyarrow']
         },
         python_requires='>=3.6',
         zip_safe=False,
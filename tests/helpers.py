@@ -9,6 +9,7 @@ import pandas as pd
 import pandas.testing
 
 from vlnm.normalizers.base import Normalizer
+from vlnm.stats import factorize, StatisticsCache
 
 # There are issues wth pandas and pylint
 # See https://github.com/PyCQA/pylint/issues/2198 for some discussion.
@@ -206,6 +207,22 @@ class Helper:
             actual = self.normalizer().normalize(self.df)
             assert_frame_equal(actual, expected)
 
+        def test_inverse_transform(self):
+            """Test inverse transform recovers the original data."""
+            normalizer = self.normalizer()
+            actual = normalizer.inverse_transform(normalizer.normalize(self.df.copy()))
+            assert_frame_equal(actual, self.df)
+
+        def test_normalize_arrays(self):
+            """Normalizing arrays matches normalizing the data frame."""
+            normalizer = self.normalizer()
+            expected = normalizer.normalize(self.df.copy())[self.formants].values
+            values = self.df[self.formants].values.astype(float)
+            out = np.empty_like(values)
+            actual = normalizer.normalize_arrays(values, formants=self.formants, out=out)
+            self.assertIs(actual, out)
+            np.testing.assert_allclose(actual, expected)
+
     class SpeakerNormalizerTests(TestNormalizerBase):
         """Common tests for the speaker normalizers."""
 
@@ -221,3 +238,59 @@ class Helper:
             df = self.df.copy()
             with self.assertRaises(ValueError):
                 self.normalizer(speaker='talker', **self.kwargs).normalize(df)
+
+    class VectorizedSpeakerNormalizerTests(SpeakerNormalizerTests):
+        """Common tests for speaker normalizers which normalize arrays."""
+
+        def test_normalize_arrays(self):
+            """Normalizing arrays matches normalizing the data frame."""
+            normalizer = self.normalizer(**self.kwargs)
+            expected = normalizer.normalize(self.df.copy())[self.formants].values
+            codes, _ = factorize(self.df['speaker'])
+            vowel_codes, vowels = factorize(self.df['vowel'])
+            actual = normalizer.normalize_arrays(
+                self.df[self.formants].values,
+                speaker_codes=codes,
+                vowel_codes=vowel_codes,
+                vowel_labels=vowels,
+                formants=self.formants)
+            self.assertFalse(np.isnan(actual).all())
+            np.testing.assert_allclose(actual, expected)
+
+        def test_normalize_arrays_speaker(self):
+            """Normalizing arrays requires speaker codes."""
+            with self.assertRaises(ValueError):
+                self.normalizer(**self.kwargs).normalize_arrays(
+                    self.df[self.formants].values, formants=self.formants)
+
+        def test_stats_cache(self):
+            """Cached speaker statistics give the same result."""
+            expected = self.normalizer(**self.kwargs).normalize(self.df.copy())
+            cache = StatisticsCache()
+            normalizer = self.normalizer(stats_cache=cache, **self.kwargs)
+            normalizer.normalize(self.df.copy())
+            actual = normalizer.normalize(self.df.copy())
+            assert_frame_equal(actual, expected)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        def test_stats_cache_partial_fit(self):
+            """Fitting chunks does not change cached speaker statistics."""
+            chunks = [self.df.iloc[:len(self.df) // 2], self.df.iloc[len(self.df) // 2:]]
+            expected = self.normalizer(**self.kwargs).normalize(chunks[0].copy())
+            cache = StatisticsCache()
+            normalizer = self.normalizer(stats_cache=cache, **self.kwargs)
+            for chunk in chunks:
+                normalizer.partial_fit(chunk.copy())
+            actual = self.normalizer(stats_cache=cache, **self.kwargs).normalize(
+                chunks[0].copy())
+            assert_frame_equal(actual, expected)
+
+        def test_groupby(self):
+            """Speakers nested within groups."""
+            df = self.df.copy()
+            df['speaker'] = df['speaker'] % 2
+            actual = self.normalizer(groupby=['group', 'test'], **self.kwargs).normalize(df.copy())
+            expected = pd.concat([
+                self.normalizer(**self.kwargs).normalize(group_df.copy())
+                for _, group_df in df.groupby(['group', 'test'])]).loc[df.index]
+            assert_frame_equal(actual, expected)
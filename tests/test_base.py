@@ -1,14 +1,27 @@
 """
 Tests for the base module
 """
+import pickle
+import unittest
 
+import numpy as np
+import pandas as pd
+
+import vlnm
+from vlnm.conversion import hz_to_bark
 from vlnm.normalizers.base import (
     FormantGenericNormalizer,
     FormantSpecificNormalizer,
     FormantsTransformNormalizer,
     Normalizer)
+from vlnm.normalizers.formant import BarkNormalizer
+from vlnm.normalizers.gender import NordstromNormalizer
+from vlnm.normalizers.speaker import LobanovNormalizer
+from vlnm.normalizers.base import ChainNormalizer, NormalizerBundle, _fuse_transforms
+from vlnm.normalizers.formant import LogNormalizer
+from vlnm.normalizers.speaker import NearyGMNormalizer
 
-from tests.helpers import Helper
+from tests.helpers import assert_frame_equal, get_test_dataframe, Helper
 
 
 class TestBaseNormalizers(Helper.TestNormalizerBase):
@@ -52,3 +65,346 @@ class TestBaseNormalizers(Helper.TestNormalizerBase):
         expected = dict(columns=[], keywords=[], options=dict(transform=True), outputs=[])
         actual = Subclass()
         self.assertDictEqual(actual.config, expected)
+
+
+class DifferenceNormalizer(FormantSpecificNormalizer):
+    """Subtract F1 from F2."""
+
+    def _norm(self, df):
+        f1, f2 = self.params['f1'], self.params['f2']
+        df[f2] = df[f2] - df[f1]
+        return df
+
+
+class TestFormantSpecificNormalizer(unittest.TestCase):
+    """
+    Tests for normalizing multiple columns for each formant.
+    """
+
+    def setUp(self):
+        self.df = pd.DataFrame(dict(
+            f1_1=[500., 600.],
+            f1_2=[550., 650.],
+            f2_1=[1500., 1600.],
+            f2_2=[1550., 1650.]))
+
+    def test_formant_columns(self):
+        """Each column set normalized separately."""
+        actual = DifferenceNormalizer(
+            f1=['f1_1', 'f1_2'], f2=['f2_1', 'f2_2']).normalize(self.df.copy())
+        expected = self.df.copy()
+        expected['f2_1'] = [1000., 1000.]
+        expected['f2_2'] = [1000., 1000.]
+        assert_frame_equal(actual, expected)
+
+    def test_rename(self):
+        """Renamed columns appended in order."""
+        actual = DifferenceNormalizer(
+            f1=['f1_1', 'f1_2'], f2=['f2_1', 'f2_2'],
+            rename='{}*').normalize(self.df.copy())
+        self.assertListEqual(
+            list(actual.columns),
+            list(self.df.columns) + ['f1_1*', 'f2_1*', 'f1_2*', 'f2_2*'])
+        assert_frame_equal(actual[self.df.columns], self.df)
+
+    def test_integer_columns(self):
+        """Integer columns are not converted to floating point."""
+        df = self.df.astype(int)
+        actual = DifferenceNormalizer(
+            f1=['f1_1', 'f1_2'], f2=['f2_1', 'f2_2']).normalize(df.copy())
+        self.assertTrue((actual.dtypes == int).all())
+
+
+class TestAssignOutputs(unittest.TestCase):
+    """
+    Tests for writing the output columns.
+    """
+
+    def setUp(self):
+        self.df = pd.DataFrame(dict(
+            f1=[500., 600.],
+            f2=[1500., 1600.],
+            vowel=pd.Categorical(['i', 'a']),
+            time=pd.date_range('2019-01-01', periods=2, tz='UTC')))
+
+    def test_input_unchanged(self):
+        """The data frame passed in is not changed."""
+        for rename in [None, '{}*']:
+            df = self.df.copy()
+            DifferenceNormalizer(f1='f1', f2='f2', rename=rename).normalize(df)
+            assert_frame_equal(df, self.df)
+
+    def test_dtypes(self):
+        """Other columns keep their dtypes when columns are overwritten."""
+        actual = DifferenceNormalizer(f1='f1', f2='f2').normalize(self.df.copy())
+        expected = self.df.copy()
+        expected['f2'] = [1000., 1000.]
+        assert_frame_equal(actual, expected)
+
+    def test_duplicate_columns(self):
+        """Duplicate column labels are kept when columns are overwritten."""
+        df = pd.concat([self.df, self.df[['vowel']]], axis=1)
+        actual = DifferenceNormalizer(f1='f1', f2='f2').normalize(df.copy())
+        expected = df.copy()
+        expected['f2'] = [1000., 1000.]
+        assert_frame_equal(actual, expected)
+
+
+class TestPlan(unittest.TestCase):
+    """
+    Tests for caching normalization plans.
+    """
+
+    def setUp(self):
+        self.df = pd.DataFrame(dict(
+            f1=[500., 600.],
+            f2=[1500., 1600.]))
+
+    def test_plan_reused(self):
+        """Same columns reuse the plan."""
+        normalizer = DifferenceNormalizer()
+        expected = normalizer.normalize(self.df.copy())
+        plan = normalizer.plan
+        for _ in range(2):
+            actual = normalizer.normalize(self.df.copy())
+            self.assertIs(normalizer.plan, plan)
+            assert_frame_equal(actual, expected)
+        self.assertEqual(len(normalizer.plans), 1)
+
+    def test_plan_schema(self):
+        """Different columns or options use a different plan."""
+        normalizer = DifferenceNormalizer()
+        normalizer.normalize(self.df.copy())
+        normalizer.normalize(self.df.copy())
+        plan = normalizer.plan
+        df = self.df.copy()
+        df['speaker'] = 1
+        normalizer.normalize(df)
+        self.assertIsNot(normalizer.plan, plan)
+        actual = normalizer.normalize(self.df.copy(), rename='{}*')
+        self.assertIsNot(normalizer.plan, plan)
+        self.assertListEqual(list(actual.columns), ['f1', 'f2', 'f1*', 'f2*'])
+
+    def test_plan_cache_size(self):
+        """Least recently used plans are discarded."""
+        normalizer = DifferenceNormalizer()
+        normalizer.PLAN_CACHE_SIZE = 2
+        for i in range(4):
+            df = self.df.copy()
+            df['column{}'.format(i)] = i
+            normalizer.normalize(df)
+        self.assertEqual(len(normalizer.plans), 2)
+
+    def test_pickle(self):
+        """Plans are not pickled."""
+        normalizer = DifferenceNormalizer()
+        normalizer.normalize(self.df.copy())
+        normalizer = pickle.loads(pickle.dumps(normalizer))
+        self.assertIsNone(normalizer.plan)
+        self.assertEqual(len(normalizer.plans), 0)
+
+
+class TestRequiredColumns(unittest.TestCase):
+    """
+    Tests for the columns required by a normalizer.
+    """
+
+    def setUp(self):
+        self.columns = list(get_test_dataframe().columns)
+
+    def test_required_columns(self):
+        """Speaker and formant columns in data set order."""
+        actual = LobanovNormalizer(formants=['f1', 'f2']).required_columns(self.columns)
+        self.assertListEqual(actual, ['speaker', 'f1', 'f2'])
+
+    def test_groupby(self):
+        """Group columns are required."""
+        actual = LobanovNormalizer(groupby='test').required_columns(self.columns)
+        self.assertListEqual(actual, ['test', 'speaker', 'f0', 'f1', 'f2', 'f3'])
+
+    def test_bundle(self):
+        """Columns required by any normalizer in a bundle."""
+        actual = NormalizerBundle(
+            [BarkNormalizer(formants='f1'), LobanovNormalizer(formants='f2')]
+        ).required_columns(self.columns)
+        self.assertListEqual(actual, ['speaker', 'f1', 'f2'])
+
+
+class TestMissingGroups(unittest.TestCase):
+    """
+    Tests for rows with a missing group label.
+    """
+
+    def setUp(self):
+        self.df = get_test_dataframe()
+        self.df['group'] = self.df['group'].astype(object)
+        self.missing = np.arange(len(self.df)) % 7 == 0
+        self.df.loc[self.missing, 'group'] = None
+        self.formants = ['f0', 'f1', 'f2', 'f3']
+
+    def test_rows_kept(self):
+        """Rows are kept with missing outputs."""
+        for normalizer in [NordstromNormalizer, LobanovNormalizer, BarkNormalizer]:
+            df = self.df.copy()
+            actual = normalizer(groupby='group').normalize(df.copy())
+            self.assertTrue(actual.index.equals(df.index))
+            self.assertTrue(actual.loc[self.missing, 'f3'].isna().all())
+            expected = normalizer(groupby='group').normalize(df[~self.missing].copy())
+            assert_frame_equal(actual[~self.missing], expected)
+
+    def test_all_missing(self):
+        """Rows are kept if all group labels are missing."""
+        df = self.df.copy()
+        df['group'] = None
+        for normalizer in [NordstromNormalizer, LobanovNormalizer, BarkNormalizer]:
+            actual = normalizer(groupby='group').normalize(df.copy())
+            self.assertEqual(len(actual), len(df))
+            self.assertTrue(actual['f3'].isna().all())
+
+
+class TestNormalizeArrays(unittest.TestCase):
+    """
+    Tests for normalizing arrays.
+    """
+
+    def setUp(self):
+        self.values = np.array([
+            [500., 1500.],
+            [600., 1650.],
+            [550., 1400.],
+            [700., 1800.]])
+        self.speakers = np.array([0, 0, 1, 1])
+
+    def test_fallback(self):
+        """Normalizers without an array method use a data frame."""
+        actual = DifferenceNormalizer().normalize_arrays(self.values, formants=['f1', 'f2'])
+        expected = self.values.copy()
+        expected[:, 1] -= expected[:, 0]
+        self.assertTrue(np.array_equal(actual, expected))
+
+    def test_out(self):
+        """Output written to the given array."""
+        out = np.empty_like(self.values)
+        actual = DifferenceNormalizer().normalize_arrays(
+            self.values, formants=['f1', 'f2'], out=out)
+        self.assertIs(actual, out)
+
+    def test_shape(self):
+        """Formants must match the columns."""
+        with self.assertRaises(ValueError):
+            BarkNormalizer().normalize_arrays(self.values[:, 0])
+        with self.assertRaises(ValueError):
+            BarkNormalizer().normalize_arrays(self.values, formants=['f1'])
+
+    def test_chain(self):
+        """Chained normalizers applied in turn."""
+        normalizer = ChainNormalizer(normalizers=[BarkNormalizer(), LobanovNormalizer()])
+        expected = LobanovNormalizer().normalize_arrays(
+            hz_to_bark(self.values), speaker_codes=self.speakers, formants=['f1', 'f2'])
+        actual = normalizer.normalize_arrays(
+            self.values, speaker_codes=self.speakers, formants=['f1', 'f2'])
+        self.assertTrue(np.allclose(actual, expected))
+
+
+class TestChainNormalizer(unittest.TestCase):
+    """
+    Tests for the ChainNormalizer class.
+    """
+
+    def setUp(self):
+        self.df = get_test_dataframe()
+        self.formants = ['f0', 'f1', 'f2', 'f3']
+
+    def test_fused(self):
+        """Consecutive transforms fused."""
+        normalizers = [BarkNormalizer(), LogNormalizer()]
+        _, fused = _fuse_transforms(normalizers, list(self.df.columns))
+        self.assertEqual(fused, 2)
+        expected = LogNormalizer().normalize(BarkNormalizer().normalize(self.df.copy()))
+        actual = ChainNormalizer(normalizers).normalize(self.df.copy())
+        assert_frame_equal(actual, expected)
+
+    def test_fused_unchanged(self):
+        """Fusing transforms does not change the normalizers."""
+        normalizers = [BarkNormalizer(), LogNormalizer()]
+        normalizers[0].normalize(self.df.copy())
+        options, plan = normalizers[0].options.copy(), normalizers[0].plan
+        _fuse_transforms(normalizers, list(self.df.columns))
+        self.assertDictEqual(normalizers[0].options, options)
+        self.assertIs(normalizers[0].plan, plan)
+        self.assertIsNone(normalizers[1].plan)
+
+    def test_not_fused_intermediate(self):
+        """Transforms writing kept intermediate columns not fused."""
+        normalizers = [
+            BarkNormalizer(formants=['f1', 'f2'], rename='{}*'),
+            LogNormalizer(formants=['f1*', 'f2*'], rename='{}L')]
+        _, fused = _fuse_transforms(normalizers, list(self.df.columns))
+        self.assertEqual(fused, 1)
+        _, fused = _fuse_transforms(
+            normalizers, list(self.df.columns), keep_intermediate=False)
+        self.assertEqual(fused, 2)
+
+    def test_keep_intermediate(self):
+        """Intermediate columns removed."""
+        normalizers = [
+            BarkNormalizer(formants=['f1', 'f2'], rename='{}*'),
+            LogNormalizer(formants=['f1*', 'f2*'], rename='{}L'),
+            LobanovNormalizer(formants=['f1*L', 'f2*L'])]
+        expected = ChainNormalizer(normalizers).normalize(self.df.copy())
+        expected = expected.drop(columns=['f1*', 'f2*'])
+        actual = ChainNormalizer(
+            normalizers, keep_intermediate=False).normalize(self.df.copy())
+        assert_frame_equal(actual, expected)
+
+    def test_keep_last_outputs(self):
+        """Intermediate columns overwritten by the last normalizer kept."""
+        normalizers = [
+            BarkNormalizer(rename='{}*'),
+            LobanovNormalizer(formants=['f1*', 'f2*'])]
+        columns = list(self.df.columns)
+        df = ChainNormalizer(normalizers, keep_intermediate=False).normalize(self.df)
+        self.assertListEqual(list(df.columns), columns + ['f1*', 'f2*'])
+
+
+class TestNormalizerBundle(unittest.TestCase):
+    """
+    Tests for the NormalizerBundle class.
+    """
+
+    def setUp(self):
+        self.df = get_test_dataframe()
+
+    def test_outputs(self):
+        """Each normalizer gives the same output as when run alone."""
+        normalizers = [
+            LobanovNormalizer(), NearyGMNormalizer(),
+            BarkNormalizer(), DifferenceNormalizer()]
+        actual = NormalizerBundle(normalizers).normalize(self.df.copy())
+        for normalizer, name in zip(
+                normalizers, ['lobanov', 'nearygm', 'bark', 'differencenormalizer']):
+            expected = type(normalizer)(rename='{}_' + name).normalize(self.df.copy())
+            columns = [column for column in expected if column not in self.df]
+            self.assertTrue(columns)
+            assert_frame_equal(actual[columns], expected[columns])
+
+    def test_input_unchanged(self):
+        """Input data frame is not modified."""
+        df = self.df.copy()
+        NormalizerBundle(['lobanov', 'bark']).normalize(df)
+        assert_frame_equal(df, self.df)
+
+    def test_rename(self):
+        """Rename options given for each normalizer."""
+        df = NormalizerBundle(
+            ['lobanov', 'lobanov', 'bark'],
+            rename={'lobanov': '{}*', 'bark': '{}B'}).normalize(self.df)
+        for column in ['f1*', 'f1_lobanov2', 'f1B']:
+            self.assertIn(column, df)
+
+    def test_not_registered(self):
+        """Bundles are not listed as normalizers, but are used for several methods."""
+        self.assertNotIn('bundle', vlnm.list_normalizers())
+        actual = vlnm.normalize(self.df.copy(), method=['lobanov', 'bark'])
+        expected = NormalizerBundle(['lobanov', 'bark']).normalize(self.df.copy())
+        assert_frame_equal(actual, expected)
@@ -0,0 +1,141 @@
+"""
+Tests for the vlnm.cache module.
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import vlnm
+from vlnm.cache import canonical, ResultCache
+from vlnm.normalizers.speaker import LobanovNormalizer
+from tests.helpers import assert_frame_equal, get_test_dataframe
+
+
+class TestCanonical(unittest.TestCase):
+    """
+    Tests for the canonical function.
+    """
+
+    def test_dict_order(self):
+        """Dictionary order does not matter."""
+        self.assertEqual(canonical(dict(a=1, b=[2])), canonical(dict(b=[2], a=1)))
+
+    def test_types(self):
+        """Lists and tuples are distinguished."""
+        self.assertNotEqual(canonical([1, 2]), canonical((1, 2)))
+
+    def test_arrays(self):
+        """Arrays are serialized by their contents."""
+        self.assertEqual(canonical(np.arange(3)), canonical(np.arange(3)))
+        self.assertNotEqual(canonical(np.arange(3)), canonical(np.arange(1, 4)))
+
+    def test_callables(self):
+        """Named functions are serialized, lambdas are not."""
+        self.assertIn('numpy', canonical(np.log))
+        with self.assertRaises(TypeError):
+            canonical(lambda x: x)
+
+
+class TestResultCache(unittest.TestCase):
+    """
+    Tests for the ResultCache class.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = ResultCache(self.tmp_dir.name)
+        self.df = get_test_dataframe()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_hit(self):
+        """Cached results are the same as the normalized data."""
+        for kwargs in [{}, dict(rename='{}*'), dict(groupby='group')]:
+            expected = LobanovNormalizer(**kwargs).normalize(self.df.copy())
+            normalizer = LobanovNormalizer(result_cache=self.cache, **kwargs)
+            assert_frame_equal(normalizer.normalize(self.df.copy()), expected)
+            assert_frame_equal(normalizer.normalize(self.df.copy()), expected)
+        self.assertEqual((self.cache.hits, self.cache.misses), (3, 3))
+
+    def test_unused_columns(self):
+        """Changing unused columns does not invalidate results."""
+        normalizer = LobanovNormalizer(result_cache=self.cache, formants=['f1', 'f2'])
+        normalizer.normalize(self.df.copy())
+        df = self.df.copy()
+        df['f3'] = 0.
+        actual = normalizer.normalize(df.copy())
+        self.assertEqual(self.cache.hits, 1)
+        assert_frame_equal(actual, LobanovNormalizer(formants=['f1', 'f2']).normalize(df))
+
+    def test_different_unused_columns(self):
+        """Unused columns are taken from the data frame."""
+        normalizer = LobanovNormalizer(result_cache=self.cache, rename='{}*')
+        df = self.df.copy()
+        df['extra'] = 1.
+        normalizer.normalize(df)
+        df = self.df.copy()
+        df['other'] = 2.
+        actual = normalizer.normalize(df.copy())
+        self.assertEqual(self.cache.hits, 1)
+        assert_frame_equal(actual, LobanovNormalizer(rename='{}*').normalize(df))
+
+    def test_used_columns(self):
+        """Changing used columns invalidates results."""
+        normalizer = LobanovNormalizer(result_cache=self.cache)
+        normalizer.normalize(self.df.copy())
+        df = self.df.copy()
+        df['f1'] += 1.
+        normalizer.normalize(df)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 2))
+
+    def test_options(self):
+        """Results depend on the normalizer options."""
+        LobanovNormalizer(result_cache=self.cache).normalize(self.df.copy())
+        LobanovNormalizer(result_cache=self.cache, rename='{}*').normalize(self.df.copy())
+        LobanovNormalizer(result_cache=self.cache, n_jobs=1).normalize(self.df.copy())
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+    def test_uncacheable(self):
+        """Normalizers with options that cannot be serialized are not cached."""
+        normalizer = vlnm.get_normalizer('log')(
+            transform=lambda x: x, result_cache=self.cache)
+        normalizer.normalize(self.df.copy())
+        self.assertEqual(os.listdir(self.tmp_dir.name), [])
+
+    def test_maxbytes(self):
+        """Least recently used results are removed."""
+        LobanovNormalizer(result_cache=self.cache).normalize(self.df.copy())
+        self.cache.maxbytes = self.cache.nbytes * 3 // 2
+        LobanovNormalizer(result_cache=self.cache, rename='{}*').normalize(self.df.copy())
+        self.assertLessEqual(self.cache.nbytes, self.cache.maxbytes)
+        LobanovNormalizer(result_cache=self.cache, rename='{}*').normalize(self.df.copy())
+        LobanovNormalizer(result_cache=self.cache).normalize(self.df.copy())
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 3))
+
+    def test_normalize(self):
+        """Results of vlnm.normalize are cached."""
+        cache = ResultCache(self.tmp_dir.name, format='parquet')
+        expected = vlnm.normalize(self.df.copy(), method='neary')
+        vlnm.normalize(self.df.copy(), method='neary', result_cache=cache)
+        actual = vlnm.normalize(self.df.copy(), method='neary', result_cache=cache)
+        assert_frame_equal(actual, expected)
+        self.assertEqual(cache.hits, 1)
+
+    def test_normalize_methods(self):
+        """Results of each method given to vlnm.normalize are cached."""
+        expected = vlnm.normalize(self.df.copy(), method=['lobanov', 'bark'])
+        vlnm.normalize(self.df.copy(), method=['lobanov', 'bark'], result_cache=self.cache)
+        actual = vlnm.normalize(
+            self.df.copy(), method=['lobanov', 'bark'], result_cache=self.cache)
+        assert_frame_equal(actual, expected)
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 2))
+
+    def test_clear(self):
+        """Clearing the cache removes the results."""
+        LobanovNormalizer(result_cache=self.cache).normalize(self.df.copy())
+        self.cache.clear()
+        self.assertEqual(self.cache.nbytes, 0)
@@ -4,6 +4,8 @@ Tests for 'centroid' normalizers
 
 import unittest
 
+import numpy as np
+
 from vlnm.normalizers.centroid import (
     _get_apice_formants,
     BighamNormalizer,
@@ -11,6 +13,7 @@ from vlnm.normalizers.centroid import (
     WattFabriciusNormalizer,
     WattFabricius2Normalizer,
     WattFabricius3Normalizer)
+from vlnm.stats import factorize
 from tests.test_speaker_normalizers import Helper
 from tests.helpers import (
     get_test_dataframe,
@@ -70,6 +73,19 @@ class TestWattFabriciusNormalizer(Helper.SpeakerNormalizerTests):
             formants=self.formants,
             points=dict(fleece='i', trap='a'))
 
+    test_normalize_arrays = Helper.VectorizedSpeakerNormalizerTests.test_normalize_arrays
+
+    def test_normalize_arrays_labels(self):
+        """Points which are not vowel codes require vowel labels."""
+        speaker_codes, _ = factorize(self.df['speaker'])
+        vowel_codes, _ = factorize(self.df['vowel'])
+        with self.assertRaises(ValueError):
+            self.normalizer(**dict(self.kwargs, formants=['f1', 'f2'])).normalize_arrays(
+                self.df[['f1', 'f2']].values,
+                speaker_codes=speaker_codes,
+                vowel_codes=vowel_codes,
+                formants=['f1', 'f2'])
+
     def test_new_columns(self):
         """Check new columns returned."""
         rename = '{}*'
@@ -102,6 +118,24 @@ class TestWattFabriciusNormalizer(Helper.SpeakerNormalizerTests):
 
         assert_series_equal(actual, expected)
 
+    def test_speakers(self):
+        """Centroids for all speakers match the centroid of each speaker."""
+        normalizer = self.normalizer(**self.kwargs)
+        actual = normalizer.normalize(self.df.copy())
+        for _, speaker_df in self.df.groupby('speaker'):
+            centroid = self.normalizer.get_centroid(
+                speaker_df, **normalizer.default_options)
+            expected = speaker_df[['f1', 'f2']] / centroid[['f1', 'f2']].values
+            np.testing.assert_allclose(
+                actual.loc[speaker_df.index, ['f1', 'f2']].values, expected.values)
+
+    def test_fit(self):
+        """Fitted centroids give the same result."""
+        expected = self.normalizer(**self.kwargs).normalize(self.df.copy())
+        normalizer = self.normalizer(**self.kwargs).fit(self.df)
+        actual = normalizer.transform(self.df.copy())
+        assert_frame_equal(actual, expected)
+
 
 class TestWattFabricius2Normalizer(TestWattFabriciusNormalizer):
     """Tests for the WattFabricius2Normalizer Class. """
@@ -164,10 +198,14 @@ class TestBighamNormalizer(TestWattFabriciusNormalizer):
         self.df = DataFrame(dict(
             speaker=['S1'] * 6 + ['S2'] * 6,
             vowel=['kit', 'goose', 'fleece', 'start', 'thought', 'trap'] * 2,
+            f0=[100., 105., 110., 115., 120., 125.,
+                200., 205., 210., 215., 220., 225.],
             f1=[200., 210., 220., 230., 240., 250.,
                 300., 310., 320., 330., 340., 350.],
             f2=[500., 510., 520., 530., 540., 550.,
-                600., 610., 620., 630., 640., 650.]
+                600., 610., 620., 630., 640., 650.],
+            f3=[2500., 2510., 2520., 2530., 2540., 2550.,
+                2600., 2610., 2620., 2630., 2640., 2650.]
         ))
         df = self.df[self.df['speaker'] == 'S1'].copy()
         self.s1_centroid = dict(
@@ -182,7 +220,7 @@ class TestBighamNormalizer(TestWattFabriciusNormalizer):
                 df[df['vowel'] == 'thought']['f2'].values / 2 +
                 df[df['vowel'] == 'trap']['f2'].values) / 4)
 
-        self.formants = ['f1', 'f2']
+        self.formants = ['f0', 'f1', 'f2', 'f3']
         self.kwargs = dict(formants=self.formants)
 
     def test_fx_spec(self):
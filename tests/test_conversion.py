@@ -2,13 +2,27 @@
 Tests for the conversion module.
 """
 
+import importlib.util
+import subprocess
+import sys
 import unittest
 
 import numpy as np
+import pandas as pd
 
 from vlnm.conversion import (
+    get_transform,
+    set_backend,
+    BARK_KERNELS,
+    BLOCK_SIZE,
+    TRANSFORMS,
+    bark_to_hz,
+    erb_to_hz,
+    mel_to_hz,
     hz_to_bark,
     hz_to_erb,
+    hz_to_log,
+    hz_to_log10,
     hz_to_mel)
 
 
@@ -100,3 +114,190 @@ class TestHzToMel(unittest.TestCase):
         expected = self.convert(data)
         actual = hz_to_mel(data)
         self.assertTrue(np.array_equal(expected, actual))
+
+
+class TestHzToBarkMethods(unittest.TestCase):
+    """
+    Test the hz_to_bark methods.
+    """
+
+    def setUp(self):
+        self.data = np.array([100., 150., 175., 200., 225., 250., 500., 2500.])
+
+    def test_unknown_method(self):
+        """Unknown method raises ValueError."""
+        with self.assertRaises(ValueError):
+            hz_to_bark(self.data, method='unknown')
+
+    def test_syrdal(self):
+        """Syrdal conversion adjusts low frequencies."""
+        data = self.data.copy()
+        adjusted = np.array([150., 150., 170., 190., 220., 250., 500., 2500.])
+        expected = hz_to_bark(adjusted, method='zwicker')
+        actual = hz_to_bark(data, method='syrdal')
+        self.assertTrue(np.allclose(expected, actual))
+
+    def test_syrdal_input_unchanged(self):
+        """Syrdal conversion does not alter its input."""
+        data = self.data.copy()
+        hz_to_bark(data, method='syrdal')
+        self.assertTrue(np.array_equal(data, self.data))
+
+    def test_large_data(self):
+        """Data larger than a single block."""
+        data = np.random.uniform(100, 5000, size=(3 * BLOCK_SIZE + 7, 3))
+        expected = 26.81 * data / (data + 1960) - 0.53
+        actual = hz_to_bark(data)
+        self.assertTrue(np.array_equal(expected, actual))
+
+
+class TestConversionOutput(unittest.TestCase):
+    """
+    Test conversion output types.
+    """
+
+    def setUp(self):
+        self.data = np.random.uniform(100, 5000, size=(10, 3))
+
+    def test_out(self):
+        """Converted data written to out array."""
+        out = np.zeros_like(self.data)
+        actual = hz_to_mel(self.data, out=out)
+        self.assertIs(actual, out)
+        self.assertTrue(np.array_equal(out, hz_to_mel(self.data)))
+
+    def test_in_place(self):
+        """Data converted in place."""
+        expected = hz_to_erb(self.data)
+        data = self.data.copy()
+        hz_to_erb(data, out=data)
+        self.assertTrue(np.array_equal(data, expected))
+
+    def test_float32(self):
+        """Single-precision data are not promoted."""
+        data = self.data.astype(np.float32)
+        actual = hz_to_bark(data)
+        self.assertEqual(actual.dtype, np.float32)
+        self.assertTrue(np.allclose(actual, hz_to_bark(self.data), rtol=1e-6))
+
+    def test_integer(self):
+        """Integer data converted to floating point."""
+        data = self.data.astype(int)
+        actual = hz_to_bark(data)
+        self.assertEqual(actual.dtype, np.float64)
+        self.assertTrue(np.array_equal(actual, hz_to_bark(data.astype(float))))
+
+    def test_data_frame(self):
+        """Data frames converted to data frames."""
+        df = pd.DataFrame(self.data, columns=['f1', 'f2', 'f3'], index=list('abcdefghij'))
+        actual = hz_to_bark(df)
+        self.assertIsInstance(actual, pd.DataFrame)
+        self.assertListEqual(list(actual.columns), list(df.columns))
+        self.assertListEqual(list(actual.index), list(df.index))
+        self.assertTrue(np.array_equal(actual.values, hz_to_bark(self.data)))
+
+    def test_series(self):
+        """Series converted to series."""
+        series = pd.Series(self.data[:, 0], name='f1')
+        actual = hz_to_bark(series)
+        self.assertIsInstance(actual, pd.Series)
+        self.assertEqual(actual.name, 'f1')
+
+    def test_log10(self):
+        """Base-10 logarithm."""
+        self.assertTrue(np.array_equal(hz_to_log10(self.data), np.log10(self.data)))
+        self.assertTrue(np.array_equal(hz_to_log(self.data), np.log(self.data)))
+
+
+@unittest.skipIf(importlib.util.find_spec('numba') is None, 'Numba is not installed')
+class TestNumbaBackend(unittest.TestCase):
+    """
+    Test the numba backend.
+    """
+
+    def setUp(self):
+        self.data = np.random.uniform(100, 5000, size=(10, 3))
+
+    def tearDown(self):
+        set_backend('numpy')
+
+    def test_conversions(self):
+        """Compiled kernels match NumPy kernels."""
+        for method in BARK_KERNELS:
+            expected = hz_to_bark(self.data, method=method)
+            set_backend('numba')
+            actual = hz_to_bark(self.data, method=method)
+            set_backend('numpy')
+            self.assertTrue(np.allclose(actual, expected), method)
+
+
+class TestSetBackend(unittest.TestCase):
+    """
+    Test the set_backend function.
+    """
+
+    def test_unknown_backend(self):
+        """Unknown backend raises ValueError."""
+        with self.assertRaises(ValueError):
+            set_backend('unknown')
+
+    def test_numba_not_imported(self):
+        """Numba is not imported with the normalizers."""
+        code = (
+            'import sys; import vlnm.normalizers.speaker; '
+            'sys.exit("numba" in sys.modules)')
+        self.assertEqual(subprocess.run([sys.executable, '-c', code]).returncode, 0)
+
+
+class TestInverseConversions(unittest.TestCase):
+    """
+    Test the inverse conversions.
+    """
+
+    def setUp(self):
+        self.data = np.concatenate([
+            np.linspace(150., 300., 31), np.random.uniform(300, 8000, 100)])
+
+    def test_round_trip(self):
+        """Inverse conversions recover the original data."""
+        for name, transform in TRANSFORMS.items():
+            actual = transform.inverse(transform.forward(self.data))
+            self.assertTrue(np.allclose(actual, self.data), name)
+
+    def test_bark_methods(self):
+        """Inverse of each hz_to_bark method."""
+        for method in BARK_KERNELS:
+            actual = bark_to_hz(hz_to_bark(self.data, method=method), method=method)
+            self.assertTrue(np.allclose(actual, self.data), method)
+
+    def test_zwicker_out_of_range(self):
+        """Values outside the Zwicker Bark scale are not converted."""
+        actual = bark_to_hz(np.array([-1., 30.]), method='zwicker')
+        self.assertTrue(np.isnan(actual).all())
+
+    def test_inverse_out(self):
+        """Inverse conversion written to out array."""
+        data = hz_to_mel(self.data)
+        mel_to_hz(data, out=data)
+        self.assertTrue(np.allclose(data, self.data))
+
+
+class TestGetTransform(unittest.TestCase):
+    """
+    Test the get_transform function.
+    """
+
+    def test_by_name(self):
+        """Look up transform by name."""
+        transform = get_transform('erb')
+        self.assertIs(transform.forward, hz_to_erb)
+        self.assertIs(transform.inverse, erb_to_hz)
+
+    def test_by_function(self):
+        """Look up transform by forward function."""
+        self.assertIs(get_transform(hz_to_bark).inverse, bark_to_hz)
+
+    def test_unknown(self):
+        """Unknown transforms return None."""
+        self.assertIsNone(get_transform('unknown'))
+        self.assertIsNone(get_transform(np.sqrt))
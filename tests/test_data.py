@@ -0,0 +1,96 @@
+"""
+Tests for the vlnm.data module.
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from vlnm.data import Dataset
+from vlnm.data.cache import Column, DatasetCache, sidecar_directories
+from tests.helpers import assert_frame_equal
+
+
+class TestDatasetCache(unittest.TestCase):
+    """
+    Tests for the DatasetCache class.
+    """
+
+    def test_maxbytes(self):
+        """Least recently used columns are discarded."""
+        cache = DatasetCache(maxbytes=240)
+        for key in 'abc':
+            cache.put(key, Column(values=np.zeros(10)))
+        cache.get('a')
+        cache.put('d', Column(values=np.zeros(10)))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertEqual(cache.nbytes, 240)
+
+    def test_too_big(self):
+        """Columns larger than the cache are not cached."""
+        cache = DatasetCache(maxbytes=10)
+        cache.put('a', Column(values=np.zeros(10)))
+        self.assertEqual(len(cache), 0)
+
+
+class TestDataset(unittest.TestCase):
+    """
+    Tests for loading datasets.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp_dir.name, 'data.csv')
+        pd.DataFrame(dict(
+            speaker=[1, 1, 2, 2],
+            vowel=['a', 'i', 'a', 'i'],
+            label=['x', None, 'y', 'x'],
+            f1=[500., 300., 550., 350.])).to_csv(self.source, index=False)
+        self.dataset = Dataset(self.source, dict(speaker='category', vowel='category'))
+        self.expected = self.dataset.load()
+        Dataset.enable_cache()
+
+    def tearDown(self):
+        Dataset.enable_cache(False)
+        self.tmp_dir.cleanup()
+
+    def test_load(self):
+        """Cached data is the same as data loaded from disk."""
+        self.dataset.load()
+        assert_frame_equal(self.dataset.load(), self.expected)
+        self.assertTrue(os.path.isdir(sidecar_directories(self.source)[0]))
+
+    def test_columns(self):
+        """Load a subset of columns."""
+        self.dataset.load()
+        actual = self.dataset.load(columns=['f1', 'vowel'])
+        assert_frame_equal(actual, self.expected[['f1', 'vowel']])
+
+    def test_copy_on_write(self):
+        """Modifying loaded data does not affect later loads."""
+        df = self.dataset.load()
+        df.loc[0, 'f1'] = 0.
+        assert_frame_equal(self.dataset.load(), self.expected)
+
+    def test_source_changed(self):
+        """Sidecar is rebuilt if the source changes."""
+        self.dataset.load()
+        Dataset.CACHE.clear()
+        df = pd.read_csv(self.source)
+        df['f1'] *= 2
+        df.to_csv(self.source, index=False)
+        os.utime(self.source, ns=(0, 0))
+        actual = self.dataset.load(columns=['f1'])
+        np.testing.assert_array_equal(actual['f1'], self.expected['f1'] * 2)
+
+    def test_no_sidecar(self):
+        """Columns kept in memory without a sidecar."""
+        Dataset.enable_cache(sidecar=False)
+        self.dataset.load()
+        df = self.dataset.load()
+        assert_frame_equal(df, self.expected)
+        self.assertFalse(os.path.exists(sidecar_directories(self.source)[0]))
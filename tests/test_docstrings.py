@@ -0,0 +1,41 @@
+"""
+Tests for the docstrings module.
+"""
+
+import unittest
+
+from vlnm.docstrings import docstring, LazyDocstring
+
+
+class TestDocstring(unittest.TestCase):
+    """
+    Tests for the docstring decorator.
+    """
+
+    def test_class_lazy(self):
+        """
+        Class docstring expanded on first access.
+        """
+        @docstring
+        class _Normalizer:
+            """
+            Parameters
+            ----------
+            speaker:
+            """
+
+        self.assertIsInstance(_Normalizer.__dict__['__doc__'], LazyDocstring)
+        self.assertIsNone(_Normalizer.__dict__['__doc__'].expanded)
+        self.assertIn('speaker labels', _Normalizer.__doc__)
+        self.assertIs(_Normalizer.__doc__, _Normalizer.__dict__['__doc__'].expanded)
+        self.assertEqual(_Normalizer().__doc__, _Normalizer.__doc__)
+
+    def test_function_replacement(self):
+        """
+        Function without a docstring uses the replacement.
+        """
+        @docstring
+        def normalize():
+            pass
+
+        self.assertIn('Normalize formant data', normalize.__doc__)
@@ -0,0 +1,133 @@
+"""
+Tests for the evaluation module.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+import tempfile
+import unittest
+
+from vlnm.evaluation import (
+    evaluate, normalizer_grid, normalizer_key, EvaluationCache, METRICS)
+from vlnm.metrics import scv
+from vlnm.normalizers.formant import BarkNormalizer, LogNormalizer
+from vlnm.normalizers.speaker import LobanovNormalizer
+
+from tests.helpers import get_test_dataframe
+
+
+class TestNormalizerGrid(unittest.TestCase):
+    """
+    Tests for the normalizer_grid function.
+    """
+
+    def test_names(self):
+        """Names without parameters."""
+        self.assertListEqual(
+            normalizer_grid(['lobanov', 'neary']),
+            [('lobanov', {}), ('neary', {})])
+
+    def test_grid(self):
+        """Lists of values are expanded."""
+        grid = normalizer_grid({
+            'lobanov': {},
+            'convex-hull': {'where': ['mean', 'median'], 'speaker': 'speaker'}})
+        self.assertListEqual(grid, [
+            ('lobanov', {}),
+            ('convex-hull', {'where': 'mean', 'speaker': 'speaker'}),
+            ('convex-hull', {'where': 'median', 'speaker': 'speaker'})])
+
+    def test_list(self):
+        """Lists of parameters."""
+        grid = normalizer_grid([('convex-hull', [{'where': 'mean'}, {'where': 'median'}])])
+        self.assertListEqual(grid, [
+            ('convex-hull', {'where': 'mean'}),
+            ('convex-hull', {'where': 'median'})])
+
+    def test_key(self):
+        """Keys depend on the normalizer class and options."""
+        self.assertEqual(
+            normalizer_key(LobanovNormalizer()), normalizer_key(LobanovNormalizer()))
+        self.assertNotEqual(
+            normalizer_key(LobanovNormalizer()),
+            normalizer_key(LobanovNormalizer(speaker='talker')))
+
+    def test_key_functions(self):
+        """Functions are identified by name, not address."""
+        key = normalizer_key(BarkNormalizer())
+        self.assertIn('vlnm.conversion', key)
+        self.assertNotIn('0x', key)
+        with self.assertRaises(TypeError):
+            normalizer_key(LogNormalizer(transform=lambda x: x))
+
+
+class TestEvaluate(unittest.TestCase):
+    """
+    Tests for the evaluate function.
+    """
+
+    def setUp(self):
+        self.df = get_test_dataframe()
+
+    def test_results(self):
+        """One row for each normalizer and metric."""
+        results = evaluate(self.df, ['lobanov', 'neary'])
+        self.assertListEqual(
+            list(results.columns), ['normalizer', 'params', 'metric', 'value'])
+        self.assertEqual(len(results), 2 * len(METRICS))
+        expected = scv(LobanovNormalizer().normalize(self.df))
+        actual = results.query('normalizer == "lobanov" and metric == "scv"')['value']
+        self.assertAlmostEqual(actual.iloc[0], expected)
+
+    def test_metrics(self):
+        """Custom metrics."""
+        results = evaluate(
+            self.df, 'lobanov',
+            metrics=dict(rows=lambda df, vowel: len(df[vowel])))
+        self.assertListEqual(results['value'].tolist(), [len(self.df)])
+
+    def test_cache(self):
+        """Cached results are not recalculated."""
+        cache = EvaluationCache()
+        expected = evaluate(self.df, ['lobanov'], cache=cache)
+        results = evaluate(self.df, ['lobanov', 'neary'], cache=cache)
+        self.assertEqual(cache.hits, len(METRICS))
+        self.assertListEqual(
+            results['value'].tolist()[:len(METRICS)], expected['value'].tolist())
+
+    def test_cache_data(self):
+        """Results are not reused for different data."""
+        cache = EvaluationCache()
+        evaluate(self.df, ['lobanov'], cache=cache)
+        df = self.df.copy()
+        df['f1'] += 1.
+        evaluate(df, ['lobanov'], cache=cache)
+        self.assertEqual(cache.hits, 0)
+
+    def test_cache_uncacheable(self):
+        """Normalizers whose options cannot be serialized are not cached."""
+        cache = EvaluationCache()
+        grid = [('log', {'transform': lambda x: x})]
+        evaluate(self.df, grid, cache=cache)
+        evaluate(self.df, grid, cache=cache)
+        self.assertEqual((len(cache), cache.hits), (0, 0))
+
+    def test_cache_save(self):
+        """Cached results are saved and loaded."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'results.json')
+            cache = EvaluationCache(path)
+            evaluate(self.df, ['lobanov'], cache=cache)
+            cache.save()
+            cache = EvaluationCache(path)
+            self.assertEqual(len(cache), len(METRICS))
+            evaluate(self.df, ['lobanov'], cache=cache)
+            self.assertEqual(cache.hits, len(METRICS))
+
+    def test_executor(self):
+        """Normalizations run by an executor."""
+        expected = evaluate(self.df, ['lobanov', 'neary', 'gerstman'])
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            actual = evaluate(
+                self.df, ['lobanov', 'neary', 'gerstman'], executor=executor)
+        self.assertListEqual(actual['value'].tolist(), expected['value'].tolist())
@@ -0,0 +1,115 @@
+"""
+Tests for the vlnm.formats module.
+"""
+
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from vlnm.formats import (
+    get_format,
+    read_chunks,
+    read_columns,
+    read_data,
+    write_chunks,
+    write_data)
+from tests.helpers import assert_frame_equal
+
+ROOT = os.path.dirname(__file__)
+
+
+class TestGetFormat(unittest.TestCase):
+    """
+    Test the get_format function.
+    """
+
+    def test_extension(self):
+        """Format detected from extension."""
+        self.assertEqual(get_format('data.csv'), 'csv')
+        self.assertEqual(get_format('data.parquet'), 'parquet')
+        self.assertEqual(get_format('data.PQ'), 'parquet')
+        self.assertEqual(get_format('data.feather'), 'feather')
+        self.assertEqual(get_format('data.arrow'), 'feather')
+
+    def test_explicit(self):
+        """Explicit format overrides extension."""
+        self.assertEqual(get_format('data.csv', 'arrow'), 'feather')
+        self.assertEqual(get_format('data.csv', 'Parquet'), 'parquet')
+
+    def test_unknown(self):
+        """Unknown format raises ValueError."""
+        with self.assertRaises(ValueError):
+            get_format('data.csv', 'xlsx')
+
+    def test_default(self):
+        """Default format if not detected."""
+        self.assertEqual(get_format('data'), 'csv')
+        self.assertEqual(get_format(None, default='parquet'), 'parquet')
+        self.assertEqual(get_format('data.feather', default='parquet'), 'feather')
+
+
+class TestReadWrite(unittest.TestCase):
+    """
+    Test reading and writing files.
+    """
+
+    def setUp(self):
+        self.df = pd.read_csv(
+            os.path.join(ROOT, 'fixtures', 'hawkins_midgely_2005.csv'))
+        self.df['speaker'] = self.df['speaker'].astype('category')
+        self.df['vowel'] = self.df['vowel'].astype('category')
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp_dir.name, name)
+
+    def test_round_trip(self):
+        """Binary formats preserve categorical columns."""
+        for name in ['data.parquet', 'data.feather']:
+            write_data(self.df, self.path(name))
+            actual = read_data(self.path(name))
+            assert_frame_equal(actual, self.df)
+
+    def test_read_columns(self):
+        """Read columns without data."""
+        for name in ['data.csv', 'data.parquet', 'data.feather']:
+            write_data(self.df, self.path(name))
+            self.assertListEqual(
+                read_columns(self.path(name)), list(self.df.columns))
+
+    def test_projection(self):
+        """Read only the given columns."""
+        columns = ['speaker', 'f1']
+        for name in ['data.csv', 'data.parquet', 'data.feather']:
+            write_data(self.df, self.path(name))
+            actual = read_data(self.path(name), columns=columns)
+            self.assertListEqual(list(actual.columns), columns)
+
+    def test_chunks(self):
+        """Read and write chunks."""
+        for name in ['data.csv', 'data.parquet', 'data.feather']:
+            write_data(self.df, self.path(name))
+            chunks = list(read_chunks(self.path(name), 50))
+            self.assertEqual(len(chunks), -(-len(self.df) // 50))
+            write_chunks(chunks, self.path('chunks_' + name))
+            actual = read_data(self.path('chunks_' + name))
+            expected = read_data(self.path(name))
+            assert_frame_equal(actual, expected)
+
+    def test_feather_batches(self):
+        """Feather record batches are re-sliced into chunks."""
+        columns = ['speaker', 'f1']
+        write_chunks(
+            [self.df.iloc[start:start + 30] for start in range(0, len(self.df), 30)],
+            self.path('data.feather'))
+        chunks = list(read_chunks(self.path('data.feather'), 50, columns=columns))
+        self.assertListEqual(
+            [len(chunk) for chunk in chunks[:-1]], [50] * (len(chunks) - 1))
+        actual = pd.concat(chunks)
+        self.assertListEqual(list(actual.columns), columns)
+        assert_frame_equal(actual, self.df[columns].reset_index(drop=True))
@@ -4,6 +4,9 @@ Tests for the normalizers which require speakers to identify as female or male.
 
 import unittest
 
+import numpy as np
+import pandas as pd
+
 from vlnm.conversion import hz_to_bark
 from vlnm.normalizers.gender import (
     BladenNormalizer,
@@ -74,6 +77,15 @@ class TestBladenNormalizer(unittest.TestCase):
             **self.kwargs)[self.formants]
         self.assertTrue(actual.equals(expected))
 
+    def test_normalize_arrays(self):
+        """Normalizing arrays matches normalizing the data frame."""
+        expected = BladenNormalizer().normalize(self.df.copy())[self.formants].values
+        actual = BladenNormalizer().normalize_arrays(
+            self.df[self.formants].values,
+            gender_mask=(self.df['gender'] == 'F').values,
+            formants=self.formants)
+        self.assertTrue(np.allclose(actual, expected, equal_nan=True))
+
     def test_default_gender_labels(self):
         """Test default gender labels."""
         normalizer = BladenNormalizer()
@@ -124,3 +136,29 @@ class TestNordstromNormalizer(unittest.TestCase):
             male='M')
         actual = {key: normalizer.options[key] for key in expected}
         self.assertDictEqual(actual, expected)
+
+    def test_fit_transform(self):
+        """Fitted F3 means reproduce the normalized output."""
+        expected = NordstromNormalizer().normalize(self.df.copy())
+        normalizer = NordstromNormalizer().fit(self.df.copy())
+        self.assertListEqual(
+            list(normalizer.parameters.index), ['mu_female', 'mu_male'])
+        actual = normalizer.transform(self.df.copy())
+        assert_frame_equal(actual.sort_index(), expected.sort_index())
+
+    def test_groupby(self):
+        """F3 means calculated for each group."""
+        actual = NordstromNormalizer(groupby='group').normalize(self.df.copy())
+        expected = pd.concat([
+            NordstromNormalizer().normalize(group_df.copy())
+            for _, group_df in self.df.groupby('group')]).loc[self.df.index]
+        assert_frame_equal(actual, expected)
+
+    def test_normalize_arrays(self):
+        """Normalizing arrays matches normalizing the data frame."""
+        expected = NordstromNormalizer().normalize(self.df.copy())[self.formants].values
+        actual = NordstromNormalizer().normalize_arrays(
+            self.df[self.formants].values,
+            gender_mask=(self.df['gender'] == 'F').values,
+            formants=self.formants)
+        self.assertTrue(np.allclose(actual, expected, equal_nan=True))
@@ -0,0 +1,72 @@
+"""
+Tests for the geometry module.
+"""
+
+import unittest
+
+import numpy as np
+from scipy.spatial import ConvexHull
+
+from vlnm.geometry import ConvexHulls
+
+
+class TestConvexHulls(unittest.TestCase):
+    """
+    Tests for the ConvexHulls class.
+    """
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.points = rng.normal(size=(100, 10, 2))
+        self.points[rng.random_sample((100, 10)) < 0.2] = np.nan
+
+    def test_square(self):
+        """Interior points are not vertices."""
+        points = np.array([[0., 0.], [1., 0.], [.5, .5], [1., 1.], [0., 1.]])
+        hulls = ConvexHulls(points)
+        self.assertListEqual(hulls.vertices.tolist(), [[0, 1, 3, 4]])
+        np.testing.assert_allclose(hulls.areas(), [1.])
+        np.testing.assert_allclose(hulls.centroids(), [[.5, .5]])
+
+    def test_scipy(self):
+        """Hulls match scipy hulls."""
+        hulls = ConvexHulls(self.points)
+        for i, points in enumerate(self.points):
+            rows = np.flatnonzero(~np.isnan(points).any(axis=1))
+            hull = ConvexHull(points[rows])
+            self.assertSetEqual(
+                set(hulls.vertices[i, :hulls.n_vertices[i]]),
+                set(rows[hull.vertices]))
+            self.assertAlmostEqual(hulls.areas()[i], hull.volume)
+            np.testing.assert_allclose(
+                hulls.centroids()[i], points[rows[hull.vertices]].mean(axis=0))
+
+    def test_degenerate(self):
+        """Degenerate hulls have no centroid or area."""
+        points = np.full((3, 4, 2), np.nan)
+        points[1, :2] = [[0., 0.], [1., 1.]]
+        points[2] = [[0., 0.], [1., 1.], [2., 2.], [1., 1.]]
+        hulls = ConvexHulls(points)
+        self.assertListEqual(hulls.n_vertices.tolist(), [0, 2, 2])
+        np.testing.assert_array_equal(hulls.areas(), [0., 0., 0.])
+        self.assertTrue(np.isnan(hulls.centroids()).all())
+
+    def test_empty(self):
+        """Sets without points have no vertices, centroid or area."""
+        for n_dims in [2, 3]:
+            hulls = ConvexHulls(np.zeros((3, 0, n_dims)))
+            self.assertListEqual(hulls.n_vertices.tolist(), [0, 0, 0])
+            self.assertTrue(np.isnan(hulls.vertex_points()).all())
+            np.testing.assert_array_equal(hulls.areas(), [0., 0., 0.])
+            self.assertEqual(hulls.centroids().shape, (3, n_dims))
+            self.assertTrue(np.isnan(hulls.centroids()).all())
+
+    def test_dimensions(self):
+        """Hulls in more than two dimensions match scipy hulls."""
+        points = np.random.RandomState(0).normal(size=(5, 12, 3))
+        hulls = ConvexHulls(points)
+        for i, set_points in enumerate(points):
+            hull = ConvexHull(set_points)
+            self.assertSetEqual(
+                set(hulls.vertices[i, :hulls.n_vertices[i]]), set(hull.vertices))
+            self.assertAlmostEqual(hulls.areas()[i], hull.volume)
@@ -0,0 +1,123 @@
+"""
+Tests for the metrics module.
+"""
+
+import subprocess
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from vlnm.metrics import (
+    classification_accuracy, scv, variance_ratio, vowel_means, vowel_space, vowel_space_areas)
+
+from tests.helpers import get_test_dataframe
+
+
+class TestVowelSpaceAreas(unittest.TestCase):
+    """
+    Tests for the vowel_space_areas function.
+    """
+
+    def setUp(self):
+        self.df = get_test_dataframe()
+
+    def test_vowel_means(self):
+        """Vowel means for each speaker."""
+        means, speakers, vowels = vowel_means(self.df)
+        expected = self.df.groupby(['speaker', 'vowel'])[['f1', 'f2']].mean()
+        self.assertListEqual(speakers.tolist(), list(range(8)))
+        self.assertListEqual(vowels.tolist(), ['a', 'e', 'i', 'o', 'u'])
+        np.testing.assert_allclose(means.reshape(-1, 2), expected.values)
+
+    def test_vowel_space(self):
+        """Areas match the area of each speaker's vowel space."""
+        for hull in [True, False]:
+            for points in [None, ['a', 'i', 'u', 'o']]:
+                actual = vowel_space_areas(self.df, points=points, hull=hull)
+                expected = self.df.groupby('speaker').apply(
+                    lambda df, points=points, hull=hull: vowel_space(
+                        df, points=points, hull=hull).area)
+                np.testing.assert_allclose(actual.values, expected.values)
+                self.assertListEqual(actual.index.tolist(), expected.index.tolist())
+
+    def test_missing_vowels(self):
+        """Speakers without enough vowels have no area."""
+        df = self.df[~((self.df['speaker'] == 0) & (self.df['vowel'] != 'a'))]
+        areas = vowel_space_areas(df)
+        self.assertEqual(areas[0], 0.)
+        self.assertTrue((areas[1:] > 0).all())
+
+    def test_scv(self):
+        """Squared coefficient of variation of the areas."""
+        areas = self.df.groupby('speaker').apply(lambda df: vowel_space(df).area)
+        expected = (areas.std() / areas.mean()) ** 2
+        self.assertAlmostEqual(scv(self.df), expected)
+
+    def test_import(self):
+        """Calculating the scv does not import shapely."""
+        code = (
+            'import sys\n'
+            'import pandas as pd\n'
+            'from vlnm.metrics import scv\n'
+            'scv(pd.DataFrame(dict(speaker=[1, 1, 1], vowel=list("aei"), '
+            'f1=[1., 2., 1.], f2=[1., 1., 2.])))\n'
+            'print(" ".join(sorted(sys.modules)))\n')
+        modules = subprocess.run(
+            [sys.executable, '-c', code], check=True,
+            stdout=subprocess.PIPE, universal_newlines=True).stdout.split()
+        self.assertNotIn('shapely', modules)
+
+
+class TestVarianceRatio(unittest.TestCase):
+    """
+    Tests for the variance_ratio function.
+    """
+
+    def test_f_statistic(self):
+        """Variance ratio of one formant is the ANOVA F statistic."""
+        df = pd.DataFrame(dict(
+            vowel=list('aaabbbccc'),
+            f1=[1., 2., 3., 4., 5., 6., 7., 8., 10.]))
+        groups = [df.loc[df['vowel'] == v, 'f1'] for v in 'abc']
+        grand = df['f1'].mean()
+        between = sum(len(g) * (g.mean() - grand) ** 2 for g in groups) / 2
+        within = sum(((g - g.mean()) ** 2).sum() for g in groups) / 6
+        self.assertAlmostEqual(
+            variance_ratio(df, formants=['f1']), between / within)
+
+    def test_missing(self):
+        """Rows with missing formants are ignored."""
+        df = get_test_dataframe()
+        expected = variance_ratio(df.dropna(subset=['f1', 'f2']))
+        self.assertAlmostEqual(variance_ratio(df), expected)
+
+
+class TestClassificationAccuracy(unittest.TestCase):
+    """
+    Tests for the classification_accuracy function.
+    """
+
+    def setUp(self):
+        self.df = get_test_dataframe()
+
+    def test_separated(self):
+        """Well separated vowels are classified correctly."""
+        df = self.df.copy()
+        codes = df['vowel'].map(dict(a=0, e=1, i=2, o=3, u=4))
+        df['f1'] = codes * 1000. + df['f1']
+        df['f2'] = codes * 1000. + df['f2']
+        self.assertEqual(classification_accuracy(df), 1.)
+
+    def test_range(self):
+        """Accuracy is a proportion."""
+        accuracy = classification_accuracy(self.df, speaker=None, folds=3)
+        self.assertGreaterEqual(accuracy, 0.)
+        self.assertLessEqual(accuracy, 1.)
+
+    def test_seed(self):
+        """The same seed gives the same accuracy."""
+        self.assertEqual(
+            classification_accuracy(self.df, seed=1),
+            classification_accuracy(self.df, seed=1))
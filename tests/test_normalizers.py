@@ -2,12 +2,21 @@
 Tests for the normalizer package.
 """
 
+import importlib
+import subprocess
+import sys
 import unittest
 
+import vlnm
 from vlnm import (
     get_normalizer,
-    list_normalizers)
-from vlnm.registration import register_normalizer
+    list_normalizers,
+    normalizers)
+from vlnm.registration import (
+    MANIFEST,
+    NORMALIZERS,
+    NormalizerRegistry,
+    register_normalizer)
 
 
 class TestGetNormalizer(unittest.TestCase):
@@ -78,3 +87,91 @@ class TestRegisterNormalizers(unittest.TestCase):
         actual = {}
         register_normalizer(True, 'test', index=actual)
         self.assertDictEqual(actual, {'test': True})
+
+
+class TestNormalizerRegistry(unittest.TestCase):
+    """
+    Tests for the lazily loaded normalizer registry.
+    """
+
+    def test_manifest(self):
+        """
+        The manifest lists the normalizers registered by each module.
+        """
+        for module in set(MANIFEST.values()):
+            importlib.import_module(module)
+        for name, module in MANIFEST.items():
+            self.assertEqual(NORMALIZERS[name].__module__, module)
+            self.assertEqual(NORMALIZERS[name].name, name)
+
+    def test_classes(self):
+        """
+        The class manifest lists the classes in each module.
+        """
+        for name, module in normalizers.CLASSES.items():
+            klass = getattr(normalizers, name)
+            module = importlib.import_module(
+                '{}.{}'.format(normalizers.__name__, module))
+            self.assertIs(getattr(module, name), klass)
+            self.assertIs(getattr(vlnm, name), klass)
+
+    def test_docstrings(self):
+        """
+        The normalize method of each registered normalizer is documented.
+        """
+        for name in MANIFEST:
+            self.assertTrue(NORMALIZERS[name].normalize.__doc__, name)
+
+    def test_unknown_class(self):
+        """
+        Unknown attribute raises AttributeError.
+        """
+        with self.assertRaises(AttributeError):
+            getattr(normalizers, 'UnknownNormalizer')
+        with self.assertRaises(AttributeError):
+            getattr(vlnm, 'UnknownNormalizer')
+
+    def test_deferred(self):
+        """
+        Module is imported when a normalizer is looked up.
+        """
+        index = NormalizerRegistry({'test': 'tests.test_normalizers'})
+        self.assertEqual(index.module('test'), 'tests.test_normalizers')
+        with self.assertRaises(ImportError):
+            index['test']  # pylint: disable=pointless-statement
+
+    def test_list_normalizers_module(self):
+        """
+        List normalizers in a module.
+        """
+        actual = list_normalizers(module='vlnm.normalizers.speaker')
+        self.assertIn('lobanov', actual)
+        self.assertNotIn('bark', actual)
+
+    def test_star_import(self):
+        """
+        Star imports export the normalizers and public functions.
+        """
+        namespace = {}
+        exec('from vlnm import *', namespace)  # pylint: disable=exec-used
+        self.assertIs(namespace['LobanovNormalizer'], vlnm.LobanovNormalizer)
+        for name in ['normalize', 'list_normalizers', 'get_normalizer', 'pb1952']:
+            self.assertIn(name, namespace)
+
+    def test_import(self):
+        """
+        Importing vlnm and getting a normalizer only imports its module.
+        """
+        code = (
+            'import sys\n'
+            'import vlnm\n'
+            'vlnm.get_normalizer("lobanov")\n'
+            'print(" ".join(sorted(sys.modules)))\n')
+        modules = subprocess.run(
+            [sys.executable, '-c', code], check=True,
+            stdout=subprocess.PIPE, universal_newlines=True).stdout.split()
+        self.assertIn('vlnm.normalizers.speaker', modules)
+        for module in ['centroid', 'formant', 'gender', 'projection', 'vowel']:
+            self.assertNotIn('vlnm.normalizers.{}'.format(module), modules)
+        for module in ['scipy', 'shapely', 'sklearn']:
+            self.assertNotIn(module, modules)
@@ -2,6 +2,10 @@
 Tests for the normalize module.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+import unittest
+
 import numpy as np
 
 from vlnm.normalizers.speaker import (
@@ -9,7 +13,8 @@ from vlnm.normalizers.speaker import (
     LCENormalizer,
     LobanovNormalizer,
     NearyNormalizer,
-    NearyGMNormalizer)
+    NearyGMNormalizer,
+    _speaker_shards)
 
 from tests.helpers import (
     assert_frame_equal,
@@ -33,7 +38,7 @@ def get_test_dataframe(speakers=2):
 DATA_FRAME = get_test_dataframe()
 
 
-class TestLCENormalizer(Helper.SpeakerNormalizerTests):
+class TestLCENormalizer(Helper.VectorizedSpeakerNormalizerTests):
     """
     Tests for the LCENormalizer class.
     """
@@ -85,7 +90,7 @@ def lce_helper(df, formants, rename):
     return df
 
 
-class TestGerstmanNormalizer(Helper.SpeakerNormalizerTests):
+class TestGerstmanNormalizer(Helper.VectorizedSpeakerNormalizerTests):
     """Tests for the GerstmanNormalizer class."""
 
     normalizer = GerstmanNormalizer
@@ -116,7 +121,7 @@ class TestGerstmanNormalizer(Helper.SpeakerNormalizerTests):
                 assert_series_equal(actual, expected)
 
 
-class TestLobanovNormalizer(Helper.SpeakerNormalizerTests):
+class TestLobanovNormalizer(Helper.VectorizedSpeakerNormalizerTests):
     """Tests for the LobanovNormalizer class."""
 
     normalizer = LobanovNormalizer
@@ -146,8 +151,104 @@ class TestLobanovNormalizer(Helper.SpeakerNormalizerTests):
 
                 assert_series_equal(actual, expected)
 
-
-class TestNearyNormalizer(Helper.SpeakerNormalizerTests):
+    def test_fit_parameters(self):
+        """Fitted parameters contain speaker means and standard deviations."""
+        normalizer = self.normalizer(**self.kwargs).fit(self.df)
+        parameters = normalizer.parameters
+        for speaker in self.df['speaker'].unique():
+            speaker_df = self.df[self.df['speaker'] == speaker]
+            assert_series_equal(
+                parameters.loc[(speaker, 'mean'), self.formants],
+                speaker_df[self.formants].mean(),
+                check_names=False)
+            assert_series_equal(
+                parameters.loc[(speaker, 'std'), self.formants],
+                speaker_df[self.formants].std(),
+                check_names=False)
+
+    def test_fit_transform(self):
+        """Transform with fitted parameters matches normalize."""
+        expected = self.normalizer(**self.kwargs).normalize(self.df.copy())
+        actual = self.normalizer(**self.kwargs).fit(self.df).transform(self.df.copy())
+        assert_frame_equal(actual, expected)
+
+    def test_transform_new_tokens(self):
+        """Transform new tokens using parameters fitted to other tokens."""
+        normalizer = self.normalizer(**self.kwargs).fit(self.df)
+        expected = normalizer.transform(self.df.copy()).iloc[[3, 7]]
+        actual = normalizer.transform(self.df.iloc[[3, 7]].copy())
+        assert_frame_equal(actual, expected)
+
+    def test_transform_unknown_speaker(self):
+        """Speakers without fitted parameters are not normalized."""
+        normalizer = self.normalizer(**self.kwargs).fit(self.df)
+        df = self.df.copy()
+        df['speaker'] = -1
+        actual = normalizer.transform(df)
+        self.assertTrue(actual[self.formants].isnull().all().all())
+
+    def test_transform_not_fitted(self):
+        """Transform before fitting raises ValueError."""
+        with self.assertRaises(ValueError):
+            self.normalizer(**self.kwargs).transform(self.df)
+
+    def test_save_load_parameters(self):
+        """Parameters saved and loaded from a file."""
+        normalizer = self.normalizer(**self.kwargs).fit(self.df)
+        expected = normalizer.transform(self.df.copy())
+        output = StringIO()
+        normalizer.save_parameters(output)
+        output.seek(0)
+        actual = self.normalizer(**self.kwargs).load_parameters(
+            output).transform(self.df.copy())
+        assert_frame_equal(actual, expected)
+
+    def test_n_jobs(self):
+        """Parallel normalization matches serial normalization."""
+        df = get_test_dataframe(speakers=5).sample(frac=1, random_state=1)
+        expected = self.normalizer(**self.kwargs).normalize(df.copy())
+        actual = self.normalizer(n_jobs=2, **self.kwargs).normalize(df.copy())
+        assert_frame_equal(actual, expected)
+
+    def test_executor(self):
+        """Normalize using an executor."""
+        df = get_test_dataframe(speakers=5).sample(frac=1, random_state=1)
+        expected = self.normalizer(**self.kwargs).normalize(df.copy())
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            actual = self.normalizer(
+                executor=executor, **self.kwargs).normalize(df.copy())
+        assert_frame_equal(actual, expected)
+
+
+class TestSpeakerShards(unittest.TestCase):
+    """Tests for the _speaker_shards function."""
+
+    def test_whole_speakers(self):
+        """Each speaker is in a single shard."""
+        df = get_test_dataframe(speakers=7)
+        shards = _speaker_shards(df['speaker'], 3)
+        self.assertEqual(len(shards), 3)
+        self.assertListEqual(
+            sorted(np.concatenate(shards)), list(range(len(df))))
+        speakers = [set(df['speaker'].values[shard]) for shard in shards]
+        for i, shard_speakers in enumerate(speakers):
+            for other in speakers[i + 1:]:
+                self.assertFalse(shard_speakers & other)
+
+    def test_balanced(self):
+        """Shards have similar numbers of rows."""
+        df = get_test_dataframe(speakers=8)
+        shards = _speaker_shards(df['speaker'], 4)
+        self.assertEqual(len(set(len(shard) for shard in shards)), 1)
+
+    def test_more_shards_than_speakers(self):
+        """No empty shards."""
+        df = get_test_dataframe(speakers=2)
+        shards = _speaker_shards(df['speaker'], 4)
+        self.assertEqual(len(shards), 2)
+
+
+class TestNearyNormalizer(Helper.VectorizedSpeakerNormalizerTests):
     """Tests for the NearyNormalizer class."""
 
     normalizer = NearyNormalizer
@@ -193,7 +294,7 @@ class TestNearyNormalizer(Helper.SpeakerNormalizerTests):
                 assert_series_equal(actual, expected)
 
 
-class TestNearyGMNormalizer(Helper.SpeakerNormalizerTests):
+class TestNearyGMNormalizer(Helper.VectorizedSpeakerNormalizerTests):
     """Tests for the NearyGMNormalizer Class. """
 
     normalizer = NearyGMNormalizer
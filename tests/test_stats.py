@@ -0,0 +1,212 @@
+"""
+Tests for the stats module.
+"""
+
+import pickle
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from vlnm.stats import (
+    factorize, fingerprint, GroupStatistics, RunningStatistics, StatisticsCache)
+
+from tests.helpers import get_test_dataframe
+
+
+class TestFactorize(unittest.TestCase):
+    """
+    Tests for the factorize function.
+    """
+
+    def test_codes(self):
+        """Labels converted to sorted integer codes."""
+        codes, labels = factorize(pd.Series(['b', 'a', 'b', 'c']))
+        self.assertListEqual(codes.tolist(), [1, 0, 1, 2])
+        self.assertListEqual(labels.tolist(), ['a', 'b', 'c'])
+
+    def test_missing(self):
+        """Missing labels have code -1."""
+        codes, labels = factorize(pd.Series(['b', None, 'a']))
+        self.assertListEqual(codes.tolist(), [1, -1, 0])
+        self.assertEqual(len(labels), 2)
+
+    def test_columns(self):
+        """Combinations of labels converted to sorted integer codes."""
+        df = pd.DataFrame(dict(
+            group=['x', 'y', 'x', 'y', None, 'x'],
+            speaker=[2, 1, 1, 1, 3, 2]))
+        codes, labels = factorize(df)
+        self.assertListEqual(codes.tolist(), [1, 2, 0, 2, -1, 1])
+        self.assertListEqual(labels.tolist(), [('x', 1), ('x', 2), ('y', 1)])
+        self.assertListEqual(list(labels.names), ['group', 'speaker'])
+
+    def test_columns_statistics(self):
+        """Statistics for combinations of labels."""
+        df = get_test_dataframe()
+        stats = GroupStatistics.from_frame(df, ['group', 'speaker'], ['f1', 'f2'])
+        expected = df.groupby(['group', 'speaker'])[['f1', 'f2']].mean()
+        self.assertTrue(stats.labels.equals(expected.index))
+        self.assertTrue(np.allclose(stats.mean(), expected.values))
+
+
+class TestGroupStatistics(unittest.TestCase):
+    """
+    Tests for the GroupStatistics class.
+    """
+
+    def setUp(self):
+        self.df = get_test_dataframe()
+        self.formants = ['f0', 'f1', 'f2', 'f3']
+        self.stats = GroupStatistics.from_frame(self.df, 'speaker', self.formants)
+        self.grouped = self.df.groupby('speaker')[self.formants]
+
+    def test_count(self):
+        """Count ignores missing values."""
+        self.assertTrue(np.array_equal(
+            self.stats.count(), self.grouped.count().values))
+
+    def test_mean(self):
+        """Mean matches pandas."""
+        self.assertTrue(np.allclose(
+            self.stats.mean(), self.grouped.mean().values))
+
+    def test_std(self):
+        """Standard deviation matches pandas."""
+        self.assertTrue(np.allclose(
+            self.stats.std(), self.grouped.std().values))
+
+    def test_min(self):
+        """Minimum matches pandas."""
+        self.assertTrue(np.array_equal(
+            self.stats.min(), self.grouped.min().values))
+
+    def test_max(self):
+        """Maximum matches pandas."""
+        self.assertTrue(np.array_equal(
+            self.stats.max(), self.grouped.max().values))
+
+    def test_median(self):
+        """Median matches pandas."""
+        self.assertTrue(np.allclose(
+            self.stats.median(), self.grouped.median().values))
+
+    def test_nested(self):
+        """Statistics of nested groups match pandas."""
+        codes, vowels = factorize(self.df['vowel'])
+        actual = self.stats.nested(codes, len(vowels)).mean().reshape(
+            self.stats.n_groups, len(vowels), -1)
+        expected = self.df.groupby(['speaker', 'vowel'])[self.formants].mean()
+        for (speaker, vowel), row in expected.iterrows():
+            i = self.stats.labels.get_loc(speaker)
+            j = vowels.get_loc(vowel)
+            self.assertTrue(np.allclose(actual[i, j], row.values))
+
+    def test_log_mean(self):
+        """Log mean matches pandas."""
+        expected = np.log(self.df[self.formants]).groupby(self.df['speaker']).mean()
+        self.assertTrue(np.allclose(self.stats.log_mean(), expected.values))
+
+    def test_broadcast(self):
+        """Broadcast expands to rows."""
+        expected = self.grouped.transform('mean').values
+        actual = self.stats.broadcast(self.stats.mean())
+        self.assertTrue(np.allclose(actual, expected))
+
+    def test_missing_group(self):
+        """Rows without a group are ignored and broadcast as NaN."""
+        stats = GroupStatistics(
+            np.array([0, -1, 0, 1]), 2, np.array([1., 100., 3., 5.]))
+        self.assertListEqual(stats.mean()[:, 0].tolist(), [2., 5.])
+        broadcast = stats.broadcast(stats.max())[:, 0]
+        self.assertTrue(np.isnan(broadcast[1]))
+        self.assertListEqual(broadcast[[0, 2, 3]].tolist(), [3., 3., 5.])
+
+
+class TestRunningStatistics(unittest.TestCase):
+    """
+    Tests for the RunningStatistics class.
+    """
+
+    def setUp(self):
+        self.df = get_test_dataframe()
+        self.formants = ['f0', 'f1', 'f2', 'f3']
+        self.expected = GroupStatistics.from_frame(self.df, 'speaker', self.formants)
+        self.running = RunningStatistics()
+        for i in range(0, len(self.df), 37):
+            self.running.update(GroupStatistics.from_frame(
+                self.df[i:i + 37], 'speaker', self.formants))
+        self.index = self.running.labels.get_indexer(self.expected.labels)
+
+    def test_labels(self):
+        """All groups are accumulated."""
+        self.assertListEqual(
+            sorted(self.running.labels), sorted(self.expected.labels))
+
+    def test_statistics(self):
+        """Merged statistics match statistics for all data."""
+        for name in ['count', 'sum', 'mean', 'std', 'min', 'max', 'log_mean']:
+            expected = getattr(self.expected, name)()
+            actual = getattr(self.running, name)()[self.index]
+            self.assertTrue(np.allclose(actual, expected), name)
+
+
+class TestStatisticsCache(unittest.TestCase):
+    """
+    Tests for the StatisticsCache class.
+    """
+
+    def setUp(self):
+        self.df = get_test_dataframe()
+        self.formants = ['f0', 'f1', 'f2', 'f3']
+        self.cache = StatisticsCache(maxsize=2)
+
+    def test_fingerprint(self):
+        """Fingerprint depends on contents not identity."""
+        self.assertEqual(fingerprint(self.df), fingerprint(self.df.copy()))
+        self.assertEqual(
+            fingerprint(self.df, ['f1']), fingerprint(self.df.reset_index(drop=True), ['f1']))
+        df = self.df.copy()
+        df.loc[0, 'f1'] += 1
+        self.assertNotEqual(fingerprint(df), fingerprint(self.df))
+        self.assertEqual(fingerprint(df, ['f2']), fingerprint(self.df, ['f2']))
+
+    def test_reused(self):
+        """Statistics for the same data are reused."""
+        stats = self.cache.statistics(self.df, 'speaker', self.formants)
+        self.assertIs(
+            self.cache.statistics(self.df.copy(), 'speaker', self.formants), stats)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertIsNot(
+            self.cache.statistics(self.df, 'speaker', ['f1', 'f2']), stats)
+
+    def test_modified(self):
+        """Statistics for modified data are not reused."""
+        stats = self.cache.statistics(self.df, 'speaker', self.formants)
+        df = self.df.copy()
+        df.loc[0, 'f1'] += 1
+        self.assertIsNot(self.cache.statistics(df, 'speaker', self.formants), stats)
+
+    def test_eviction(self):
+        """Least recently used statistics are discarded."""
+        for by in ['speaker', 'vowel', 'gender', 'speaker']:
+            self.cache.statistics(self.df, by, self.formants)
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.misses, 4)
+
+    def test_invalidate(self):
+        """Statistics discarded for a data frame."""
+        self.cache.statistics(self.df, 'speaker', self.formants)
+        self.cache.statistics(self.df[:10], 'speaker', self.formants)
+        self.cache.invalidate(self.df)
+        self.assertEqual(len(self.cache), 1)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.misses, 0)
+
+    def test_pickle(self):
+        """Cached statistics are not pickled."""
+        self.cache.statistics(self.df, 'speaker', self.formants)
+        cache = pickle.loads(pickle.dumps(self.cache))
+        self.assertEqual(len(cache), 0)
+        cache.statistics(self.df, 'speaker', self.formants)
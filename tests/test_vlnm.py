@@ -4,12 +4,14 @@ Tests for the VLNM package.
 
 from io import StringIO
 import os
+import tempfile
 import unittest
 
-from pandas import read_csv
+from pandas import read_csv, read_parquet
 from vlnm import normalize
 from vlnm import register_normalizer
 from vlnm.normalizers.speaker import LobanovNormalizer
+from tests.helpers import assert_frame_equal
 
 ROOT = os.path.dirname(__file__)
 
@@ -42,3 +44,65 @@ class TestNormalize(unittest.TestCase):
         normalize(self.df, output, method='lobanov')
         actual = output.getvalue().split('\n')[0].split(',')
         self.assertListEqual(actual, expected)
+
+    def test_chunksize(self):
+        """
+        Normalize file in chunks.
+        """
+        data = StringIO()
+        self.df.to_csv(data, index=False)
+        data.seek(0)
+        expected = normalize(data, method='lobanov')
+        actual = normalize(data, method='lobanov', chunksize=50)
+        assert_frame_equal(actual, expected)
+
+    def test_chunksize_save_to_file(self):
+        """
+        Normalize file in chunks and save output to file(-like object).
+        """
+        data = StringIO()
+        self.df.to_csv(data, index=False)
+        expected = normalize(self.df.copy(), method='lobanov')
+        output = StringIO()
+        normalize(data, output, method='lobanov', chunksize=50)
+        output.seek(0)
+        actual = read_csv(output)
+        assert_frame_equal(actual, expected)
+
+    def test_method_list(self):
+        """
+        Normalize using several methods.
+        """
+        df = normalize(self.df, method=['lobanov', 'bark'])
+        expected = ['speaker', 'f1', 'f2', 'vowel',
+                    'f1_lobanov', 'f2_lobanov', 'f1_bark', 'f2_bark']
+        self.assertListEqual(list(df.columns), expected)
+
+    def test_parquet(self):
+        """
+        Normalize a Parquet file and save the output as Parquet.
+        """
+        df = self.df.copy()
+        df['vowel'] = df['vowel'].astype('category')
+        expected = normalize(df.copy(), method='lobanov')
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data = os.path.join(tmp_dir, 'data.parquet')
+            output = os.path.join(tmp_dir, 'output')
+            df.to_parquet(data, index=False)
+            normalize(data, output, method='lobanov')
+            actual = read_parquet(output)
+        assert_frame_equal(actual, expected)
+
+    def test_required_columns(self):
+        """
+        Read only the columns required by the normalizer.
+        """
+        df = self.df.copy()
+        df['age'] = 'old'
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data = os.path.join(tmp_dir, 'data.feather')
+            df.to_feather(data)
+            actual = normalize(data, method='lobanov', columns='required')
+            chunks = normalize(data, method='lobanov', columns='required', chunksize=50)
+        self.assertListEqual(list(actual.columns), ['speaker', 'f1', 'f2'])
+        assert_frame_equal(chunks, actual)
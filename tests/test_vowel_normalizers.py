@@ -6,8 +6,15 @@ Tests for the normalize module.
 
 import unittest
 
+import numpy as np
+
 from vlnm.conversion import hz_to_bark
-from vlnm.normalizers.vowel import BarkDifferenceNormalizer
+from vlnm.normalizers.vowel import (
+    BarkDifferenceNormalizer,
+    IEGMAGMNormalizer,
+    IEHTNormalizer,
+    _nearest_vowels)
+from vlnm.stats import factorize
 from tests.helpers import generate_data_frame
 
 
@@ -48,3 +55,116 @@ class TestBarkDifferenceNormalizer(unittest.TestCase):
         actual = BarkDifferenceNormalizer().normalize(
             self.df, **self.kwargs)
         self.assertTrue(actual[self.formants].equals(expected[self.formants]))
+
+    def test_normalize_arrays(self):
+        """Array output has one column for each difference."""
+        formants = ['f0', 'f1', 'f2', 'f3']
+        expected = BarkDifferenceNormalizer().normalize(
+            self.df.copy())[['f1', 'f2', 'f3']].values
+        actual = BarkDifferenceNormalizer().normalize_arrays(
+            self.df[formants].values, formants=formants)
+        self.assertTrue(np.allclose(actual, expected, equal_nan=True))
+
+
+class TestIEHTNormalizer(unittest.TestCase):
+    """
+    Test the IEHTNormalizer class
+    """
+
+    def setUp(self):
+        self.df = DATA_FRAME.copy()
+
+    def test_nearest_vowel(self):
+        """Tokens relabelled with the nearest vowel."""
+        actual = IEHTNormalizer().normalize(self.df.copy())
+        table = IEHTNormalizer().fit(self.df).parameters
+        beta = table.xs('mean', level='parameter')
+        mu = table.xs('mu', level='parameter')
+        sigma = table.xs('sigma', level='parameter')
+        for i in range(0, len(self.df), 17):
+            row = self.df.iloc[i]
+            if row[['f1', 'f2', 'f3']].isnull().any():
+                continue
+            normalized = row[['f1', 'f2']] / np.cbrt(np.prod(row[['f1', 'f2', 'f3']]))
+            distances = {
+                vowel: (((normalized * beta.loc[vowel] - mu.loc[vowel]) /
+                         sigma.loc[vowel]) ** 2).sum()
+                for vowel in beta.index}
+            vowel = min(distances, key=distances.get)
+            self.assertEqual(actual['vowel'].iloc[i], vowel)
+            self.assertAlmostEqual(
+                actual['f1'].iloc[i], normalized['f1'] * beta.loc[vowel, 'f1'])
+
+    def test_normalize_arrays(self):
+        """Normalizing arrays matches normalizing the data frame."""
+        formants = ['f1', 'f2', 'f3']
+        expected = IEHTNormalizer().normalize(self.df.copy())[formants].values
+        codes, _ = factorize(self.df['vowel'])
+        actual = IEHTNormalizer().normalize_arrays(
+            self.df[formants].values, vowel_codes=codes, formants=formants)
+        self.assertTrue(np.allclose(actual, expected, equal_nan=True))
+
+    def test_normalize_arrays_missing(self):
+        """Missing and unused vowel codes are not candidate vowels."""
+        formants = ['f1', 'f2', 'f3']
+        df = self.df.copy()
+        df.loc[df.index[:len(df) // 10], 'vowel'] = np.nan
+        expected = IEHTNormalizer().normalize(df.copy())[formants].values
+        codes, _ = factorize(df['vowel'])
+        codes = np.where(codes > 0, codes + 1, codes)
+        actual = IEHTNormalizer().normalize_arrays(
+            df[formants].values, vowel_codes=codes, formants=formants)
+        self.assertTrue(np.allclose(actual, expected, equal_nan=True))
+
+    def test_blocks(self):
+        """Distances calculated in blocks."""
+        values = np.random.random((100, 2))
+        beta, mu, sigma = np.random.random((3, 5, 2))
+        expected = _nearest_vowels(values, beta, mu, sigma)
+        actual = _nearest_vowels(values, beta, mu, sigma, block_size=7)
+        self.assertTrue(np.array_equal(actual, expected))
+
+
+class TestIEGMAGMNormalizer(unittest.TestCase):
+    """
+    Test the IEGMAGMNormalizer class
+    """
+
+    def setUp(self):
+        self.df = DATA_FRAME.copy()
+        self.formants = ['f1', 'f2', 'f3']
+
+    def test_output(self):
+        """Formants scaled by geometric mean of vowel means."""
+        actual = IEGMAGMNormalizer().normalize(self.df.copy())
+        means = self.df.groupby('vowel')[self.formants].mean()
+        for vowel, vowel_df in self.df.groupby('vowel'):
+            gmt = np.cbrt(vowel_df[self.formants].prod(axis=1))
+            gma = np.cbrt(means.loc[vowel].prod())
+            for formant in ['f1', 'f2']:
+                self.assertTrue(np.allclose(
+                    actual.loc[vowel_df.index, formant],
+                    vowel_df[formant] / gmt * gma,
+                    equal_nan=True))
+
+    def test_normalize_arrays(self):
+        """Normalizing arrays matches normalizing the data frame."""
+        expected = IEGMAGMNormalizer().normalize(self.df.copy())[self.formants].values
+        codes, _ = factorize(self.df['vowel'])
+        actual = IEGMAGMNormalizer().normalize_arrays(
+            self.df[self.formants].values, vowel_codes=codes, formants=self.formants)
+        self.assertTrue(np.allclose(actual, expected, equal_nan=True))
+
+    def test_normalize_arrays_vowel(self):
+        """Normalizing arrays requires vowel codes."""
+        with self.assertRaises(ValueError):
+            IEGMAGMNormalizer().normalize_arrays(
+                self.df[self.formants].values, formants=self.formants)
+
+    def test_transform_unknown_vowel(self):
+        """Vowels without fitted parameters are not normalized."""
+        norm = IEGMAGMNormalizer().fit(self.df[self.df['vowel'] != 'a'])
+        actual = norm.transform(self.df.copy())
+        unknown = self.df['vowel'] == 'a'
+        self.assertTrue(actual.loc[unknown, ['f1', 'f2']].isnull().all().all())
+        self.assertFalse(actual.loc[~unknown, ['f1', 'f2']].isnull().all().any())
@@ -18,36 +18,94 @@ from vlnm.data import (
 
 from vlnm.registration import (
     NORMALIZERS,
+    NormalizerRegistry,
     get_normalizer,
     register_normalizer)
 
-from vlnm.normalizers import *
+from vlnm import formats
+from vlnm import normalizers
+
+__all__ = normalizers.__all__ + [
+    'get_normalizer',
+    'hm2005',
+    'list_normalizers',
+    'normalize',
+    'pb1952',
+    'register_normalizer']
+
+
+def __getattr__(name):
+    # Normalizer classes are imported on first access (PEP 562).
+    if name in normalizers.__all__:
+        return getattr(normalizers, name)
+    raise AttributeError(
+        'module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(normalizers.__all__))
 
 
 def normalize(
-        data: Union[str, io.TextIOWrapper, pd.DataFrame],
-        file_out: Union[str, io.TextIOWrapper] = None,
-        method: str = 'default',
-        sep: str = ',', **kwargs) -> Optional[pd.DataFrame]:
+        data: Union[str, io.IOBase, pd.DataFrame],
+        file_out: Union[str, io.IOBase] = None,
+        method: Union[str, List[str]] = 'default',
+        sep: str = ',',
+        chunksize: int = None,
+        format: str = None,  # pylint: disable=redefined-builtin
+        columns: Union[str, List[str]] = None,
+        **kwargs) -> Optional[pd.DataFrame]:
     """Normalize vowel data.
 
     Parameters
     ----------
 
     data:
-        A path to a CSV file containing the data,
+        A path to a file containing the data,
         a file handle to an open file containing the data,
         or a Pandas :class:`DataFrame` containing the data.
+        Files can be CSV, Parquet or Feather (Arrow IPC) files
+        (see :mod:`vlnm.formats`).
     file_out:
         An optional a file path or a file handle
-        to which the output data will be saved (using ``DataFrame.to_csv``).
+        to which the output data will be saved.
     method:
         The name of a normalization method.
         Method names can be found using the :func:`list_normalizers` function.
+        If a list of names is given, the data are normalized by
+        each method in a single pass (see :class:`.NormalizerBundle`)
+        and the output columns of each method are suffixed with its name.
     sep:
-        The column separator in a file.
+        The column separator in a CSV file.
+    chunksize:
+        If given, and ``data`` is a file, read and normalize
+        the data in chunks of this many rows,
+        so the whole file never needs to be in memory.
+        Normalizers which need statistics calculated from
+        the data (e.g., speaker means)
+        read the file twice: once to calculate the
+        statistics (see :meth:`.Normalizer.partial_fit`)
+        and once to normalize each chunk.
+        If ``file_out`` is specified, each chunk is written
+        to the output as soon as it has been normalized.
+    format:
+        The format of the files
+        (``'csv'``, ``'parquet'`` or ``'feather'``).
+        If omitted, the format of ``data`` is detected from its extension,
+        and the output is written in the format
+        indicated by the extension of ``file_out``
+        or, failing that, the format of ``data``.
+    columns:
+        If given, and ``data`` is a file, only read these columns.
+        If ``'required'``, only read the columns the normalizer
+        needs (e.g., the speaker, vowel and formant columns).
+        For Parquet and Feather files the other columns
+        are not read from disk at all.
     **kwargs :
         Other keyword arguments passed on to the normalizer class.
+        For example, ``result_cache=True`` caches the normalized data
+        on disk, so normalizing the same data again
+        only reads the result (see :mod:`vlnm.cache`).
 
 
     Returns
@@ -56,19 +114,58 @@ def normalize(
         If ``file_out`` is not specified, a Pandas :class:`DataFrame`
         containing the normalized data.
     """
-    try:
-        df = pd.read_csv(data, sep=sep, header=0)
-    except (TypeError, ValueError):
+    if isinstance(method, (list, tuple)):
+        if chunksize:
+            raise ValueError('Cannot normalize in chunks using several methods')
+        normalizer = normalizers.NormalizerBundle(list(method), **kwargs)
+    else:
+        normalizer = get_normalizer(method)(**kwargs)
+
+    format_in = None
+    if not isinstance(data, pd.DataFrame):
+        format_in = formats.get_format(data, format)
+        if columns == 'required':
+            columns = normalizer.required_columns(
+                formats.read_columns(data, format_in, sep=sep))
+    format_out = formats.get_format(file_out, format, default=format_in)
+
+    if chunksize and not isinstance(data, pd.DataFrame):
+        return _normalize_chunks(
+            normalizer, data, file_out, sep, chunksize,
+            format_in, format_out, columns)
+
+    if isinstance(data, pd.DataFrame):
         df = data
+    else:
+        df = formats.read_data(data, format_in, columns=columns, sep=sep)
 
-    df_norm = get_normalizer(method)(**kwargs).normalize(df)
+    df_norm = normalizer.normalize(df)
 
     if file_out:
-        df_norm.to_csv(file_out, sep=sep, header=True, index=False)
+        formats.write_data(df_norm, file_out, format_out, sep=sep)
         return None
     return df_norm
 
 
+def _normalize_chunks(
+        normalizer, data, file_out, sep, chunksize, format_in, format_out, columns):
+    """Normalize a file in chunks."""
+    # Accumulate the normalization parameters.
+    for chunk in formats.read_chunks(data, chunksize, format_in, columns, sep):
+        normalizer.partial_fit(chunk)
+        if normalizer.parameters is None:
+            break
+
+    norm_dfs = (
+        normalizer.transform(chunk)
+        for chunk in formats.read_chunks(data, chunksize, format_in, columns, sep))
+
+    if file_out:
+        formats.write_chunks(norm_dfs, file_out, format_out, sep=sep)
+        return None
+    return pd.concat(list(norm_dfs), ignore_index=True)
+
+
 def list_normalizers(sort: bool = True, module: str = None, index: Dict = None) -> List[str]:
     """Return a list of available normalizers.
 
@@ -104,8 +201,11 @@ def list_normalizers(sort: bool = True, module: str = None, index: Dict = None)
     if module:
         filtered = []
         for name in names:
-            normalizer = get_normalizer(name)
-            if normalizer.__module__.startswith(module):
+            if isinstance(index, NormalizerRegistry):
+                name_module = index.module(name)
+            else:
+                name_module = get_normalizer(name, index=index).__module__
+            if name_module.startswith(module):
                 filtered.append(name)
         names = filtered
     return names
@@ -0,0 +1,322 @@
+"""
+Result cache
+~~~~~~~~~~~~
+
+Normalizers created with the ``result_cache`` option
+(e.g., ``LobanovNormalizer(result_cache=True)``
+or ``vlnm.normalize(df, method='lobanov', result_cache=True)``)
+keep their results in a :class:`ResultCache`,
+so normalizing the same data with the same normalizer again
+only reads the result from disk.
+
+Results are keyed by a hash of the input columns used by the normalizer
+(so changes to other columns do not invalidate the result)
+and a canonical serialization of the class of the normalizer,
+its configuration and its options (see :func:`canonical`).
+Only the columns written by the normalizer are stored,
+as Feather (Arrow IPC) or Parquet files
+(so PyArrow must be installed)
+under a cache directory (see :func:`vlnm.data.cache.cache_dir`).
+The least recently used results are removed when the
+total size of the cached results exceeds a given number of bytes.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from . import __version__
+from . import formats
+from .data.cache import cache_dir
+from .stats import fingerprint
+
+# Version of the cache layout.
+CACHE_VERSION = 1
+
+# Default maximum size of the result cache in bytes.
+DEFAULT_MAXBYTES = 2 ** 31
+
+# Options which do not affect the result of a normalizer.
+IGNORED_OPTIONS = ['n_jobs', 'executor', 'stats_cache', 'result_cache']
+
+# Column holding the input row of each output row, if they differ.
+ROW_COLUMN = '__row__'
+
+
+def _plain(value: Any) -> Any:
+    """Convert a value to plain JSON data."""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [type(value).__name__, [_plain(item) for item in value]]
+    if isinstance(value, dict):
+        items = [[_plain(key), _plain(item)] for key, item in value.items()]
+        return ['dict', sorted(items, key=json.dumps)]
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        frame = value.to_frame() if isinstance(value, pd.Series) else value
+        return ['frame', fingerprint(frame.reset_index())]
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        digest = hashlib.blake2b(np.ascontiguousarray(value).tobytes(), digest_size=16)
+        return ['array', str(value.dtype), list(value.shape), digest.hexdigest()]
+    if isinstance(value, np.ufunc):
+        return ['ufunc', 'numpy', value.__name__]
+    if callable(value):
+        module = getattr(value, '__module__', None)
+        name = getattr(value, '__qualname__', None)
+        # Lambdas and nested functions cannot be identified by name.
+        if module and name and '<' not in name:
+            return ['callable', module, name]
+    raise TypeError('Cannot serialize {}'.format(type(value).__name__))
+
+
+def canonical(value: Any) -> str:
+    """A canonical serialization of a value.
+
+    Values can be (nested) lists, tuples and dictionaries of
+    scalars, NumPy arrays, pandas data frames and series
+    (which are represented by their fingerprint)
+    and named functions or classes.
+
+    Raises :class:`TypeError` for values which cannot be serialized
+    (including lambdas, which cannot be distinguished by name).
+    """
+    return json.dumps(_plain(value), sort_keys=True)
+
+
+class ResultCache:
+    """An on-disk cache of normalization results.
+
+    Parameters
+    ----------
+    directory:
+        The directory in which results are stored.
+        If omitted, a ``results`` directory under
+        :func:`vlnm.data.cache.cache_dir`.
+    maxbytes:
+        The maximum total size of the cached results in bytes.
+    format:
+        The format of the cached results:
+        ``'feather'`` (the default, which is fastest to read)
+        or ``'parquet'`` (which is smaller).
+
+    Examples
+    --------
+
+    .. ipython::
+
+        import tempfile
+        from vlnm import pb1952, LobanovNormalizer
+        from vlnm.cache import ResultCache
+
+        df = pb1952(['speaker', 'vowel', 'f1', 'f2'])
+        cache = ResultCache(tempfile.mkdtemp())
+        normalizer = LobanovNormalizer(result_cache=cache)
+        norm_df = normalizer.normalize(df)
+        norm_df = normalizer.normalize(df)
+        cache.hits, cache.misses
+
+    """
+
+    def __init__(
+            self,
+            directory: str = None,
+            maxbytes: int = DEFAULT_MAXBYTES,
+            format: str = 'feather'):  # pylint: disable=redefined-builtin
+        self.directory = directory or os.path.join(cache_dir(), 'results')
+        self.maxbytes = maxbytes
+        self.format = formats.get_format(format=format)
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key, ext):
+        return os.path.join(self.directory, '{}.{}'.format(key, ext))
+
+    def key(self, normalizer, df: pd.DataFrame, columns: List[str]) -> Optional[str]:
+        """The key of the result of normalizing a data frame.
+
+        Parameters
+        ----------
+        normalizer:
+            The normalizer, set up to normalize the data frame.
+        df:
+            The data frame.
+        columns:
+            The columns used by the normalizer.
+
+        Returns
+        -------
+        :
+            A hexadecimal digest,
+            or ``None`` if the options of the normalizer
+            cannot be serialized (see :func:`canonical`).
+        """
+        cls = type(normalizer)
+        options = {
+            key: value for key, value in normalizer.options.items()
+            if key not in IGNORED_OPTIONS}
+        try:
+            identity = canonical([
+                CACHE_VERSION,
+                __version__,
+                '{}.{}'.format(cls.__module__, cls.__qualname__),
+                normalizer.config,
+                options,
+                normalizer.formants,
+                [str(df[column].dtype) for column in columns]])
+        except TypeError:
+            return None
+        digest = hashlib.blake2b(identity.encode('utf-8'), digest_size=16)
+        digest.update(fingerprint(df, columns).encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key: Optional[str], df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """Return a cached result.
+
+        Parameters
+        ----------
+        key:
+            The key of the result (see :meth:`key`).
+        df:
+            The data frame which was normalized.
+
+        Returns
+        -------
+        :
+            The normalized data frame,
+            or ``None`` if the result is not cached.
+        """
+        if key is None:
+            return None
+        data_path = self._path(key, self.format)
+        meta_path = self._path(key, 'json')
+        try:
+            with open(meta_path) as file_in:
+                meta = json.load(file_in)
+            result = formats.read_data(data_path, self.format)
+            os.utime(meta_path)
+            os.utime(data_path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        if ROW_COLUMN in result:
+            df = df.take(result[ROW_COLUMN].values)
+        # Other columns are taken from the data frame,
+        # whose unused columns may differ from the cached one.
+        outputs = {column: result[column].values for column in meta['outputs']}
+        columns = list(df.columns) + [
+            column for column in meta['columns']
+            if column in outputs and column not in df.columns]
+        return pd.DataFrame(
+            {column: outputs[column] if column in outputs else df[column].values
+             for column in columns},
+            index=df.index)
+
+    def put(
+            self,
+            key: Optional[str],
+            df: pd.DataFrame,
+            norm_df: pd.DataFrame,
+            columns: List[str],
+            used: List[str]):
+        """Add a result to the cache.
+
+        Only the output columns (columns of the result which are
+        not in the input, or used columns which have been changed)
+        are stored.
+        Results whose columns cannot be stored are not cached.
+
+        Parameters
+        ----------
+        key:
+            The key of the result (see :meth:`key`).
+        df:
+            The data frame which was normalized.
+        norm_df:
+            The normalized data frame.
+        columns:
+            The columns of the data frame before it was normalized.
+        used:
+            The columns used by the normalizer.
+        """
+        if key is None:
+            return
+        aligned = norm_df.index.equals(df.index)
+        if not aligned and not df.index.is_unique:
+            return
+        outputs = [
+            column for column in norm_df.columns
+            if column not in columns or (
+                column in used and not (aligned and norm_df[column].equals(df[column])))]
+        result = pd.DataFrame(
+            {column: norm_df[column].values for column in outputs})
+        if not aligned:
+            result[ROW_COLUMN] = df.index.get_indexer(norm_df.index)
+        meta = dict(columns=list(norm_df.columns), outputs=outputs)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            handle, tmp_path = tempfile.mkstemp(prefix='.tmp', dir=self.directory)
+            os.close(handle)
+            try:
+                formats.write_data(result, tmp_path, self.format)
+                os.replace(tmp_path, self._path(key, self.format))
+                with open(tmp_path, 'w') as file_out:
+                    json.dump(meta, file_out)
+                os.replace(tmp_path, self._path(key, 'json'))
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        except (OSError, TypeError, ValueError, NotImplementedError):
+            return
+        self.evict()
+
+    def _entries(self):
+        """The cached files, least recently used first."""
+        try:
+            entries = [
+                entry for entry in os.scandir(self.directory)
+                if entry.is_file() and not entry.name.startswith('.')]
+        except OSError:
+            return []
+        return sorted(entries, key=lambda entry: entry.stat().st_mtime_ns)
+
+    @property
+    def nbytes(self) -> int:
+        """The total size of the cached results in bytes."""
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def evict(self):
+        """Remove the least recently used results until the cache is small enough."""
+        entries = self._entries()
+        nbytes = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if nbytes <= self.maxbytes:
+                break
+            key, _ = os.path.splitext(entry.name)
+            for ext in [self.format, 'json']:
+                path = self._path(key, ext)
+                try:
+                    nbytes -= os.path.getsize(path)
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def clear(self):
+        """Remove all cached results and reset the counters."""
+        for entry in self._entries():
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+        self.hits = self.misses = 0
+
+
+#: Cache used by normalizers created with ``result_cache=True``.
+RESULT_CACHE = ResultCache()
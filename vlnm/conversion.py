@@ -3,13 +3,296 @@ Conversion
 ~~~~~~~~~~
 
 This module contains miscellaeneous functions for converting
-from Hz to other scales.
+from Hz to other scales, and back again.
+Each pair of conversions is also available from
+a registry of :class:`Transform` objects (see :func:`get_transform`).
+
+Each conversion is evaluated by an element-wise :class:`Kernel`.
+By default the data are converted in blocks of :data:`BLOCK_SIZE`
+elements, so temporary arrays remain small whatever the size of the data.
+If `Numba <https://numba.pydata.org>`_ is installed,
+the kernels can instead be compiled to NumPy ufuncs
+which convert the data in a single pass
+(see :func:`set_backend`).
+With either backend ``float32`` data are converted without promotion
+to ``float64``, and the ``out`` parameter of the conversion functions
+can be used to write the converted data into an existing array
+(including the input array itself).
 """
 
+from typing import Callable, Union
+
 import numpy as np
+import pandas as pd
+
+#: Number of elements converted at a time by the ``numpy`` backend.
+BLOCK_SIZE = 2 ** 14
+
+BACKENDS = ['numpy', 'numba']
+
+_BACKEND = dict(name='numpy')
+
+
+def _numba():
+    # Numba is slow to import, so defer importing it until it is used.
+    try:
+        import numba  # pylint: disable=import-outside-toplevel
+    except ImportError as error:
+        raise ImportError('The numba backend requires Numba to be installed') from error
+    return numba
+
+
+def set_backend(name: str):
+    """Set the backend used to evaluate conversion kernels.
+
+    Parameters
+    ----------
+    name:
+        Either ``'numpy'`` (the default), which converts data in blocks
+        using NumPy functions, or ``'numba'``,
+        which compiles each kernel to a NumPy ufunc the first
+        time it is used.
+        Note that the compiled kernels use the C maths library,
+        so results may differ from the ``numpy`` backend
+        in the last decimal place.
+    """
+    if name not in BACKENDS:
+        raise ValueError('Unknown backend: {}'.format(name))
+    if name == 'numba':
+        _numba()
+    _BACKEND['name'] = name
+
+
+class Kernel:
+    """An element-wise conversion from Hz.
+
+    Parameters
+    ----------
+    func:
+        The conversion for NumPy arrays.
+    scalar_func:
+        The conversion for a single value,
+        used to compile the kernel with Numba.
+        If omitted, ``func`` is used.
+    """
+
+    def __init__(
+            self,
+            func: Callable[[np.ndarray], np.ndarray],
+            scalar_func: Callable[[float], float] = None):
+        self.func = func
+        self.scalar_func = scalar_func or func
+        self._ufunc = None
+
+    @property
+    def ufunc(self) -> np.ufunc:
+        """The kernel compiled to a NumPy ufunc (requires Numba)."""
+        if self._ufunc is None:
+            self._ufunc = _numba().vectorize(
+                ['float32(float32)', 'float64(float64)'])(self.scalar_func)
+        return self._ufunc
+
+    def __call__(
+            self,
+            frq: Union[float, np.ndarray, pd.Series, pd.DataFrame],
+            out: np.ndarray = None):
+        if isinstance(frq, (pd.Series, pd.DataFrame)):
+            values = self(frq.values, out=out)
+            if out is not None:
+                return out
+            if isinstance(frq, pd.Series):
+                return pd.Series(values, index=frq.index, name=frq.name)
+            return pd.DataFrame(values, index=frq.index, columns=frq.columns)
+
+        values = np.asarray(frq)
+        if values.dtype not in (np.float32, np.float64):
+            values = values.astype(np.float64)
+        scalar = values.ndim == 0 and out is None
+        if out is None:
+            out = np.empty(values.shape, dtype=values.dtype)
+
+        if _BACKEND['name'] == 'numba':
+            self.ufunc(values, out=out)
+        elif values.ndim == 0:
+            out[...] = self.func(values)
+        else:
+            step = max(1, BLOCK_SIZE * values.shape[0] // max(1, values.size))
+            for start in range(0, values.shape[0], step):
+                out[start:start + step] = self.func(values[start:start + step])
+        return out[()] if scalar else out
+
+
+def _greenwood(frq):
+    return 11.9 * np.log10(frq / 165.4 + 0.88)
+
+
+def _syrdal(frq):
+    frq = np.where(frq < 150., 150., frq)
+    frq = np.where(
+        (frq >= 150.) & (frq < 200.), frq - (0.2 * (frq - 150.)), frq)
+    frq = np.where(
+        (frq >= 200.) & (frq < 250.), frq - (0.2 * (250. - frq)), frq)
+    return _zwicker(frq)
+
+
+def _syrdal_scalar(frq):
+    if frq < 150.:
+        frq = 150.
+    if 150. <= frq < 200.:
+        frq = frq - (0.2 * (frq - 150.))
+    elif 200. <= frq < 250.:
+        frq = frq - (0.2 * (250. - frq))
+    return (13 * np.arctan(0.00076 * frq) +
+            3.5 * np.arctan(frq / 7500.) ** 2)
+
+
+def _traunmuller(frq):
+    return 26.81 * frq / (frq + 1960) - 0.53
+
+
+def _volk(frq):
+    return 32.12 * (1. - (1. + (frq / 873.47) ** 1.18) ** -0.4)
+
+
+def _zwicker(frq):
+    return (13 * np.arctan(0.00076 * frq) +
+            3.5 * np.arctan(frq / 7500.) ** 2)
+
+
+def _mel(frq):
+    return 1127. * np.log(1. + frq / 700.)
+
+
+def _erb(frq):
+    return 21.4 * np.log(1 + 0.00437 * frq)
+
+
+def _log(frq):
+    return np.log(frq)
+
+
+def _log10(frq):
+    return np.log10(frq)
+
+
+def _greenwood_inverse(bark):
+    return 165.4 * (10. ** (bark / 11.9) - 0.88)
+
+
+#: Upper limit of the Zwicker and Terhardt Bark scale.
+ZWICKER_MAX = 13 * np.pi / 2 + 3.5 * (np.pi / 2) ** 2
+
+#: Number of Newton iterations used to invert the Zwicker and Terhardt Bark scale.
+ZWICKER_ITERATIONS = 20
+
+
+def _zwicker_inverse(bark):
+    # Newton's method, starting from the inverse of the Traunmüller formula.
+    bark = np.where((bark >= 0.) & (bark < ZWICKER_MAX), bark, np.nan)
+    start = bark + 0.53
+    frq = np.where(start < 26.81, 1960. * start / (26.81 - start), 1e5)
+    for _ in range(ZWICKER_ITERATIONS):
+        atan = np.arctan(frq / 7500.)
+        slope = (
+            13 * 0.00076 / (1. + (0.00076 * frq) ** 2) +
+            7. * atan / (7500. * (1. + (frq / 7500.) ** 2)))
+        frq = frq - (13 * np.arctan(0.00076 * frq) + 3.5 * atan ** 2 - bark) / slope
+        frq = np.maximum(frq, 0.)
+    return frq
+
+
+def _zwicker_inverse_scalar(bark):
+    if not 0. <= bark < ZWICKER_MAX:
+        return np.nan
+    start = bark + 0.53
+    frq = 1960. * start / (26.81 - start) if start < 26.81 else 1e5
+    for _ in range(ZWICKER_ITERATIONS):
+        atan = np.arctan(frq / 7500.)
+        slope = (
+            13 * 0.00076 / (1. + (0.00076 * frq) ** 2) +
+            7. * atan / (7500. * (1. + (frq / 7500.) ** 2)))
+        frq = max(frq - (13 * np.arctan(0.00076 * frq) + 3.5 * atan ** 2 - bark) / slope, 0.)
+    return frq
+
+
+def _syrdal_inverse(bark):
+    frq = _zwicker_inverse(bark)
+    return np.where(
+        (frq >= 150.) & (frq < 190.), (frq - 30.) / 0.8,
+        np.where((frq >= 190.) & (frq < 250.), (frq + 50.) / 1.2, frq))
+
+
+def _syrdal_inverse_scalar(bark):
+    if not 0. <= bark < ZWICKER_MAX:
+        return np.nan
+    start = bark + 0.53
+    frq = 1960. * start / (26.81 - start) if start < 26.81 else 1e5
+    for _ in range(ZWICKER_ITERATIONS):
+        atan = np.arctan(frq / 7500.)
+        slope = (
+            13 * 0.00076 / (1. + (0.00076 * frq) ** 2) +
+            7. * atan / (7500. * (1. + (frq / 7500.) ** 2)))
+        frq = max(frq - (13 * np.arctan(0.00076 * frq) + 3.5 * atan ** 2 - bark) / slope, 0.)
+    if 150. <= frq < 190.:
+        return (frq - 30.) / 0.8
+    if 190. <= frq < 250.:
+        return (frq + 50.) / 1.2
+    return frq
+
+
+def _traunmuller_inverse(bark):
+    return 1960. * (bark + 0.53) / (26.81 - (bark + 0.53))
+
 
+def _volk_inverse(bark):
+    return 873.47 * ((1. - bark / 32.12) ** -2.5 - 1.) ** (1. / 1.18)
 
-def hz_to_bark(frq: np.ndarray, method: str = 'traunmuller') -> np.ndarray:
+
+def _mel_inverse(mel):
+    return 700. * (np.exp(mel / 1127.) - 1.)
+
+
+def _erb_inverse(erb):
+    return (np.exp(erb / 21.4) - 1.) / 0.00437
+
+
+def _log_inverse(log):
+    return np.exp(log)
+
+
+def _log10_inverse(log10):
+    return 10. ** log10
+
+
+BARK_KERNELS = dict(
+    greenwood=Kernel(_greenwood),
+    syrdal=Kernel(_syrdal, _syrdal_scalar),
+    traunmuller=Kernel(_traunmuller),
+    volk=Kernel(_volk),
+    zwicker=Kernel(_zwicker))
+
+MEL_KERNEL = Kernel(_mel)
+ERB_KERNEL = Kernel(_erb)
+LOG_KERNEL = Kernel(_log)
+LOG10_KERNEL = Kernel(_log10)
+
+BARK_INVERSE_KERNELS = dict(
+    greenwood=Kernel(_greenwood_inverse),
+    syrdal=Kernel(_syrdal_inverse, _syrdal_inverse_scalar),
+    traunmuller=Kernel(_traunmuller_inverse),
+    volk=Kernel(_volk_inverse),
+    zwicker=Kernel(_zwicker_inverse, _zwicker_inverse_scalar))
+
+MEL_INVERSE_KERNEL = Kernel(_mel_inverse)
+ERB_INVERSE_KERNEL = Kernel(_erb_inverse)
+LOG_INVERSE_KERNEL = Kernel(_log_inverse)
+LOG10_INVERSE_KERNEL = Kernel(_log10_inverse)
+
+
+def hz_to_bark(
+        frq: np.ndarray,
+        method: str = 'traunmuller',
+        out: np.ndarray = None) -> np.ndarray:
     r"""Convert from Hz to Bark scale.
 
     Parameters
@@ -66,29 +349,22 @@ def hz_to_bark(frq: np.ndarray, method: str = 'traunmuller') -> np.ndarray:
             F^\prime = 13 \arctan\left( 0.76\frac{F}{1000} \right) +
             3.5 \arctan \left( \frac{F}{7500} \right)^2
 
+    out :
+        Optional array in which to store the converted data.
+
     Return
     ------
     :
         The converted data.
     """
-    if method == 'greenwood':
-        return 11.9 * np.log10(frq / 165.4 + 0.88)
-    elif method == 'syrdal':
-        frq[frq < 150.] = 150.
-        frq[(frq >= 150.) & (frq < 200)] = frq - (0.2 * (frq - 150.))
-        frq[(frq >= 200.) & (frq < 250)] = frq - (0.2 * (250. - frq))
-        return hz_to_bark(frq, method='zwicker')
-    elif method == 'traunmuller':
-        return 26.81 * frq / (frq + 1960) - 0.53
-    elif method == 'volk':
-        return 32.12 * (1. - (1. + (frq / 873.47) ** 1.18) ** -0.4)
-    elif method == 'zwicker':
-        return (13 * np.arctan(0.00076 * frq) +
-                3.5 * np.arctan(frq / 7500.) ** 2)
-    raise ValueError('Unknown method: {}'.format(method))
-
-
-def hz_to_mel(frq: np.ndarray) -> np.ndarray:
+    try:
+        kernel = BARK_KERNELS[method]
+    except KeyError:
+        raise ValueError('Unknown method: {}'.format(method))
+    return kernel(frq, out=out)
+
+
+def hz_to_mel(frq: np.ndarray, out: np.ndarray = None) -> np.ndarray:
     r"""Convert from Hz to mel scale.
 
     The formula used here is the 'natural-log' equivalent
@@ -104,15 +380,18 @@ def hz_to_mel(frq: np.ndarray) -> np.ndarray:
     frq:
         The frequency data to convert.
 
+    out :
+        Optional array in which to store the converted data.
+
     Return
     ------
     :
         The converted data.
     """
-    return 1127. * np.log(1. + frq / 700.)
+    return MEL_KERNEL(frq, out=out)
 
 
-def hz_to_erb(frq: np.ndarray) -> np.ndarray:
+def hz_to_erb(frq: np.ndarray, out: np.ndarray = None) -> np.ndarray:
     r"""Convert Hz to approximate ERB scale.
 
     Formula taken from :citet:`{% moore_glasberg_1996 %}, p.336`:
@@ -127,15 +406,18 @@ def hz_to_erb(frq: np.ndarray) -> np.ndarray:
     frq :
         The frequency data to convert.
 
+    out :
+        Optional array in which to store the converted data.
+
     Return
     ------
     :
         The converted data.
     """
-    return 21.4 * np.log(1 + 0.00437 * frq)
+    return ERB_KERNEL(frq, out=out)
 
 
-def hz_to_log(frq: np.ndarray) -> np.ndarray:
+def hz_to_log(frq: np.ndarray, out: np.ndarray = None) -> np.ndarray:
     r"""Convert Hz to the natural logarithmic scale.
 
     .. math::
@@ -148,15 +430,18 @@ def hz_to_log(frq: np.ndarray) -> np.ndarray:
     frq :
         The frequency data to convert.
 
+    out :
+        Optional array in which to store the converted data.
+
     Return
     ------
     :
         The converted data.
     """
-    return np.log(frq)
+    return LOG_KERNEL(frq, out=out)
 
 
-def hz_to_log10(frq: np.ndarray) -> np.ndarray:
+def hz_to_log10(frq: np.ndarray, out: np.ndarray = None) -> np.ndarray:
     r"""Convert Hz to the base-10 logarithmic scale.
 
     .. math::
@@ -169,9 +454,238 @@ def hz_to_log10(frq: np.ndarray) -> np.ndarray:
     frq :
         The frequency data to convert.
 
+    out :
+        Optional array in which to store the converted data.
+
     Return
     ------
     :
         The converted data.
     """
-    return np.log(frq)
+    return LOG10_KERNEL(frq, out=out)
+
+
+def bark_to_hz(
+        bark: np.ndarray,
+        method: str = 'traunmuller',
+        out: np.ndarray = None) -> np.ndarray:
+    r"""Convert from the Bark scale to Hz.
+
+    This is the inverse of :func:`hz_to_bark`.
+
+    Parameters
+    ----------
+
+    bark :
+        The Bark data to convert.
+
+    method :
+        The conversion method used
+        (see :func:`hz_to_bark` for the list of methods).
+        If not given, defaults to ``'traumuller'``.
+        The ``'syrdal'`` and ``'zwicker'`` conversions
+        cannot be inverted algebraically, so are inverted
+        using a fixed number of iterations of Newton's method.
+        As the ``'syrdal'`` conversion maps all frequencies below 150Hz
+        to 150Hz, these frequencies cannot be recovered.
+
+    out :
+        Optional array in which to store the converted data.
+
+    Return
+    ------
+    :
+        The converted data.
+    """
+    try:
+        kernel = BARK_INVERSE_KERNELS[method]
+    except KeyError:
+        raise ValueError('Unknown method: {}'.format(method))
+    return kernel(bark, out=out)
+
+
+def mel_to_hz(mel: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    r"""Convert from the mel scale to Hz.
+
+    This is the inverse of :func:`hz_to_mel`:
+
+    .. math::
+
+       F = 700\left(\exp\left(\frac{F^\prime}{1127}\right) - 1\right)
+
+    Parameters
+    ----------
+
+    mel:
+        The mel data to convert.
+
+    out:
+        Optional array in which to store the converted data.
+
+    Return
+    ------
+    :
+        The converted data.
+    """
+    return MEL_INVERSE_KERNEL(mel, out=out)
+
+
+def erb_to_hz(erb: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    r"""Convert from the ERB scale to Hz.
+
+    This is the inverse of :func:`hz_to_erb`:
+
+    .. math::
+
+       F = \frac{\exp\left(F^\prime / 21.4\right) - 1}{0.00437}
+
+    Parameters
+    ----------
+
+    erb :
+        The ERB data to convert.
+
+    out :
+        Optional array in which to store the converted data.
+
+    Return
+    ------
+    :
+        The converted data.
+    """
+    return ERB_INVERSE_KERNEL(erb, out=out)
+
+
+def log_to_hz(log: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    r"""Convert from the natural logarithmic scale to Hz.
+
+    .. math::
+
+       F = \exp\left(F^\prime\right)
+
+    Parameters
+    ----------
+
+    log :
+        The data to convert.
+
+    out :
+        Optional array in which to store the converted data.
+
+    Return
+    ------
+    :
+        The converted data.
+    """
+    return LOG_INVERSE_KERNEL(log, out=out)
+
+
+def log10_to_hz(log10: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    r"""Convert from the base-10 logarithmic scale to Hz.
+
+    .. math::
+
+       F = 10^{F^\prime}
+
+    Parameters
+    ----------
+
+    log10 :
+        The data to convert.
+
+    out :
+        Optional array in which to store the converted data.
+
+    Return
+    ------
+    :
+        The converted data.
+    """
+    return LOG10_INVERSE_KERNEL(log10, out=out)
+
+
+class Transform:
+    """A conversion from Hz and its inverse.
+
+    Parameters
+    ----------
+    name:
+        The name of the transform.
+    forward:
+        The function converting from Hz.
+    inverse:
+        The function converting back to Hz.
+    """
+
+    def __init__(self, name: str, forward: Callable, inverse: Callable):
+        self.name = name
+        self.forward = forward
+        self.inverse = inverse
+
+    def __repr__(self):
+        return 'Transform({!r})'.format(self.name)
+
+
+TRANSFORMS = {}
+
+
+def register_transform(name: str, forward: Callable, inverse: Callable) -> Transform:
+    """Register a conversion from Hz and its inverse.
+
+    Parameters
+    ----------
+    name:
+        The name of the transform.
+    forward:
+        The function converting from Hz.
+    inverse:
+        The function converting back to Hz.
+
+    Returns
+    -------
+    :
+        The registered transform.
+    """
+    transform = Transform(name, forward, inverse)
+    TRANSFORMS[name] = transform
+    return transform
+
+
+def get_transform(transform: Union[str, Callable]) -> Transform:
+    """Look up a registered transform.
+
+    Parameters
+    ----------
+    transform:
+        The name of the transform, or the function converting
+        from Hz (e.g., :func:`hz_to_bark`).
+
+    Returns
+    -------
+    :
+        The :class:`Transform`, or ``None`` if no
+        transform is registered.
+    """
+    if isinstance(transform, str):
+        return TRANSFORMS.get(transform)
+    for registered in TRANSFORMS.values():
+        if registered.forward is transform:
+            return registered
+    return None
+
+
+def _method(func, method):
+    def _convert(frq, out=None):
+        return func(frq, method=method, out=out)
+    _convert.__name__ = '{}_{}'.format(func.__name__, method)
+    return _convert
+
+
+register_transform('bark', hz_to_bark, bark_to_hz)
+for _name in BARK_KERNELS:
+    register_transform(
+        'bark-{}'.format(_name), _method(hz_to_bark, _name), _method(bark_to_hz, _name))
+register_transform('erb', hz_to_erb, erb_to_hz)
+register_transform('log', hz_to_log, log_to_hz)
+register_transform('log10', hz_to_log10, log10_to_hz)
+register_transform('mel', hz_to_mel, mel_to_hz)
@@ -15,6 +15,15 @@ from typing import Callable, Dict, List, Type, Union
 import numpy as np
 import pandas as pd
 
+from ..formats import get_format, read_data
+from .cache import (
+    Column,
+    DatasetCache,
+    read_sidecar,
+    sidecar_directories,
+    signature,
+    write_sidecar)
+
 WHERE_AM_I = os.path.realpath(os.path.dirname(__file__))
 
 
@@ -28,7 +37,8 @@ class Dataset:
 
     source:
         Absolute file path to the dataset source.
-        Must be readable by :func:`pd.read_csv`.
+        This can be a CSV, Parquet or Feather file
+        (see :mod:`vlnm.formats`).
 
     dtypes:
         Dictionary mapping column names on
@@ -38,41 +48,65 @@ class Dataset:
     Other parameters
     ----------------
 
+    format:
+        The format of the source.
+        If omitted, the format is detected from the file extension.
     \*\*kwargs:
-        Passed on to the :func:`pd.read_csv` function
-        when data is loaded.
+        Passed on to the :func:`pd.read_csv`
+        (or :func:`pd.read_parquet` or :func:`pd.read_feather`)
+        function when data is loaded.
 
     """
 
-    CACHE = {}
+    CACHE = DatasetCache()
     USE_CACHE = False
+    USE_SIDECAR = True
 
     def __init__(
             self,
             source: str,
             dtypes: Dict[str, Union[Callable, Type]] = None,
+            format: str = None,  # pylint: disable=redefined-builtin
             **kwargs):
         self.source = source
         self.dtypes = dtypes or {}
+        self.format = get_format(source, format)
         self.kwargs = kwargs
 
     @staticmethod
-    def enable_cache(enable: bool = True):
+    def enable_cache(
+            enable: bool = True,
+            maxbytes: int = None,
+            sidecar: bool = True):
         """Enable caching for datasets.
 
         By default data sets are loaded from disk.
-        When the cache is enabled, data sets will be
-        loaded in to memory, and subsequent calls
-        to the :func:`load` method will return
-        a copy of this data set.
+        When the cache is enabled, the columns of a data set
+        are converted to their data types once, and
+        saved to a binary sidecar next to the data set
+        (see :mod:`vlnm.data.cache`).
+        Subsequent calls to the :func:`load` method
+        memory-map the columns from the sidecar copy-on-write,
+        so are almost free in both time and memory.
 
         Parameters
         ----------
         enable:
             If ``True`` enable and reset the cache.
+        maxbytes:
+            If given, the maximum size of the
+            cached columns in bytes.
+        sidecar:
+            If ``False``, do not use sidecars and
+            keep the cached columns in memory instead
+            (in which case each load returns a copy of the columns).
         """
 
         Dataset.USE_CACHE = enable
+        Dataset.USE_SIDECAR = sidecar
+        Dataset.CACHE.clear()
+        if maxbytes is not None:
+            Dataset.CACHE.maxbytes = maxbytes
 
     def load(
             self,
@@ -87,6 +121,8 @@ class Dataset:
         columns:
             List of columns to subset the data.
             If omitted, all columns are returned.
+            Only these columns are read from disk
+            (or the cache).
         dtypes:
             Dictionary mapping column names on
             data types.
@@ -99,29 +135,79 @@ class Dataset:
 
         """
         if Dataset.USE_CACHE:
-            if self.source not in Dataset.CACHE:
-                Dataset.CACHE[self.source] = pd.read_csv(self.source, **self.kwargs)
-            df = Dataset.CACHE[self.source].copy()
+            df = self._load_cached(columns)
+            # Cached columns already have the data set data types.
+            dtypes = None if dtypes is self.dtypes else dtypes
         else:
-            df = pd.read_csv(self.source, usecols=columns, **self.kwargs)
-
-        if columns:
-            df = df[columns]
-
-        dtypes = self.dtypes if dtypes is None else dtypes
-        if dtypes:
-            for column in df.columns:
-                if column in dtypes:
-                    try:
-                        df[column] = df[column].astype(dtypes[column])
-                    except TypeError:
-                        df[column] = dtypes[column](df[column])
-        return df
+            df = read_data(self.source, self.format, columns=columns, **self.kwargs)
+            if columns:
+                df = df[columns]
+            dtypes = self.dtypes if dtypes is None else dtypes
+        return _set_dtypes(df, dtypes)
+
+    def _cache_key(self):
+        return (
+            os.path.realpath(self.source),
+            self.format,
+            repr(sorted(self.kwargs.items())),
+            repr(sorted(self.dtypes.items())))
+
+    def _load_cached(self, columns):
+        """Load columns from the cache, filling the cache if necessary."""
+        key = self._cache_key()
+        names = list(columns) if columns else Dataset.CACHE.columns(key)
+        cached = {}
+        if names is not None:
+            for name in names:
+                cached[name] = cached.get(name) or Dataset.CACHE.get((key, name))
+        if names is None or any(column is None for column in cached.values()):
+            loaded = self._load_columns()
+            Dataset.CACHE.set_columns(key, list(loaded))
+            names = list(columns) if columns else list(loaded)
+            for name in names:
+                if cached.get(name) is None:
+                    if name not in loaded:
+                        raise KeyError('Column {} not in dataset'.format(name))
+                    cached[name] = loaded[name]
+                    Dataset.CACHE.put((key, name), loaded[name])
+        return pd.DataFrame(
+            {name: cached[name].array() for name in names}, copy=False)
+
+    def _load_columns(self) -> Dict[str, Column]:
+        """Load all columns from a sidecar, or read them from the source."""
+        sign = signature(self.source, dict(
+            format=self.format, kwargs=self.kwargs, dtypes=self.dtypes))
+        directories = sidecar_directories(self.source) if Dataset.USE_SIDECAR else []
+        for directory in directories:
+            loaded = read_sidecar(directory, sign)
+            if loaded is not None:
+                return loaded
+        df = _set_dtypes(read_data(self.source, self.format, **self.kwargs), self.dtypes)
+        for directory in directories:
+            try:
+                return write_sidecar(directory, df, sign)
+            except OSError:
+                continue
+            except TypeError:
+                break
+        return {name: Column(values=df[name].array.copy()) for name in df.columns}
 
     def __call__(self, **kwargs):
         return self.load(**kwargs)
 
 
+def _set_dtypes(df, dtypes):
+    """Convert the data types of data frame columns."""
+    if dtypes:
+        for column in df.columns:
+            if column in dtypes:
+                try:
+                    df[column] = df[column].astype(dtypes[column])
+                except TypeError:
+                    df[column] = dtypes[column](df[column])
+    return df
+
+
 def hm2005(
         columns: List[str] = None,
         **kwargs) -> pd.DataFrame:
@@ -0,0 +1,300 @@
+"""
+    Dataset cache
+    ~~~~~~~~~~~~~
+
+    When caching is enabled (see :meth:`.Dataset.enable_cache`)
+    the columns of a dataset are converted to their
+    data types once and saved in a *sidecar* directory
+    containing a NumPy ``.npy`` file for each column.
+    The sidecar is written next to the dataset source
+    (or, if that directory is not writable, under :func:`cache_dir`)
+    and is rebuilt whenever the source or the way it is read changes.
+
+    Each time a dataset is loaded its columns are memory-mapped
+    from the sidecar in copy-on-write mode,
+    so loading a dataset takes (almost) no time or memory
+    whatever its size, and modifying the loaded data
+    does not change the sidecar or other loaded copies of the data.
+    Columns are kept in a :class:`DatasetCache`, which
+    is bounded by the number of bytes in the cached columns.
+"""
+
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Version of the sidecar layout.
+SIDECAR_VERSION = 1
+
+# Default maximum size of the dataset cache in bytes.
+DEFAULT_MAXBYTES = 2 ** 30
+
+
+def cache_dir() -> str:
+    """The directory in which |vlnm| caches files.
+
+    This is the ``VLNM_CACHE_DIR`` environment variable if set,
+    otherwise a ``vlnm`` directory in the user cache directory
+    (``XDG_CACHE_HOME`` or ``~/.cache``).
+    """
+    directory = os.environ.get('VLNM_CACHE_DIR')
+    if directory:
+        return directory
+    root = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache')
+    return os.path.join(root, 'vlnm')
+
+
+class Column:
+    """A cached dataset column.
+
+    Parameters
+    ----------
+    values:
+        The column values if the column is held in memory.
+    path:
+        The path to the ``.npy`` file holding the column values
+        (or the category codes of a categorical column),
+        if the column is memory-mapped from a sidecar.
+    kind:
+        ``'values'`` for a column of NumPy values,
+        ``'category'`` for a categorical column, or
+        ``'object'`` for a column of Python objects
+        (stored as category codes).
+    dtype, shape, offset:
+        The layout of the array in the ``.npy`` file.
+    categories:
+        The categories of a categorical or object column.
+    """
+
+    def __init__(
+            self,
+            values=None,
+            path: str = None,
+            kind: str = 'values',
+            dtype: np.dtype = None,
+            shape: Tuple[int] = None,
+            offset: int = 0,
+            categories: pd.CategoricalDtype = None):
+        self.values = values
+        self.path = path
+        self.kind = kind
+        self.dtype = dtype
+        self.shape = shape
+        self.offset = offset
+        self.categories = categories
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes in the column."""
+        if self.path is None:
+            return int(self.values.nbytes)
+        return int(np.prod(self.shape)) * self.dtype.itemsize
+
+    def array(self):
+        """Return the column values.
+
+        Memory-mapped columns are mapped copy-on-write,
+        so the values can be modified without affecting the sidecar.
+        Columns held in memory are copied.
+        """
+        if self.path is None:
+            return self.values.copy()
+        if self.shape[0]:
+            array = np.memmap(
+                self.path, dtype=self.dtype, mode='c',
+                offset=self.offset, shape=self.shape)
+        else:
+            array = np.empty(self.shape, dtype=self.dtype)
+        if self.kind == 'values':
+            return array
+        categorical = pd.Categorical.from_codes(array, dtype=self.categories)
+        if self.kind == 'object':
+            return np.asarray(categorical, dtype=object)
+        return categorical
+
+
+class DatasetCache:
+    """A cache of dataset columns.
+
+    The least recently used columns are discarded
+    when the total size of the cached columns exceeds ``maxbytes``.
+    Memory-mapped columns count towards the total
+    as their pages are held in memory once read.
+
+    Parameters
+    ----------
+    maxbytes:
+        The maximum number of bytes in the cached columns.
+    """
+
+    def __init__(self, maxbytes: int = DEFAULT_MAXBYTES):
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._columns = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Column]:
+        """Return a cached column, or ``None`` if the column is not cached."""
+        with self._lock:
+            column = self._entries.get(key)
+            if column is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return column
+
+    def put(self, key: Hashable, column: Column):
+        """Add a column to the cache."""
+        if column.nbytes > self.maxbytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous.nbytes
+            self._entries[key] = column
+            self.nbytes += column.nbytes
+            while self.nbytes > self.maxbytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+
+    def columns(self, key: Hashable) -> Optional[List[str]]:
+        """The names of the columns of a dataset, if known."""
+        return self._columns.get(key)
+
+    def set_columns(self, key: Hashable, names: List[str]):
+        """Record the names of the columns of a dataset."""
+        self._columns[key] = list(names)
+
+    def clear(self):
+        """Discard all cached columns and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._columns.clear()
+            self.nbytes = self.hits = self.misses = 0
+
+
+def sidecar_directories(source: str) -> List[str]:
+    """Candidate sidecar directories for a dataset source, in order of preference."""
+    path = os.path.realpath(source)
+    head, tail = os.path.split(path)
+    digest = hashlib.blake2b(path.encode('utf-8'), digest_size=8).hexdigest()
+    return [
+        os.path.join(head, '.{}.vlnm'.format(tail)),
+        os.path.join(cache_dir(), 'datasets', '{}-{}'.format(tail, digest))]
+
+
+def signature(source: str, options: Dict) -> Dict:
+    """Identify the contents of a sidecar.
+
+    The signature depends on the size and modification time of
+    the source and on the options used to read it.
+    """
+    stat = os.stat(source)
+    return dict(
+        version=SIDECAR_VERSION,
+        size=stat.st_size,
+        mtime=stat.st_mtime_ns,
+        options=repr(sorted(options.items())))
+
+
+def _encode(series: pd.Series) -> Tuple[str, np.ndarray, Dict]:
+    """The sidecar array for a column and its metadata."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categorical = series.array
+        kind = 'category'
+    elif series.dtype == object:
+        categorical = pd.Categorical(series)
+        kind = 'object'
+    elif isinstance(series.dtype, np.dtype):
+        return 'values', series.values, {}
+    else:
+        raise TypeError('Cannot cache column of type {}'.format(series.dtype))
+    categories = categorical.categories
+    return kind, np.asarray(categorical.codes), dict(
+        categories=categories.tolist(),
+        categories_dtype=str(categories.dtype),
+        ordered=bool(categorical.ordered))
+
+
+def write_sidecar(directory: str, df: pd.DataFrame, sign: Dict) -> Dict[str, Column]:
+    """Write the columns of a data frame to a sidecar.
+
+    Raises :class:`OSError` if the sidecar cannot be written
+    and :class:`TypeError` if a column cannot be stored in a sidecar.
+    """
+    encoded = [_encode(df[name]) for name in df.columns]
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix='.tmp', dir=parent)
+    try:
+        meta = dict(signature=sign, columns=[])
+        for i, (name, (kind, array, extra)) in enumerate(zip(df.columns, encoded)):
+            np.save(os.path.join(tmp_dir, '{}.npy'.format(i)), array, allow_pickle=False)
+            meta['columns'].append(dict(name=name, kind=kind, **extra))
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w') as file_out:
+            json.dump(meta, file_out)
+        shutil.rmtree(directory, ignore_errors=True)
+        os.rename(tmp_dir, directory)
+    except (OSError, TypeError, ValueError):
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        # Another process may have written the sidecar first.
+        columns = read_sidecar(directory, sign)
+        if columns is None:
+            raise
+        return columns
+    return read_sidecar(directory, sign)
+
+
+def read_sidecar(directory: str, sign: Dict) -> Optional[Dict[str, Column]]:
+    """Read the columns in a sidecar.
+
+    Returns ``None`` if there is no sidecar or its signature does not match.
+    """
+    try:
+        with open(os.path.join(directory, 'meta.json')) as file_in:
+            meta = json.load(file_in)
+    except (OSError, ValueError):
+        return None
+    if meta.get('signature') != sign:
+        return None
+    columns = OrderedDict()
+    for i, entry in enumerate(meta['columns']):
+        path = os.path.join(directory, '{}.npy'.format(i))
+        try:
+            with open(path, 'rb') as file_in:
+                version = np.lib.format.read_magic(file_in)
+                if version == (1, 0):
+                    header = np.lib.format.read_array_header_1_0(file_in)
+                else:
+                    header = np.lib.format.read_array_header_2_0(file_in)
+                offset = file_in.tell()
+        except (OSError, ValueError):
+            return None
+        shape, fortran_order, dtype = header
+        if fortran_order and len(shape) > 1:
+            return None
+        categories = None
+        if entry['kind'] != 'values':
+            categories = pd.CategoricalDtype(
+                pd.Index(entry['categories'], dtype=entry['categories_dtype']),
+                ordered=entry['ordered'])
+        columns[entry['name']] = Column(
+            path=path, kind=entry['kind'], dtype=dtype, shape=shape,
+            offset=offset, categories=categories)
+    return columns
@@ -106,8 +106,37 @@ REPLACEMENTS = {
             description=r"""
             One or more columns over which to group
             the data before normalization.
+            Rows with a missing group label are kept,
+            with missing normalized values.
             See :ref:`grouping data <normalization_grouping>`
             for details.
+        """),
+        'n_jobs:': dict(
+            description=r"""
+            Number of processes used to normalize speakers in parallel.
+            Negative values are counted back from the number of CPUs
+            (so ``-1`` uses all CPUs).
+            If omitted, speakers are normalized in a single process.
+        """),
+        'executor:': dict(
+            description=r"""
+            A :class:`concurrent.futures.Executor` used to
+            normalize speakers in parallel,
+            instead of creating a process pool.
+        """),
+        'stats_cache:': dict(
+            description=r"""
+            A :class:`vlnm.stats.StatisticsCache` used to share
+            speaker statistics with other normalizers
+            (or ``True`` to use the default cache).
+            If omitted, statistics are not cached.
+        """),
+        'result_cache:': dict(
+            description=r"""
+            A :class:`vlnm.cache.ResultCache` in which
+            normalized data are cached on disk
+            (or ``True`` to use the default cache).
+            If omitted, results are not cached.
         """)
     },
     'normalize': r"""
@@ -208,36 +237,70 @@ def dedent_docs(docs: str, indent: str = None):
     return _indent, textwrap.dedent(docs)
 
 
+class LazyDocstring:
+    """
+    Class docstring which is expanded the first time it is accessed.
+
+    Python looks up the ``__doc__`` attribute of a class
+    through the descriptor protocol, so the expansion
+    (and the regular expression matching it needs)
+    is deferred until something (e.g., :func:`help` or Sphinx)
+    actually reads the docstring.
+    """
+
+    def __init__(self, obj: Any, doc: str):
+        self.obj = obj
+        self.doc = doc
+        self.expanded = None
+
+    def __get__(self, instance, owner=None):
+        if self.expanded is None:
+            self.expanded = expand_docstring(self.obj, self.doc)
+        return self.expanded
+
+
 def docstring(obj: Any):
     """
     Process the docstring for an object.
+
+    Class docstrings are expanded when they are first
+    accessed (see :class:`LazyDocstring`).
     """
     obj_doc = obj.__doc__
     if obj_doc:
-        docs = []
-        indent, obj_doc = dedent_docs(obj_doc)
-        for section, lines in doc_sections(obj_doc):
-            section_lines = docstring_section(obj, section, lines, indent)
-            if section.lower() == 'parameters':
-                try:
-                    name = obj.name
-                    section_lines = [
-                        'To use this normalizer in the :func:`vlnm.normalize` function, ',
-                        "use ``method='{}'``.".format(name),
-                        '',
-                        ''
-                    ] + section_lines
-                except AttributeError:
-                    pass
-            docs.extend(section_lines)
-
-        obj.__doc__ = textwrap.indent('\n'.join(docs), indent)
+        if isinstance(obj, type):
+            obj.__doc__ = LazyDocstring(obj, obj_doc)
+        else:
+            obj.__doc__ = expand_docstring(obj, obj_doc)
     else:
         if obj.__name__ in REPLACEMENTS:
             obj.__doc__ = REPLACEMENTS[obj.__name__]
     return obj
 
 
+def expand_docstring(obj: Any, obj_doc: str) -> str:
+    """
+    Expand the docstring for an object.
+    """
+    docs = []
+    indent, obj_doc = dedent_docs(obj_doc)
+    for section, lines in doc_sections(obj_doc):
+        section_lines = docstring_section(obj, section, lines, indent)
+        if section.lower() == 'parameters':
+            try:
+                name = obj.name
+                section_lines = [
+                    'To use this normalizer in the :func:`vlnm.normalize` function, ',
+                    "use ``method='{}'``.".format(name),
+                    '',
+                    ''
+                ] + section_lines
+            except AttributeError:
+                pass
+        docs.extend(section_lines)
+    return textwrap.indent('\n'.join(docs), indent)
+
+
 def docstring_section(obj: Any, section: str, lines: List[str], indent: str):
     """
     Process a docstring section.
@@ -0,0 +1,325 @@
+"""
+Evaluation
+~~~~~~~~~~
+
+The :mod:`vlnm.evaluation` module compares normalizers
+by normalizing a corpus with each of a grid of normalizers
+(and their parameters) and calculating a set of
+quality metrics (see :mod:`vlnm.metrics`) for each result.
+
+Normalizations can be run in parallel (using the ``n_jobs``
+or ``executor`` parameters of :func:`evaluate`),
+and results can be kept in an :class:`EvaluationCache`,
+keyed by the normalizer configuration and a
+:func:`~vlnm.stats.fingerprint` of the data,
+so that evaluating a grid again only calculates
+the results which are not already in the cache.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import inspect
+import itertools
+import json
+import os
+import threading
+from typing import Callable, Dict, Hashable, Iterable, List, Tuple, Union
+
+import pandas as pd
+
+from .cache import canonical
+from .metrics import classification_accuracy, scv, variance_ratio
+from .registration import get_normalizer
+from .stats import fingerprint
+
+#: Metrics calculated by default.
+METRICS = OrderedDict([
+    ('scv', scv),
+    ('variance_ratio', variance_ratio),
+    ('accuracy', classification_accuracy),
+])
+
+
+def normalizer_key(normalizer) -> str:
+    """A key identifying the configuration of a normalizer instance.
+
+    The key depends on the class of the normalizer,
+    its class configuration and its constructor options,
+    but not on the name used to get the normalizer.
+    Raises :class:`TypeError` if the options cannot be serialized
+    (see :func:`vlnm.cache.canonical`).
+    """
+    cls = type(normalizer)
+    return canonical([
+        '{}.{}'.format(cls.__module__, cls.__qualname__),
+        normalizer.config,
+        normalizer.default_options])
+
+
+def normalizer_grid(
+        normalizers: Union[str, Iterable, Dict]) -> List[Tuple[str, Dict]]:
+    """Expand a grid of normalizers and their parameters.
+
+    Parameters
+    ----------
+    normalizers:
+        A normalizer name, a list of normalizer names
+        or ``(name, parameters)`` tuples,
+        or a dictionary mapping normalizer names to parameters.
+        Parameters are given as a dictionary, in which a list of values
+        gives a parameter to vary (all combinations of
+        the values of each parameter are included),
+        or as a list of such dictionaries.
+
+    Returns
+    -------
+    :
+        A list of ``(name, parameters)`` tuples.
+
+    Examples
+    --------
+
+    .. ipython::
+
+        from vlnm.evaluation import normalizer_grid
+
+        normalizer_grid({
+            'lobanov': {},
+            'convex-hull': {'where': ['mean', 'median']}})
+
+    """
+    if isinstance(normalizers, str):
+        normalizers = [normalizers]
+    if isinstance(normalizers, dict):
+        normalizers = list(normalizers.items())
+    grid = []
+    for entry in normalizers:
+        name, params = (entry, {}) if isinstance(entry, str) else entry
+        for option in params if isinstance(params, list) else [params or {}]:
+            keys = list(option)
+            values = [
+                option[key] if isinstance(option[key], list) else [option[key]]
+                for key in keys]
+            for combination in itertools.product(*values):
+                grid.append((name, dict(zip(keys, combination))))
+    return grid
+
+
+class EvaluationCache:
+    """A cache of evaluation results.
+
+    Results are keyed by the normalizer configuration
+    (see :func:`normalizer_key`), a fingerprint of the data,
+    and the metric and its arguments.
+    Normalizers whose options cannot be serialized
+    (e.g., lambdas) are not cached.
+
+    Parameters
+    ----------
+    path:
+        If given, a JSON file from which cached results are loaded
+        (if it exists) and to which they are saved by :meth:`save`.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path) as file_in:
+                self._entries = dict(json.load(file_in))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable):
+        return key in self._entries
+
+    def get(self, key: str):
+        """Return a cached result, or ``None`` if the result is not cached."""
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: float):
+        """Add a result to the cache."""
+        with self._lock:
+            self._entries[key] = value
+
+    def save(self, path: str = None):
+        """Save the cached results to a JSON file.
+
+        Parameters
+        ----------
+        path:
+            The file. If omitted, the path given to the constructor.
+        """
+        path = path or self.path
+        with self._lock:
+            entries = sorted(self._entries.items())
+        tmp_path = '{}.tmp{}'.format(path, os.getpid())
+        with open(tmp_path, 'w') as file_out:
+            json.dump(entries, file_out)
+        os.replace(tmp_path, path)
+
+    def clear(self):
+        """Discard all cached results and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+def _metric_kwargs(metric: Callable, kwargs: Dict) -> Dict:
+    """The keyword arguments accepted by a metric."""
+    parameters = inspect.signature(metric).parameters
+    return {key: value for key, value in kwargs.items() if key in parameters}
+
+
+def _evaluate_normalizer(normalizer, df, metrics, kwargs):
+    """Normalize the data and calculate the metrics."""
+    norm_df = normalizer.normalize(df)
+    return {
+        name: metric(norm_df, **_metric_kwargs(metric, kwargs))
+        for name, metric in metrics.items()}
+
+
+def _get_n_jobs(n_jobs):
+    n_jobs = n_jobs or 1
+    if n_jobs < 0:
+        n_jobs = max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return n_jobs
+
+
+def evaluate(
+        df: pd.DataFrame,
+        normalizers: Union[str, Iterable, Dict],
+        metrics: Union[List[str], Dict[str, Callable]] = None,
+        vowel: str = 'vowel',
+        speaker: str = 'speaker',
+        formants: tuple = ('f1', 'f2'),
+        n_jobs: int = None,
+        executor=None,
+        cache: EvaluationCache = None) -> pd.DataFrame:
+    """Evaluate a grid of normalizers.
+
+    Parameters
+    ----------
+    df:
+        The formant data.
+    normalizers:
+        The normalizers and their parameters (see :func:`normalizer_grid`).
+    metrics:
+        The names of metrics in :data:`METRICS`,
+        or a dictionary mapping names to metric functions,
+        which are called with the normalized data and
+        whichever of the ``vowel``, ``speaker`` and ``formants``
+        keyword arguments they accept.
+        If omitted, all the metrics in :data:`METRICS`.
+    vowel:
+        Data-frame column which contains the vowel labels.
+    speaker:
+        Data-frame column which contains the speaker labels.
+    formants:
+        The (normalized) formant columns used by the metrics.
+    n_jobs:
+        The number of processes used to run the normalizations.
+        Negative values are counted back from the number of CPUs
+        (so ``-1`` uses all CPUs).
+    executor:
+        A :class:`concurrent.futures.Executor`
+        used to run the normalizations.
+    cache:
+        If given, results are looked up in and added to the cache.
+
+    Returns
+    -------
+    :
+        A data frame with one row for each normalizer and metric,
+        and columns ``normalizer`` (the normalizer name),
+        ``params`` (the normalizer parameters as JSON),
+        ``metric`` and ``value``.
+
+    Examples
+    --------
+
+    .. ipython::
+
+        from vlnm import pb1952
+        from vlnm.evaluation import evaluate
+
+        df = pb1952(['speaker', 'vowel', 'f0', 'f1', 'f2', 'f3'])
+        evaluate(df, ['lobanov', 'neary', 'bark'])
+
+    """
+    if metrics is None:
+        metrics = METRICS
+    elif not isinstance(metrics, dict):
+        metrics = OrderedDict((name, METRICS[name]) for name in metrics)
+    kwargs = dict(vowel=vowel, speaker=speaker, formants=list(formants))
+    data_key = fingerprint(df)
+
+    cells = []
+    pending = []
+    for name, params in normalizer_grid(normalizers):
+        normalizer = get_normalizer(name)(**params)
+        try:
+            keys = {
+                metric_name: canonical([
+                    normalizer_key(normalizer), data_key, metric_name,
+                    _metric_kwargs(metric, kwargs)])
+                for metric_name, metric in metrics.items()}
+        except TypeError:
+            keys = dict.fromkeys(metrics)
+        values = {}
+        for metric_name, key in keys.items():
+            value = cache.get(key) if cache is not None and key is not None else None
+            if value is not None:
+                values[metric_name] = value
+        missing = OrderedDict(
+            (metric_name, metric) for metric_name, metric in metrics.items()
+            if metric_name not in values)
+        if missing:
+            pending.append((normalizer, missing, keys, values))
+        cells.append((name, params, values))
+
+    n_jobs = _get_n_jobs(n_jobs)
+    if executor is None and n_jobs > 1 and len(pending) > 1:
+        executor = own_executor = ProcessPoolExecutor(
+            max_workers=min(n_jobs, len(pending)))
+    else:
+        own_executor = None
+    try:
+        if executor is not None:
+            results = list(executor.map(
+                _evaluate_normalizer,
+                [normalizer for normalizer, *_ in pending],
+                [df] * len(pending),
+                [missing for _, missing, *_ in pending],
+                [kwargs] * len(pending)))
+        else:
+            results = [
+                _evaluate_normalizer(normalizer, df, missing, kwargs)
+                for normalizer, missing, *_ in pending]
+    finally:
+        if own_executor is not None:
+            own_executor.shutdown()
+
+    for (_, _, keys, values), result in zip(pending, results):
+        for metric_name, value in result.items():
+            value = float(value)
+            values[metric_name] = value
+            if cache is not None and keys[metric_name] is not None:
+                cache.put(keys[metric_name], value)
+
+    return pd.DataFrame(
+        [
+            (name, json.dumps(params, sort_keys=True, default=repr),
+             metric_name, values[metric_name])
+            for name, params, values in cells
+            for metric_name in metrics],
+        columns=['normalizer', 'params', 'metric', 'value'])
@@ -0,0 +1,332 @@
+"""
+File formats
+~~~~~~~~~~~~
+
+This module contains functions for reading and writing
+formant data in a number of file formats.
+As well as CSV files, data can be read from and written to
+the binary columnar formats
+`Apache Parquet <https://parquet.apache.org>`_
+and `Feather <https://arrow.apache.org/docs/python/feather.html>`_
+(i.e., Apache Arrow IPC files),
+which are much faster to read than CSV files
+and preserve the data types of the columns
+(including categorical columns).
+Reading and writing the binary formats requires
+`PyArrow <https://arrow.apache.org/docs/python>`_ to be installed.
+
+The format of a file is detected from its extension
+(see :data:`EXTENSIONS`),
+or can be given explicitly using the ``format`` parameter
+of each function.
+A file without a recognised extension is assumed to be a CSV file.
+When reading the binary formats,
+only the requested columns are read from the file.
+"""
+
+import io
+import os
+from typing import Iterable, Iterator, List, Union
+
+import pandas as pd
+
+FORMATS = ['csv', 'parquet', 'feather']
+
+#: File extensions and their formats.
+EXTENSIONS = {
+    '.csv': 'csv',
+    '.tsv': 'csv',
+    '.txt': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+    '.ipc': 'feather',
+}
+
+# Aliases for format names.
+ALIASES = {
+    'arrow': 'feather',
+    'ipc': 'feather',
+    'pq': 'parquet',
+}
+
+File = Union[str, os.PathLike, io.IOBase]
+
+
+def _pyarrow():
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel
+        import pyarrow.ipc  # pylint: disable=import-outside-toplevel
+        import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+    except ImportError as error:  # pragma: no cover
+        raise ImportError(
+            'Reading and writing Parquet or Feather files '
+            'requires PyArrow to be installed') from error
+    return pyarrow
+
+
+def get_format(
+        file: File = None,
+        format: str = None,  # pylint: disable=redefined-builtin
+        default: str = None) -> str:
+    """Get the format of a file.
+
+    Parameters
+    ----------
+    file:
+        A file path or file handle.
+    format:
+        If given, the format of the file
+        (one of :data:`FORMATS` or an alias such as ``'arrow'``).
+        Otherwise the format is detected from the file extension.
+    default:
+        The format returned if the format cannot be detected
+        (e.g., for a file handle without a name).
+        If omitted, ``'csv'``.
+
+    Returns
+    -------
+    :
+        The name of the format.
+    """
+    if format:
+        format = ALIASES.get(format.lower(), format.lower())
+        if format not in FORMATS:
+            raise ValueError('Unknown format: {}'.format(format))
+        return format
+    name = file if isinstance(file, (str, os.PathLike)) else getattr(file, 'name', None)
+    if isinstance(name, (str, os.PathLike)):
+        _, ext = os.path.splitext(os.fspath(name))
+        if ext.lower() in EXTENSIONS:
+            return EXTENSIONS[ext.lower()]
+    return default or 'csv'
+
+
+def _rewind(file):
+    if hasattr(file, 'seek'):
+        file.seek(0)
+
+
+def read_columns(
+        file: File,
+        format: str = None,  # pylint: disable=redefined-builtin
+        sep: str = ',') -> List[str]:
+    """Read the column names of a file without reading the data.
+
+    Parameters
+    ----------
+    file:
+        A file path or file handle.
+    format:
+        The format of the file.
+        If omitted, the format is detected from the file extension.
+    sep:
+        The column separator in a CSV file.
+
+    Returns
+    -------
+    :
+        A list of the column names.
+    """
+    format = get_format(file, format)
+    _rewind(file)
+    if format == 'csv':
+        columns = list(pd.read_csv(file, sep=sep, header=0, nrows=0).columns)
+    else:
+        pyarrow = _pyarrow()
+        if format == 'parquet':
+            schema = pyarrow.parquet.read_schema(file)
+        else:
+            schema = pyarrow.ipc.open_file(file).schema
+        columns = [
+            name for name in schema.names
+            if not name.startswith('__index_level_')]
+    _rewind(file)
+    return columns
+
+
+def read_data(
+        file: File,
+        format: str = None,  # pylint: disable=redefined-builtin
+        columns: List[str] = None,
+        sep: str = ',',
+        **kwargs) -> pd.DataFrame:
+    r"""Read data from a file.
+
+    Parameters
+    ----------
+    file:
+        A file path or file handle.
+    format:
+        The format of the file.
+        If omitted, the format is detected from the file extension.
+    columns:
+        If given, only read these columns.
+    sep:
+        The column separator in a CSV file.
+    \*\*kwargs:
+        Passed on to :func:`pandas.read_csv`, :func:`pandas.read_parquet`
+        or :func:`pandas.read_feather`.
+
+    Returns
+    -------
+    :
+        A :class:`pandas.DataFrame` containing the data.
+    """
+    format = get_format(file, format)
+    columns = list(columns) if columns is not None else None
+    if format == 'csv':
+        return pd.read_csv(file, sep=sep, header=0, usecols=columns, **kwargs)
+    _pyarrow()
+    if format == 'parquet':
+        return pd.read_parquet(file, columns=columns, **kwargs)
+    return pd.read_feather(file, columns=columns, **kwargs)
+
+
+def read_chunks(
+        file: File,
+        chunksize: int,
+        format: str = None,  # pylint: disable=redefined-builtin
+        columns: List[str] = None,
+        sep: str = ',') -> Iterator[pd.DataFrame]:
+    """Read data from a file in chunks.
+
+    Parameters
+    ----------
+    file:
+        A file path or file handle.
+    chunksize:
+        The (maximum) number of rows in each chunk.
+    format:
+        The format of the file.
+        If omitted, the format is detected from the file extension.
+    columns:
+        If given, only read these columns.
+    sep:
+        The column separator in a CSV file.
+
+    Returns
+    -------
+    :
+        An iterator over :class:`pandas.DataFrame` chunks of the data.
+        Each chunk has a default index which continues
+        from the index of the previous chunk.
+    """
+    format = get_format(file, format)
+    columns = list(columns) if columns is not None else None
+    _rewind(file)
+    if format == 'csv':
+        yield from pd.read_csv(
+            file, sep=sep, header=0, usecols=columns, chunksize=chunksize)
+        return
+    pyarrow = _pyarrow()
+    if format == 'parquet':
+        batches = pyarrow.parquet.ParquetFile(file).iter_batches(
+            batch_size=chunksize, columns=columns)
+    else:
+        batches = _feather_batches(pyarrow, file, chunksize, columns)
+    start = 0
+    for batch in batches:
+        df = batch.to_pandas()
+        df.index = pd.RangeIndex(start, start + len(df))
+        start += len(df)
+        yield df
+
+
+def _feather_batches(pyarrow, file, chunksize, columns):
+    """Read the record batches of a Feather file in chunks.
+
+    The record batches are read in turn (rather than reading the whole file)
+    and sliced or combined into chunks of ``chunksize`` rows.
+    """
+    reader = pyarrow.ipc.open_file(file)
+    pending, n_pending = [], 0
+    for i in range(reader.num_record_batches):
+        batch = reader.get_batch(i)
+        if columns is not None:
+            batch = batch.select(columns)
+        pending.append(batch)
+        n_pending += batch.num_rows
+        while n_pending >= chunksize:
+            table = pyarrow.Table.from_batches(pending)
+            yield table.slice(0, chunksize)
+            rest = table.slice(chunksize)
+            pending, n_pending = rest.to_batches(), rest.num_rows
+    if n_pending:
+        yield pyarrow.Table.from_batches(pending)
+
+
+def write_data(
+        df: pd.DataFrame,
+        file: File,
+        format: str = None,  # pylint: disable=redefined-builtin
+        sep: str = ','):
+    """Write data to a file.
+
+    The index of the data frame is not written.
+
+    Parameters
+    ----------
+    df:
+        The data to write.
+    file:
+        A file path or file handle.
+    format:
+        The format of the file.
+        If omitted, the format is detected from the file extension.
+    sep:
+        The column separator in a CSV file.
+    """
+    write_chunks([df], file, format=format, sep=sep)
+
+
+def write_chunks(
+        chunks: Iterable[pd.DataFrame],
+        file: File,
+        format: str = None,  # pylint: disable=redefined-builtin
+        sep: str = ','):
+    """Write chunks of data to a single file.
+
+    Each chunk is written as soon as it is available,
+    so the chunks never need to be in memory at the same time.
+    The columns (and data types) of each chunk should be the
+    same as the first chunk.
+
+    Parameters
+    ----------
+    chunks:
+        An iterable of :class:`pandas.DataFrame` chunks.
+    file:
+        A file path or file handle.
+    format:
+        The format of the file.
+        If omitted, the format is detected from the file extension.
+    sep:
+        The column separator in a CSV file.
+    """
+    format = get_format(file, format)
+    if format == 'csv':
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(
+                file, sep=sep, header=i == 0, index=False,
+                mode='a' if i else 'w')
+        return
+
+    pyarrow = _pyarrow()
+    writer = None
+    schema = None
+    try:
+        for chunk in chunks:
+            table = pyarrow.Table.from_pandas(
+                chunk, schema=schema, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                if format == 'parquet':
+                    writer = pyarrow.parquet.ParquetWriter(file, schema)
+                else:
+                    writer = pyarrow.ipc.new_file(file, schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
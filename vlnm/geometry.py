@@ -0,0 +1,267 @@
+"""
+Geometry
+~~~~~~~~
+
+The :mod:`vlnm.geometry` module calculates the convex hulls
+of many sets of points at once
+(for example, the vowel means of each speaker in a corpus).
+The sets of points are held in a single array,
+padded with ``NaN`` where a set has fewer points than others,
+and two-dimensional hulls (and their areas) are calculated for all sets together
+using a vectorized version of
+Andrew's monotone chain algorithm :citep:`andrew_1979`,
+so there is no per-set overhead.
+Hulls in more than two dimensions are calculated
+for each set in turn using :class:`scipy.spatial.ConvexHull`.
+"""
+
+import numpy as np
+
+
+class ConvexHulls:
+    r"""Convex hulls of sets of points.
+
+    Points with any missing coordinates are ignored.
+    A hull with fewer than :math:`d + 1` vertices
+    (e.g., for fewer than three distinct points,
+    or collinear points, in two dimensions)
+    is degenerate: its centroid is ``NaN`` and its area is zero.
+
+    Parameters
+    ----------
+    points:
+        Array with one row for each set of points,
+        one column for each point and one layer for each dimension.
+        A two-dimensional array is treated as a single set of points.
+
+    Examples
+    --------
+
+    .. ipython::
+
+        import numpy as np
+        from vlnm.geometry import ConvexHulls
+
+        points = np.array([
+            [[0., 0.], [1., 0.], [1., 1.], [0., 1.], [.5, .5]],
+            [[0., 0.], [2., 0.], [0., 2.], [np.nan, np.nan], [np.nan, np.nan]]])
+        hulls = ConvexHulls(points)
+        hulls.vertices, hulls.areas(), hulls.centroids()
+
+    Attributes
+    ----------
+    vertices:
+        Array with one row for each set of points containing the
+        indices of the points on its hull (counter-clockwise in two dimensions),
+        padded with ``-1``.
+    n_vertices:
+        The number of vertices of each hull.
+    """
+
+    def __init__(self, points: np.ndarray):
+        points = np.asarray(points, dtype=float)
+        if points.ndim == 2:
+            points = points[np.newaxis]
+        if points.ndim != 3 or points.shape[2] < 2:
+            raise ValueError(
+                'Points must have at least two dimensions')
+        self.points = points
+        if points.shape[2] == 2:
+            self.vertices, self.n_vertices = _monotone_chain(points)
+        else:
+            self.vertices, self.n_vertices = _qhull(points)
+        self._cache = {}
+
+    @property
+    def n_dims(self) -> int:
+        """The number of dimensions of the points."""
+        return self.points.shape[2]
+
+    def _degenerate(self):
+        return self.n_vertices <= self.n_dims
+
+    def vertex_points(self) -> np.ndarray:
+        """The coordinates of the vertices of each hull.
+
+        Returns
+        -------
+        :
+            Array with one row for each hull,
+            one column for each vertex and one layer for each dimension,
+            padded with ``NaN``.
+        """
+        if 'vertex_points' not in self._cache:
+            points = self.points
+            if not points.shape[1]:
+                # Sets without points have a single padding vertex.
+                points = np.full((len(points), 1, self.n_dims), np.nan)
+            vertices = np.where(self.vertices >= 0, self.vertices, 0)
+            points = np.take_along_axis(points, vertices[..., np.newaxis], axis=1)
+            points[self.vertices < 0] = np.nan
+            self._cache['vertex_points'] = points
+        return self._cache['vertex_points']
+
+    def centroids(self) -> np.ndarray:
+        """The centroid (mean) of the vertices of each hull.
+
+        Returns
+        -------
+        :
+            Array with one row for each hull
+            and one column for each dimension.
+        """
+        if 'centroids' not in self._cache:
+            points = self.vertex_points()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                centroids = np.nansum(points, axis=1) / self.n_vertices[:, np.newaxis]
+            centroids[self._degenerate()] = np.nan
+            self._cache['centroids'] = centroids
+        return self._cache['centroids']
+
+    def areas(self) -> np.ndarray:
+        """The area (or volume, in more than two dimensions) of each hull.
+
+        Two-dimensional areas are calculated using the shoelace formula.
+
+        Returns
+        -------
+        :
+            Array with one entry for each hull.
+        """
+        if 'areas' not in self._cache:
+            if self.n_dims == 2:
+                areas = _shoelace(self.vertex_points(), self.n_vertices)
+            else:
+                areas = _qhull_volumes(self.points)
+            areas[self._degenerate()] = 0.
+            self._cache['areas'] = areas
+        return self._cache['areas']
+
+
+def polygon_areas(points: np.ndarray) -> np.ndarray:
+    """Calculate the areas of two-dimensional polygons.
+
+    The areas are calculated using the shoelace formula
+    for all polygons at once.
+
+    Parameters
+    ----------
+    points:
+        Array with one row for each polygon,
+        one column for each vertex (in order around the polygon)
+        and one layer for each dimension.
+        Vertices with any missing coordinates are skipped.
+        A two-dimensional array is treated as a single polygon.
+
+    Returns
+    -------
+    :
+        Array with one entry for each polygon.
+    """
+    points = np.asarray(points, dtype=float)
+    if points.ndim == 2:
+        points = points[np.newaxis]
+    valid = ~np.isnan(points).any(axis=2)
+    order = np.argsort(~valid, axis=1, kind='stable')
+    points = np.take_along_axis(points, order[..., np.newaxis], axis=1)
+    return _shoelace(points, valid.sum(axis=1))
+
+
+def _monotone_chain(points):
+    """Two-dimensional hulls of each set of points.
+
+    The points of each set are sorted by their coordinates and the
+    lower and upper hulls built by adding the points in turn,
+    removing previous points which do not make a left turn.
+    Each step is done for all sets at once.
+    """
+    n_sets, n_points, _ = points.shape
+    valid = ~np.isnan(points).any(axis=2)
+    n_valid = valid.sum(axis=1)
+    x = np.where(valid, points[..., 0], np.inf)
+    y = np.where(valid, points[..., 1], np.inf)
+    order = np.lexsort((y, x), axis=1)
+    ordered = np.take_along_axis(points, order[..., np.newaxis], axis=1)
+    rows = np.arange(n_sets)
+
+    def _chain(steps):
+        stack = np.zeros((n_sets, max(n_points, 1)), dtype=np.intp)
+        size = np.zeros(n_sets, dtype=np.intp)
+        for k in steps:
+            active = k < n_valid
+            point = ordered[:, k]
+            while True:
+                first = ordered[rows, stack[rows, np.maximum(size - 2, 0)]]
+                second = ordered[rows, stack[rows, np.maximum(size - 1, 0)]]
+                cross = (
+                    (second[:, 0] - first[:, 0]) * (point[:, 1] - first[:, 1]) -
+                    (second[:, 1] - first[:, 1]) * (point[:, 0] - first[:, 0]))
+                pop = active & (size >= 2) & ~(cross > 0)
+                if not pop.any():
+                    break
+                size -= pop
+            stack[rows[active], size[active]] = k
+            size += active
+        return stack, size
+
+    lower, n_lower = _chain(range(n_points))
+    upper, n_upper = _chain(range(n_points - 1, -1, -1))
+
+    # The last point of each chain is the first point of the other.
+    n_lower = np.maximum(n_lower - 1, 0)
+    n_vertices = np.where(n_valid == 1, 1, n_lower + np.maximum(n_upper - 1, 0))
+    columns = np.arange(max(2 * n_points, 1))
+    from_upper = columns >= n_lower[:, np.newaxis]
+    index = np.where(from_upper, columns - n_lower[:, np.newaxis], columns)
+    index = np.minimum(index, n_points - 1)
+    vertices = np.where(
+        from_upper,
+        np.take_along_axis(upper, index, axis=1),
+        np.take_along_axis(lower, index, axis=1))
+    vertices = np.take_along_axis(order, vertices, axis=1) if n_points else vertices
+    vertices[columns >= n_vertices[:, np.newaxis]] = -1
+    return vertices[:, :max(int(n_vertices.max(initial=0)), 1)], n_vertices
+
+
+def _shoelace(points, n_vertices):
+    """Areas of polygons with vertices in order, padded with ``NaN``."""
+    columns = np.arange(points.shape[1])
+    following = np.where(
+        columns + 1 < n_vertices[:, np.newaxis], columns + 1, 0)
+    following = np.take_along_axis(points, following[..., np.newaxis], axis=1)
+    cross = points[..., 0] * following[..., 1] - following[..., 0] * points[..., 1]
+    return np.abs(np.nansum(cross, axis=1)) / 2.
+
+
+def _hull(points):
+    """A scipy hull of the points without missing coordinates."""
+    # scipy is only needed here, so defer importing it.
+    from scipy.spatial import ConvexHull, QhullError  # pylint: disable=import-outside-toplevel
+
+    rows = np.flatnonzero(~np.isnan(points).any(axis=1))
+    try:
+        return rows, ConvexHull(points[rows])
+    except (QhullError, ValueError):
+        return rows, None
+
+
+def _qhull(points):
+    """Hulls of each set of points using scipy."""
+    hulls = [_hull(set_points) for set_points in points]
+    n_vertices = np.array(
+        [len(hull.vertices) if hull is not None else 0 for _, hull in hulls],
+        dtype=np.intp)
+    vertices = np.full((len(hulls), max(int(n_vertices.max(initial=0)), 1)), -1, dtype=np.intp)
+    for i, (rows, hull) in enumerate(hulls):
+        if hull is not None:
+            vertices[i, :len(hull.vertices)] = rows[hull.vertices]
+    return vertices, n_vertices
+
+
+def _qhull_volumes(points):
+    """Volumes of the hulls of each set of points using scipy."""
+    volumes = []
+    for set_points in points:
+        _, hull = _hull(set_points)
+        volumes.append(hull.volume if hull is not None else 0.)
+    return np.array(volumes, dtype=float)
@@ -4,12 +4,124 @@ Metrics
 
 The `vlnm.metrics` module provides metrics
 for evaluating normalization methods.
+
+The vowel space areas of all speakers
+(and hence the squared coefficient of variation of the areas)
+are calculated at once from an array of the
+vowel means of each speaker (see :mod:`vlnm.geometry`).
+Only :func:`vowel_space`, which returns a polygon,
+requires `Shapely <https://shapely.readthedocs.io>`_.
 """
 
+from typing import List, Tuple
+
+import numpy as np
 import pandas as pd
-from scipy.spatial import ConvexHull
-import shapely
-from shapely.geometry import Polygon
+
+from .geometry import ConvexHulls, polygon_areas
+from .stats import factorize, GroupStatistics
+
+
+def vowel_means(
+        df: pd.DataFrame,
+        vowel: str = 'vowel',
+        speaker: str = 'speaker',
+        points: List = None,
+        formants: tuple = ('f1', 'f2')) -> Tuple[np.ndarray, pd.Index, pd.Index]:
+    """Calculate the formant means of each vowel for each speaker.
+
+    Parameters
+    ----------
+
+    df:
+        Formant data for all speakers.
+
+    vowel:
+        Data-frame column which contains the vowel labels.
+        Defaults to :code:`'vowel'`.
+
+    speaker:
+        Data-frame column which contains the speaker labels.
+        Defaults to :code:`'speaker'`.
+
+    points:
+        List of vowel labels to use as the points of the vowel space.
+        If not provided, all vowels will be used.
+
+    formants:
+        The formant columns in the dataframe.
+        Defaults to :code:`('f1', 'f2')`.
+
+    Returns
+    -------
+    :
+        A tuple containing an array with one row for each speaker,
+        one column for each vowel and one layer for each formant
+        (with ``NaN`` for vowels a speaker did not produce),
+        the speaker labels and the vowel labels.
+    """
+    speaker_codes, speakers = factorize(df[speaker])
+    if points:
+        df_vowel = df[vowel]
+        vowel_codes, vowels = factorize(df_vowel.where(df_vowel.isin(points)))
+    else:
+        vowel_codes, vowels = factorize(df[vowel])
+    stats = GroupStatistics(speaker_codes, len(speakers), df[list(formants)].values)
+    means = stats.nested(vowel_codes, len(vowels)).mean()
+    return means.reshape(len(speakers), len(vowels), -1), speakers, vowels
+
+
+def vowel_space_areas(
+        df: pd.DataFrame,
+        vowel: str = 'vowel',
+        speaker: str = 'speaker',
+        points: List = None,
+        formants: tuple = ('f1', 'f2'),
+        hull: bool = True) -> pd.Series:
+    """Calculate the vowel space area of each speaker.
+
+    Parameters
+    ----------
+
+    df:
+        Formant data for all speakers.
+
+    vowel:
+        Data-frame column which contains the vowel labels.
+        Defaults to :code:`'vowel'`.
+
+    speaker:
+        Data-frame column which contains the speaker labels.
+        Defaults to :code:`'speaker'`.
+
+    points:
+        List of vowel labels to use as the points of the vowel space.
+        If not provided, all vowels will be used.
+
+    formants:
+        The formant columns in the dataframe.
+        Defaults to :code:`('f1', 'f2')`.
+
+    hull:
+        If :code:`True` (the default) the area is that of the
+        convex hull of the mean formant data for the points.
+        Otherwise, the area is that of the polygon
+        with the points as vertices (in the order of the vowel labels).
+
+    Returns
+    -------
+    :
+        The area of each speaker's vowel space,
+        indexed by the speaker labels.
+
+    """
+    means, speakers, _ = vowel_means(
+        df, vowel=vowel, speaker=speaker, points=points, formants=formants)
+    if hull:
+        areas = ConvexHulls(means).areas()
+    else:
+        areas = polygon_areas(means)
+    return pd.Series(areas, index=speakers, name='area')
 
 
 def vowel_space(
@@ -17,7 +129,7 @@ def vowel_space(
         vowel: str = 'vowel',
         points: dict = None,
         formants: tuple = ('f1', 'f2'),
-        hull: bool = True) -> shapely.geometry.Polygon:
+        hull: bool = True) -> 'shapely.geometry.Polygon':
     """Calculate the vowel space for a speaker.
 
     Parameters
@@ -49,14 +161,18 @@ def vowel_space(
         Vowel space represented as a Polygon.
 
     """
+    # shapely is only needed here, so defer importing it.
+    from shapely.geometry import Polygon  # pylint: disable=import-outside-toplevel
+
     if points:
         df = df[df[vowel].isin(points)]
     subset = [vowel]
     subset.extend(formants)
-    means = df[subset].groupby(vowel).mean().as_matrix()
+    means = df[subset].groupby(vowel).mean().to_numpy()
     if hull:
-        convex_hull = ConvexHull(means)
-        polygon = Polygon([means[vertex] for vertex in convex_hull.vertices])
+        convex_hull = ConvexHulls(means)
+        vertices = convex_hull.vertices[0, :convex_hull.n_vertices[0]]
+        polygon = Polygon(means[vertices])
     else:
         polygon = Polygon(means)
     return polygon
@@ -66,8 +182,8 @@ def scv(
         df: pd.DataFrame,
         vowel: str = 'vowel',
         speaker: str = 'speaker',
-        points: dict = None,
-        formants: tuple = ('f1', 'f2')) -> shapely.geometry.Polygon:
+        points: List = None,
+        formants: tuple = ('f1', 'f2')) -> float:
     """Squared coefficient of variation for vowel spaces.
 
     Parameters
@@ -98,11 +214,157 @@ def scv(
         Square coefficient of variation for the vowel space.
 
     """
-    def _area(group_df):
-        return pd.DataFrame(dict(
-            speaker=group_df[speaker].unique(),
-            area=vowel_space(
-                group_df, vowel=vowel, points=points, formants=formants).area
-        ))
-    areas_df = df.groupby(speaker, as_index=False).apply(_area)
-    return (areas_df.std() / areas_df.mean()) ** 2
+    areas = vowel_space_areas(
+        df, vowel=vowel, speaker=speaker, points=points, formants=formants).values
+    return float((np.std(areas, ddof=1) / np.mean(areas)) ** 2)
+
+
+def _complete(df, columns):
+    """Formant data for the rows without missing values in the columns."""
+    values = df[list(columns)].values.astype(float)
+    valid = ~np.isnan(values).any(axis=1)
+    return values[valid], valid
+
+
+def variance_ratio(
+        df: pd.DataFrame,
+        vowel: str = 'vowel',
+        formants: tuple = ('f1', 'f2')) -> float:
+    r"""Ratio of between-vowel to within-vowel variance.
+
+    The ratio is calculated from the sums of squares
+    pooled over the formants:
+
+    .. math::
+
+        \frac{\sum_i\sum_k n_k (\bar{F}_{ik} - \bar{F}_i)^2 / (K - 1)}
+        {\sum_i\sum_k\sum_{j \in k}(F_{ij} - \bar{F}_{ik})^2 / (N - K)}
+
+    where :math:`\bar{F}_{ik}` is the mean of formant :math:`i`
+    for vowel :math:`k`, :math:`n_k` is the number of tokens
+    of vowel :math:`k`, and there are :math:`N` tokens of :math:`K` vowels.
+    Rows with missing formants are ignored.
+    Higher values indicate that vowels are better separated.
+
+    Parameters
+    ----------
+
+    df:
+        Formant data for all speakers.
+
+    vowel:
+        Data-frame column which contains the vowel labels.
+        Defaults to :code:`'vowel'`.
+
+    formants:
+        The formant columns in the dataframe.
+        Defaults to :code:`('f1', 'f2')`.
+
+    Returns
+    -------
+    :obj:`float`
+        The variance ratio.
+
+    """
+    values, valid = _complete(df, formants)
+    codes, vowels = factorize(df[vowel][valid])
+    stats = GroupStatistics(codes, len(vowels), values)
+    counts = stats.count()[:, 0]
+    present = counts > 0
+    n_tokens, n_vowels = counts.sum(), present.sum()
+    if n_vowels < 2 or n_tokens <= n_vowels:
+        return np.nan
+    means = stats.mean()[present]
+    grand_mean = stats.sum()[present].sum(axis=0) / n_tokens
+    between = (counts[present, np.newaxis] * (means - grand_mean) ** 2).sum()
+    within = stats.squared_deviations()[present].sum()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return float((between / (n_vowels - 1)) / (within / (n_tokens - n_vowels)))
+
+
+def classification_accuracy(
+        df: pd.DataFrame,
+        vowel: str = 'vowel',
+        speaker: str = 'speaker',
+        formants: tuple = ('f1', 'f2'),
+        folds: int = 5,
+        seed: int = 0) -> float:
+    r"""Cross-validated accuracy of vowel classification.
+
+    Vowels are classified using linear discriminant analysis
+    (i.e., Gaussian classes with a pooled covariance matrix),
+    which is fitted and evaluated for all the test tokens of a fold at once.
+    Speakers are randomly assigned to folds, so the vowels of
+    each speaker are classified using a model fitted to the other speakers.
+    Rows with missing formants are ignored.
+
+    Parameters
+    ----------
+
+    df:
+        Formant data for all speakers.
+
+    vowel:
+        Data-frame column which contains the vowel labels.
+        Defaults to :code:`'vowel'`.
+
+    speaker:
+        Data-frame column which contains the speaker labels.
+        Defaults to :code:`'speaker'`.
+        If :code:`None`, rows (rather than speakers)
+        are randomly assigned to folds.
+
+    formants:
+        The formant columns in the dataframe.
+        Defaults to :code:`('f1', 'f2')`.
+
+    folds:
+        The number of cross-validation folds.
+        Defaults to :code:`5`.
+
+    seed:
+        Seed for the random assignment to folds.
+
+    Returns
+    -------
+    :obj:`float`
+        The proportion of tokens correctly classified.
+
+    """
+    values, valid = _complete(df, formants)
+    codes, vowels = factorize(df[vowel][valid])
+    if speaker:
+        units, labels = factorize(df[speaker][valid])
+        n_units = len(labels)
+    else:
+        units = np.arange(len(codes))
+        n_units = len(units)
+    labelled = (codes >= 0) & (units >= 0)
+    values, codes, units = values[labelled], codes[labelled], units[labelled]
+    rng = np.random.RandomState(seed)
+    unit_folds = rng.permutation(n_units) % max(min(folds, n_units), 1)
+    fold_codes = unit_folds[units]
+
+    correct = 0
+    for fold in np.unique(fold_codes):
+        test = fold_codes == fold
+        train = ~test
+        if not train.any():
+            continue
+        predicted = _lda_predict(values[train], codes[train], len(vowels), values[test])
+        correct += (predicted == codes[test]).sum()
+    return float(correct / len(codes)) if len(codes) else np.nan
+
+
+def _lda_predict(values, codes, n_classes, test_values):
+    """Classify values using linear discriminant analysis."""
+    stats = GroupStatistics(codes, n_classes, values)
+    counts = stats.count()[:, 0]
+    means = np.nan_to_num(stats.mean())
+    deviations = values - means[codes]
+    dof = max(len(codes) - (counts > 0).sum(), 1)
+    precision = np.linalg.pinv(deviations.T @ deviations / dof)
+    coefficients = precision @ means.T
+    with np.errstate(divide='ignore'):
+        intercepts = -0.5 * (means @ precision * means).sum(axis=1) + np.log(counts)
+    return np.argmax(test_values @ coefficients + intercepts, axis=1)
@@ -1,36 +1,73 @@
 """
     Normalizers package.
     ~~~~~~~~~~~~~~~~~~~~
+
+    Normalizer classes are listed in a static manifest
+    and their modules are only imported when a class is first accessed
+    (using a module level ``__getattr__``, see :pep:`562`),
+    so importing :mod:`vlnm` does not import dependencies
+    (such as scikit-learn) which are only needed by some normalizers.
 """
 
 import importlib
-from inspect import getmembers, isclass
-import os
-import sys
-
-from .base import Normalizer
-
-
-WHERE_AM_I = os.path.realpath(os.path.dirname(__file__))
-MODULE = sys.modules[__name__]
-
 
-def _get_all():
-    names = [
-        name[:-3] for name in os.listdir(WHERE_AM_I)
-        if name.split(os.extsep)[-1].lower() == 'py' and not name.startswith('_')]
-    klasses = []
-    for name in names:
-        module = importlib.import_module('{}.{}'.format(__package__, name))
+# Normalizer classes and the modules in which they are defined.
+CLASSES = {
+    'BarkDifferenceNormalizer': 'vowel',
+    'BarkNormalizer': 'formant',
+    'BighamNormalizer': 'centroid',
+    'BladenNormalizer': 'gender',
+    'CentroidNormalizer': 'centroid',
+    'ChainNormalizer': 'base',
+    'ConvexHullNormalizer': 'centroid',
+    'DefaultNormalizer': 'base',
+    'ErbNormalizer': 'formant',
+    'FactorAnalysisNormalizer': 'projection',
+    'FastICANormalizer': 'projection',
+    'FormantGenericNormalizer': 'base',
+    'FormantSpecificNormalizer': 'base',
+    'FormantsTransformNormalizer': 'base',
+    'GerstmanNormalizer': 'speaker',
+    'IEGMAGMNormalizer': 'vowel',
+    'IEHTNormalizer': 'vowel',
+    'LCENormalizer': 'speaker',
+    'LDANormalizer': 'projection',
+    'LobanovNormalizer': 'speaker',
+    'Log10Normalizer': 'formant',
+    'LogNormalizer': 'formant',
+    'MelNormalizer': 'formant',
+    'NMFNormalizer': 'projection',
+    'NearyExpNormalizer': 'speaker',
+    'NearyGMExpNormalizer': 'speaker',
+    'NearyGMNormalizer': 'speaker',
+    'NearyNormalizer': 'speaker',
+    'NordstromNormalizer': 'gender',
+    'Normalizer': 'base',
+    'NormalizerBundle': 'base',
+    'PCANormalizer': 'projection',
+    'SchwaNormalizer': 'centroid',
+    'SpeakerNormalizer': 'speaker',
+    'SupervisedProjectionNormalizer': 'projection',
+    'TransformNormalizer': 'base',
+    'UnsupervisedProjectionNormalizer': 'projection',
+    'WattFabricius1Normalizer': 'centroid',
+    'WattFabricius2Normalizer': 'centroid',
+    'WattFabricius3Normalizer': 'centroid',
+    'WattFabriciusNormalizer': 'centroid',
+}
 
-        klasses.extend([
-            klass for klass in getmembers(module) if isclass(klass[1])
-            and Normalizer in klass[1].__mro__])
+__all__ = sorted(CLASSES)
 
-    for key, value in klasses:
-        setattr(MODULE, key, value)
 
-    return sorted(list(set([klass[0] for klass in klasses])))
+def __getattr__(name):
+    if name in CLASSES:
+        module = importlib.import_module('{}.{}'.format(__name__, CLASSES[name]))
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(
+        'module {!r} has no attribute {!r}'.format(__name__, name))
 
 
-__all__ = _get_all()
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
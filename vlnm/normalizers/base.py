@@ -13,18 +13,70 @@ so can be used as a control when comparing normalization methods.
 
 """
 
+from collections import OrderedDict
+import copy
+import inspect
 import re
-from typing import Callable, List, Union
+from typing import Callable, Dict, List, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
 from .. import get_normalizer
+from ..cache import RESULT_CACHE, ResultCache
+from ..conversion import get_transform
 from ..docstrings import docstring
 from ..registration import classify, register
+from ..stats import factorize, GroupStatistics, StatisticsCache
 
 FORMANTS = ['f0', 'f1', 'f2', 'f3']
 
 
+class Plan:
+    """Set up for normalizing data frames with the same columns.
+
+    A plan records the options and formant columns
+    resolved by :meth:`Normalizer._setup`
+    for a particular set of data frame columns and options
+    and, once a data frame has been normalized,
+    the formant specifications, column subsets and output columns
+    for each formant specification.
+    Normalizers keep the most recently used plans,
+    so normalizing data frames with the same columns
+    skips resolving these again.
+
+    Parameters
+    ----------
+    options:
+        The options after setting up.
+    formants:
+        The formant columns after setting up.
+    references:
+        Objects identified in the cache key by their ``id``,
+        which are kept alive by the plan so the ``id`` cannot be reused.
+    """
+
+    def __init__(self, options: Dict, formants: Union[List, Dict], references: List = None):
+        self.options = options
+        self.formants = formants
+        self.references = references or []
+        self.specs = None
+        self.outputs = {}
+
+
+def _freeze(value, references):
+    """Convert a value to a hashable cache key."""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__,) + tuple(_freeze(item, references) for item in value)
+    if isinstance(value, dict):
+        return ('dict',) + tuple(
+            (key, _freeze(item, references)) for key, item in value.items())
+    references.append(value)
+    return ('id', id(value))
+
+
 def uninstantiable(cls):
     def new(klass, *_, **__):
         if klass == cls:
@@ -44,10 +96,18 @@ class Normalizer:
     The :class:`Normalizer` class forms the base of all
     normalizers and custom normalizers should all interit
     from this class or one of its subclasses.
+
+    Results of the :meth:`normalize` method can be cached on disk
+    by passing a :class:`vlnm.cache.ResultCache`
+    in the ``result_cache`` option
+    (or ``True`` to use :data:`vlnm.cache.RESULT_CACHE`).
     """
 
     MAX_FX = 5
 
+    # Maximum number of plans kept by each normalizer.
+    PLAN_CACHE_SIZE = 32
+
     config = dict(
         # Required columns for the normalizer.
         columns=[],
@@ -77,8 +137,29 @@ class Normalizer:
         # Parameters (configuration and options) supplied to _norm method.
         self.params = {}
 
+        # Fitted normalization parameters (see the fit method).
+        self.parameters = None
+        self.fitted = False
+
+        # Statistics accumulated by the partial_fit method.
+        self.partial_stats = {}
+
         self.formants = ['f{}'.format(i) for i in range(self.MAX_FX)]
 
+        # Plans for recently normalized column schemas (see the _setup method).
+        self.plan = None
+        self.plans = OrderedDict()
+
+        # The formants before and after the formant columns are resolved.
+        self.given_formants = None
+        self.resolved_formants = None
+
+    def __getstate__(self):
+        # Plans may refer to unpicklable options (e.g., an executor).
+        state = self.__dict__.copy()
+        state.update(plan=None, plans=OrderedDict())
+        return state
+
     def _get_config(self):
         config = {}
         for klass in type(self).mro():
@@ -115,6 +196,410 @@ class Normalizer:
         if isinstance(df, str):
             df = pd.read_csv(df)
 
+        self._setup(df, rename=rename, groupby=groups, **kwargs)
+
+        cache = self._get_result_cache()
+        if cache is not None:
+            columns, used = list(df.columns), self._used_columns(df)
+            key = cache.key(self, df, used)
+            norm_df = cache.get(key, df)
+            if norm_df is not None:
+                return norm_df
+
+        groups = self._get_groups(df)
+        self.options['groupby'] = groups
+        if groups:
+            norm_df = self._normalize_groups(df, groups)
+        else:
+            self._prenormalize(df)
+            norm_df = self._normalize(df)
+        self._postnormalize(norm_df)
+        if cache is not None:
+            cache.put(key, df, norm_df, columns, used)
+        return norm_df
+
+    def _get_result_cache(self) -> ResultCache:
+        """The result cache given in the ``result_cache`` option."""
+        cache = self.options.get('result_cache')
+        if cache is True:
+            return RESULT_CACHE
+        if cache is False:
+            return None
+        return cache
+
+    def _get_groups(self, df):
+        """The columns over which the data are grouped before normalization."""
+        groups = self.options.get('groupby') or self.config.get('groups') or []
+        groups = [groups] if isinstance(groups, str) else list(groups)
+        for column in groups:
+            if column not in df:
+                raise ValueError('Column {} not in dataframe'.format(column))
+        return groups
+
+    def _normalize_groups(self, df, groups):
+        """Normalize each group of rows separately.
+
+        The rows are partitioned using the codes of the
+        combined group columns (calculated once for all groups),
+        and the original row order is restored afterwards.
+        Rows with a missing group label are kept,
+        with missing (``NaN``) values in the output columns.
+        Subclasses whose calculations can be done for all groups at once
+        override this method.
+        """
+        codes, _ = factorize(df[groups])
+        rows = np.flatnonzero(codes >= 0)
+        if not len(rows):
+            # Normalize all the rows as one group to find the output columns.
+            options, self.options = self.options, dict(self.options, groupby=[])
+            try:
+                self._prenormalize(df)
+                norm_df = self._normalize(df)
+            finally:
+                self.options = options
+            return self._mask_missing_groups(norm_df, codes < 0)
+        rows = rows[np.argsort(codes[rows], kind='stable')]
+        sorted_codes = codes[rows]
+        starts = np.flatnonzero(sorted_codes[1:] != sorted_codes[:-1]) + 1
+        frames = []
+        for group_rows in np.split(rows, starts):
+            group_df = df.take(group_rows)
+            self._prenormalize(group_df)
+            frames.append(self._normalize(group_df))
+        missing = np.flatnonzero(codes < 0)
+        if len(missing):
+            frames.append(df.take(missing))
+            rows = np.concatenate([rows, missing])
+        norm_df = pd.concat(frames)
+        norm_df = norm_df.take(np.argsort(rows, kind='stable'))
+        return self._mask_missing_groups(norm_df, codes < 0)
+
+    def _mask_missing_groups(self, norm_df, missing):
+        """Set the outputs of rows with a missing group label to ``NaN``."""
+        if missing.any():
+            columns = [column for column in _output_columns(self) if column in norm_df]
+            norm_df.loc[missing, columns] = np.nan
+        return norm_df
+
+    def normalize_arrays(
+            self,
+            values: np.ndarray,
+            speaker_codes: np.ndarray = None,
+            vowel_codes: np.ndarray = None,
+            gender_mask: np.ndarray = None,
+            formants: List[str] = None,
+            out: np.ndarray = None,
+            vowel_labels: List[str] = None,
+            **kwargs) -> np.ndarray:
+        """Normalize formant data held in arrays.
+
+        This avoids the overhead of creating and indexing
+        data frames when the formant data and
+        speaker, vowel and gender information
+        are already held in arrays.
+        Normalizers which implement an array version of
+        their calculation use it directly;
+        others normalize a minimal data frame created from the arrays.
+
+        Parameters
+        ----------
+        values:
+            Two-dimensional array with one row for each token
+            and one column for each formant.
+        speaker_codes:
+            Integer speaker code for each row
+            (``-1`` for a missing speaker).
+            Required by speaker intrinsic normalizers.
+        vowel_codes:
+            Integer vowel code for each row
+            (``-1`` for a missing vowel).
+            Required by vowel extrinsic normalizers,
+            and options naming vowels (e.g., ``trap``)
+            should give vowel codes, unless ``vowel_labels`` is given.
+        gender_mask:
+            Boolean array which is ``True`` for rows
+            from female speakers.
+            Required by gender-based normalizers.
+        formants:
+            The formant in each column of ``values``
+            (e.g., ``['f1', 'f2']``).
+            Defaults to ``['f0', 'f1', ...]``.
+        out:
+            Optional array in which to store the result,
+            which must have the shape of the result.
+        vowel_labels:
+            The vowel label of each vowel code
+            (e.g., the categories of a categorical vowel column),
+            against which options naming vowels are resolved.
+        **kwargs:
+            Options which override the options passed to the constructor.
+
+        Returns
+        -------
+        :
+            An array with one row for each token.
+            For most normalizers this has the same columns
+            as ``values``.
+        """
+        values = np.asarray(values)
+        if values.ndim != 2:
+            raise ValueError('Formant values must be a two-dimensional array')
+        if values.dtype.kind != 'f':
+            values = values.astype(np.float64)
+        formants = list(formants) if formants is not None else [
+            'f{}'.format(i) for i in range(values.shape[1])]
+        if len(formants) != values.shape[1]:
+            raise ValueError(
+                'Expected {} formant names but got {}'.format(values.shape[1], len(formants)))
+        arrays = dict(
+            speaker=None if speaker_codes is None else np.asarray(speaker_codes),
+            vowel=None if vowel_codes is None else np.asarray(vowel_codes),
+            gender=None if gender_mask is None else np.asarray(gender_mask, dtype=bool),
+            vowel_labels=None if vowel_labels is None else pd.Index(vowel_labels))
+
+        self.params = self.default_options.copy()
+        self.params.update(
+            formants=formants,
+            **{key: value for key, value in kwargs.items() if value is not None})
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = self._norm_arrays(values, arrays, out)
+        if result is None:
+            result = self._normalize_arrays_frame(values, arrays, **kwargs)
+        if out is not None and result is not out:
+            out[...] = result
+            return out
+        return result
+
+    def _norm_arrays(
+            self,
+            values: np.ndarray,
+            arrays: Dict[str, np.ndarray],
+            out: np.ndarray = None) -> np.ndarray:  # pylint: disable=unused-argument
+        """Array version of the normalization, for :meth:`normalize_arrays`.
+
+        Implemented by subclasses, using ``self.params``
+        (whose ``formants`` entry names the columns of ``values``).
+        Returns ``None`` if the normalizer has no array implementation.
+        """
+        return None
+
+    def _normalize_arrays_frame(self, values, arrays, **kwargs):
+        """Normalize arrays using a minimal data frame."""
+        formants = self.params['formants']
+        data = {formant: values[:, j] for j, formant in enumerate(formants)}
+        for key in ['speaker', 'vowel']:
+            if arrays[key] is not None:
+                data[self.default_options.get(key) or key] = arrays[key]
+        if arrays['vowel'] is not None and arrays['vowel_labels'] is not None:
+            data[self.default_options.get('vowel') or 'vowel'] = pd.Categorical.from_codes(
+                arrays['vowel'], arrays['vowel_labels'])
+        if arrays['gender'] is not None:
+            data[self.default_options.get('gender') or 'gender'] = np.where(
+                arrays['gender'],
+                self.default_options.get('female') or 'F',
+                self.default_options.get('male') or 'M')
+        normalizer = copy.copy(self)
+        normalizer.formants = normalizer._array_formants(formants)  # pylint: disable=protected-access
+        norm_df = normalizer.normalize(pd.DataFrame(data), **kwargs)
+        return norm_df[self._array_outputs(formants)].to_numpy(dtype=np.float64)
+
+    def _array_formants(self, formants):  # pylint: disable=no-self-use
+        """The formants attribute used to normalize columns named after the formants."""
+        return list(formants)
+
+    def _array_outputs(self, formants):  # pylint: disable=no-self-use
+        """The output columns of :meth:`normalize_arrays`."""
+        return list(formants)
+
+    def fit(self, df: Union[pd.DataFrame, str], **kwargs) -> 'Normalizer':
+        """Calculate the normalization parameters for a data set.
+
+        The parameters are stored in the :attr:`parameters`
+        attribute, and can be used to normalize other data
+        using the :meth:`transform` method
+        (e.g., data for speakers previously seen by the normalizer).
+
+        Parameters
+        ----------
+        df:
+            DataFrame containing formant data.
+        **kwargs:
+            Options which override the options passed to the constructor.
+
+        Returns
+        -------
+        :
+            The normalizer instance.
+        """
+        if isinstance(df, str):
+            df = pd.read_csv(df)
+        self.partial_stats = {}
+        return self._fit_formants(df, self._fit, **kwargs)
+
+    def partial_fit(self, df: pd.DataFrame, **kwargs) -> 'Normalizer':
+        """Update the normalization parameters with a chunk of data.
+
+        Calling this method repeatedly with successive chunks
+        of a data set gives the same parameters as calling
+        :meth:`fit` with the entire data set,
+        without requiring the entire data set to be in memory.
+        Only normalizers whose parameters can be calculated
+        from mergeable statistics
+        (and normalizers without parameters) support this method.
+
+        Parameters
+        ----------
+        df:
+            DataFrame containing a chunk of the formant data.
+        **kwargs:
+            Options which override the options passed to the constructor.
+
+        Returns
+        -------
+        :
+            The normalizer instance.
+        """
+        return self._fit_formants(df, self._partial_fit, **kwargs)
+
+    def _fit_formants(self, df, fit, **kwargs):
+        self._setup(df, **kwargs)
+        self._prenormalize(df)
+
+        tables = []
+        for formant_spec in self._formant_iterator():
+            self._set_params(df, formant_spec)
+            table = fit(df)
+            if table is not None:
+                tables.append(table)
+        if tables:
+            table = pd.concat(tables, axis=1)
+            self.parameters = table.loc[:, ~table.columns.duplicated()]
+        else:
+            self.parameters = None
+        self.fitted = True
+        return self
+
+    def transform(self, df: Union[pd.DataFrame, str], **kwargs) -> pd.DataFrame:
+        """Normalize data using previously fitted parameters.
+
+        Parameters
+        ----------
+        df:
+            DataFrame containing formant data.
+        **kwargs:
+            Options which override the options passed to the constructor.
+
+        Returns
+        -------
+        :
+            A DataFrame containing the normalized formants.
+            Rows for which no parameters were fitted
+            (e.g., for speakers not in the fitted data)
+            will contain missing values.
+        """
+        if not self.fitted:
+            raise ValueError(
+                '{} has not been fitted'.format(type(self).__name__))
+        return Normalizer.normalize(self, df, parameters=self.parameters, **kwargs)
+
+    def required_columns(self, columns: List[str], **kwargs) -> List[str]:
+        """The columns of a data set required to normalize it.
+
+        This can be used to read only the columns which are needed
+        from a file (e.g., speaker, vowel and formant columns).
+
+        Parameters
+        ----------
+        columns:
+            The columns of the data set.
+        **kwargs:
+            Options which override the options passed to the constructor.
+
+        Returns
+        -------
+        :
+            The required columns, in the order given in ``columns``.
+        """
+        df = pd.DataFrame(columns=list(columns))
+        self._setup(df, **kwargs)
+        return self._used_columns(df)
+
+    def _used_columns(self, df):
+        """The columns of a data frame used by the current set up."""
+        required = set(self._get_groups(df))
+        for formant_spec in self._formant_iterator():
+            self._set_params(df, formant_spec)
+            required.update(self._get_subset(df, formant_spec))
+        return [column for column in df.columns if column in required]
+
+    def save_parameters(self, file_out):
+        """Save fitted parameters to a CSV file.
+
+        Parameters
+        ----------
+        file_out:
+            A file path or file handle.
+        """
+        if self.parameters is None:
+            raise ValueError(
+                '{} has no fitted parameters'.format(type(self).__name__))
+        self.parameters.to_csv(file_out)
+
+    def load_parameters(self, file_in) -> 'Normalizer':
+        """Load parameters saved using :meth:`save_parameters`.
+
+        Parameters
+        ----------
+        file_in:
+            A file path or file handle.
+
+        Returns
+        -------
+        :
+            The normalizer instance.
+        """
+        table = pd.read_csv(file_in)
+        index = list(table.columns[:list(table.columns).index('parameter') + 1])
+        self.parameters = table.set_index(index)
+        self.fitted = True
+        return self
+
+    def _setup(self, df, rename=None, **kwargs):
+        """Set up the options for normalizing (or fitting) a data frame.
+
+        The result is cached as a :class:`Plan`
+        keyed by the data frame columns and the options,
+        so setting up for a data frame with the same columns
+        and options as a recent one only restores the plan.
+        """
+        if self.formants is not self.resolved_formants:
+            # Formants set by the constructor (or the caller),
+            # which resolving the formant columns replaces.
+            self.given_formants = copy.deepcopy(self.formants)
+        references = []
+        key = (
+            tuple(df.columns),
+            _freeze(self.given_formants, references),
+            _freeze(self.default_options, references),
+            _freeze(rename, references),
+            _freeze(kwargs, references))
+        plan = self.plans.get(key)
+        if plan is None:
+            self.formants = copy.deepcopy(self.given_formants)
+            self._compile(df, rename=rename, **kwargs)
+            plan = Plan(self.options.copy(), copy.deepcopy(self.formants), references)
+            self.plans[key] = plan
+            if len(self.plans) > self.PLAN_CACHE_SIZE:
+                self.plans.popitem(last=False)
+        else:
+            self.plans.move_to_end(key)
+            self.options = plan.options.copy()
+            self.formants = copy.deepcopy(plan.formants)
+        self.resolved_formants = self.formants
+        self.plan = plan
+
+    def _compile(self, df, rename=None, **kwargs):
+        """Resolve the options for normalizing (or fitting) a data frame."""
         self.options = self.default_options.copy()
         self.options.update(
             rename=rename or self.options.get('rename'),
@@ -141,16 +626,6 @@ class Normalizer:
                         raise ValueError(
                             'Column {} not in dataframe'.format(col))
 
-        self._prenormalize(df)
-        groups = self.config.get('groups')
-        if groups:
-            norm_df = df.groupby(groups, as_index=False).apply(
-                self._normalize).reset_index(drop=True)
-        else:
-            norm_df = self._normalize(df)
-        self._postnormalize(norm_df)
-        return norm_df
-
     def _get_formant_columns(self, df):
         formants = self.options.get('formants', self.formants) or self.formants
         try:
@@ -172,58 +647,232 @@ class Normalizer:
         """Actions performed after normalization."""
         return df
 
+    def _set_params(self, df, formant_spec):
+        formant_spec['formants'] = [
+            formant for formant in formant_spec['formants']
+            if formant in df.columns]
+        self.params = self.options.copy()
+        self.params.update(**formant_spec)
+
     def _normalize(self, df):
-        for formant_spec in self._formant_iterator():
-            formant_spec['formants'] = [
-                formant for formant in formant_spec['formants']
-                if formant in df.columns]
+        specs = self._get_specs(df)
+
+        block, offsets = self._get_formant_block(df, specs)
+
+        outputs = {}
+        for i, ((formant_spec, subset), offset) in enumerate(zip(specs, offsets)):
             self.params = self.options.copy()
             self.params.update(**formant_spec)
+            norm_df = self._norm(
+                self._get_spec_frame(df, formant_spec, subset, block, offset, outputs))
+            outputs.update(self._rename_outputs(norm_df, formant_spec, subset, spec_index=i))
+
+        return self._assign_outputs(df, outputs)
+
+    def _get_specs(self, df):
+        """The formant specs and column subsets for normalizing a data frame.
 
-            # Get the columns to subset the dataframe.
-            subset = formant_spec['formants'][:]
-            for column in self.config['columns']:
-                if column in formant_spec:
-                    subset.extend(formant_spec[column])
-                else:
-                    subset.append(self.params.get(column, column))
-
-            # Throw an error if column not in dataframe or just plough on?
-            subset = list(
-                set(column for column in subset if column in df.columns))
-
-            norm_df = self._norm(df[subset].copy())
-
-            # Find new/renameable columns and rename.
-            outputs = self._get_outputs()
-            if outputs:
-                outputs = [
-                    formant_spec.get(name, self.params.get(name, name)) for name in outputs]
+        These are stored in the current plan,
+        and copies are returned so they can be modified.
+        """
+        plan = self.plan
+        if plan is None or plan.specs is None:
+            specs = []
+            for formant_spec in self._formant_iterator():
+                self._set_params(df, formant_spec)
+                specs.append((formant_spec, self._get_subset(df, formant_spec)))
+            if plan is None:
+                return specs
+            plan.specs = specs
+        return [
+            ({key: value[:] if isinstance(value, list) else value
+              for key, value in formant_spec.items()}, subset[:])
+            for formant_spec, subset in plan.specs]
+
+    def _get_subset(self, df, formant_spec):
+        """Columns of the data frame required to normalize a formant spec."""
+        subset = formant_spec['formants'][:]
+        for column in self.config['columns']:
+            if column in formant_spec:
+                value = formant_spec[column]
+                subset.extend([value] if isinstance(value, str) else value)
             else:
-                outputs = [column for column in norm_df
-                           if column not in subset]
-                outputs.extend(self.params['formants'])
-            rename = self.params.get('rename') or '{}'
-            index = 1
-            for column in outputs:
-                if column in norm_df:
-                    try:
-                        new_column = rename.get(column, column)
-                        if new_column is None:
-                            continue
-                    except AttributeError:
-                        if '{}' in rename:
-                            new_column = rename.format(column)
-                        else:
-                            new_column = '{}{}'.format(rename, index)
-                            index += 1
-                    df[new_column] = norm_df[column]
+                subset.append(self.params.get(column, column))
+        groups = self.params.get('groupby') or []
+        subset.extend([groups] if isinstance(groups, str) else groups)
+
+        # Throw an error if column not in dataframe or just plough on?
+        return list(
+            set(column for column in subset if column in df.columns))
+
+    @staticmethod
+    def _get_formant_block(df, specs):
+        """Copy the formant columns of all formant specs into a single float block.
+
+        The columns of each spec are contiguous in the block,
+        so each spec can be normalized using a view of the block.
+        If any formant column is not floating point
+        ``None`` is returned and each spec is copied from the
+        data frame separately.
+        """
+        columns, offsets = [], []
+        for formant_spec, _ in specs:
+            offsets.append(len(columns))
+            columns.extend(formant_spec['formants'])
+        if not columns or not all(
+                pd.api.types.is_float_dtype(df[column]) for column in set(columns)):
+            return None, offsets
+        block = np.empty((len(df), len(columns)), dtype=np.float64)
+        for j, column in enumerate(columns):
+            block[:, j] = df[column].values
+        return block, offsets
 
+    @staticmethod
+    def _get_spec_frame(df, formant_spec, subset, block, offset, outputs):
+        """The data frame passed to the ``_norm`` method for a formant spec.
+
+        Columns already written by a previous spec
+        are taken from the pending outputs.
+        """
+        formants = formant_spec['formants']
+        if block is None:
+            spec_df = df[subset].copy()
+        else:
+            spec_df = pd.DataFrame(
+                block[:, offset:offset + len(formants)],
+                index=df.index, columns=formants, copy=False)
+            for column in subset:
+                if column not in formants:
+                    spec_df[column] = df[column].values.copy()
+        for column in subset:
+            if column in outputs:
+                spec_df[column] = outputs[column]
+        return spec_df
+
+    def _rename_outputs(self, norm_df, formant_spec, subset, spec_index=None):
+        """Find new/renameable columns and rename."""
+        plan = self.plan
+        key = (spec_index, tuple(norm_df.columns))
+        if plan is not None and spec_index is not None and key in plan.outputs:
+            names = plan.outputs[key]
+        else:
+            names = self._get_output_names(norm_df, formant_spec, subset)
+            if plan is not None and spec_index is not None:
+                plan.outputs[key] = names
+        return {new_column: norm_df[column].values for column, new_column in names}
+
+    def _get_output_names(self, norm_df, formant_spec, subset):
+        """Output columns of the normalized data and their new names."""
+        outputs = self._get_outputs()
+        if outputs:
+            outputs = [
+                formant_spec.get(name, self.params.get(name, name)) for name in outputs]
+        else:
+            outputs = [column for column in norm_df
+                       if column not in subset]
+            outputs.extend(self.params['formants'])
+        rename = self.params.get('rename') or '{}'
+        index = 1
+        names = []
+        for column in outputs:
+            if column in norm_df:
+                try:
+                    new_column = rename.get(column, column)
+                    if new_column is None:
+                        continue
+                except AttributeError:
+                    if '{}' in rename:
+                        new_column = rename.format(column)
+                    else:
+                        new_column = '{}{}'.format(rename, index)
+                        index += 1
+                names.append((column, new_column))
+        return names
+
+    @staticmethod
+    def _assign_outputs(df, outputs):
+        """Return a data frame with the output columns added or replaced.
+
+        The data frame passed in is left unchanged.
+        New columns are inserted into a shallow copy of the data frame.
+        If existing columns are overwritten the data frame
+        is rebuilt in a single pass, rather than replacing each column in turn
+        (which copies the block holding the column every time).
+        Other columns keep their dtypes (and duplicate labels).
+        """
+        if any(column in df.columns for column in outputs):
+            columns = df.columns.append(pd.Index(
+                [column for column in outputs if column not in df.columns]))
+            norm_df = pd.DataFrame(
+                {i: outputs[column] if column in outputs else df.iloc[:, i].array
+                 for i, column in enumerate(columns)},
+                index=df.index)
+            norm_df.columns = columns
+            return norm_df
+        df = df.copy(deep=False)
+        for column, values in outputs.items():
+            df[column] = values
         return df
 
     def _get_outputs(self):
         return self.config.get('outputs')
 
+    def _fit(self, df):  # pylint: disable=no-self-use,unused-argument
+        """Calculate the parameter table for the current formants.
+
+        Implemented by subclasses whose normalization depends on
+        statistics calculated from the data.
+        """
+        return None
+
+    def _partial_fit(self, df):
+        """Update the parameter table for the current formants with a chunk of data.
+
+        By default, only normalizers without parameters
+        can be fitted incrementally.
+        """
+        if self._fit(df) is not None:
+            raise NotImplementedError(
+                '{} cannot be fitted incrementally'.format(type(self).__name__))
+        return None
+
+    @staticmethod
+    def _parameter_table(
+            parameters: Dict[str, np.ndarray],
+            index: pd.Index,
+            columns: List[str]) -> pd.DataFrame:
+        """Create a parameter table from arrays of parameters."""
+        frames = {
+            name: pd.DataFrame(np.atleast_2d(value), index=index, columns=columns)
+            for name, value in parameters.items()}
+        table = pd.concat(frames, names=['parameter'])
+        if table.index.nlevels > 1:
+            table = table.reorder_levels(list(range(1, table.index.nlevels)) + [0])
+        return table
+
+    def _lookup_parameter(
+            self,
+            df: pd.DataFrame,
+            name: str,
+            by: Union[str, List[str]],
+            columns: List[str]) -> np.ndarray:
+        """Look up a fitted parameter for each row of a data frame.
+
+        If ``by`` is a list of columns, the parameters are
+        looked up using the combination of values in the columns.
+        """
+        table = self.params['parameters'].xs(name, level='parameter')
+        if isinstance(by, str):
+            index = table.index.get_indexer(df[by])
+        else:
+            index = table.index.get_indexer(pd.MultiIndex.from_frame(df[by]))
+        values = table[columns].values.astype(float)
+        if values.shape[0] == 0:
+            return np.full((len(df), len(columns)), np.nan)
+        values = values[np.where(index >= 0, index, 0)]
+        values[index < 0] = np.nan
+        return values
+
     def _formant_iterator(self):
         yield dict(formants=self.formants)
 
@@ -274,6 +923,9 @@ class FormantSpecificNormalizer(Normalizer):
                     column for column in df.columns if re.match(formant, column)]
         self.formants = {key: value for key, value in self.formants.items() if value}
 
+    def _array_formants(self, formants):
+        return {formant: [formant] for formant in formants if formant in self.formants}
+
     def _sanitize_formants(self, formants):  # pylint: disable=no-self-use
         fxs = list(formants.keys())
         for fx in fxs:
@@ -284,9 +936,9 @@ class FormantSpecificNormalizer(Normalizer):
 
     def _formant_iterator(self):
         fxs = sorted(list(self.formants.keys()))
-        for formants in zip(*(self.formants[fx] for fx in fxs if fx in fxs)):
-            formant_spec = {fx: formants[i] for i, fx in enumerate(formants)}
-            formant_spec['formants'] = sorted(list(formant_spec.keys()))
+        for formants in zip(*(self.formants[fx] for fx in fxs)):
+            formant_spec = {fx: formants[i] for i, fx in enumerate(fxs)}
+            formant_spec['formants'] = list(formants)
             yield formant_spec
 
 
@@ -318,13 +970,143 @@ class TransformNormalizer(FormantGenericNormalizer):
     """Base class for normalizers which simply transform formants.
     """
 
+    def _normalize_groups(self, df, groups):
+        # Each row is transformed independently, so grouping only
+        # affects rows with a missing group label.
+        self._prenormalize(df)
+        codes, _ = factorize(df[groups])
+        return self._mask_missing_groups(self._normalize(df), codes < 0)
+
     def _norm(self, df):
         transform = self.params.get('transform') or self.config.get('transform')
         if transform:
             formants = self.params.get('formants')
-            df[formants] = transform(df[formants])
+            if _accepts_out(transform):
+                values = df[formants].values
+                if values.dtype not in (np.float32, np.float64):
+                    values = values.astype(np.float64)
+                out = np.empty(values.shape, dtype=values.dtype)
+                df[formants] = transform(values, out=out)
+            else:
+                df[formants] = transform(df[formants])
         return df
 
+    def _norm_arrays(self, values, arrays, out=None):
+        transform = self.params.get('transform') or self.config.get('transform')
+        if not transform:
+            return values.copy() if out is None else _copy_to(out, values)
+        if _accepts_out(transform):
+            return transform(values, out=np.empty_like(values) if out is None else out)
+        return np.asarray(transform(values), dtype=float)
+
+
+class _ComposedTransform:
+    """Transforms applied in turn to a single working array."""
+
+    def __init__(self, transforms: List[Callable]):
+        self.transforms = transforms
+
+    def __call__(self, values, out=None):
+        out = self.transforms[0](values, out=out)
+        for transform in self.transforms[1:]:
+            out = transform(out, out=out)
+        return out
+
+
+def _fuse_transforms(
+        normalizers: List[Normalizer],
+        columns: List[str],
+        keep_intermediate: bool = True) -> Tuple[Normalizer, int]:
+    """Fuse the leading transform normalizers of a chain.
+
+    A transform normalizer is fused with the next one
+    if the next one transforms exactly the columns written by it,
+    both accept an ``out`` argument
+    and both rename columns using a ``{}`` pattern.
+    Transforms writing new columns are only fused
+    if intermediate columns are not kept.
+
+    Returns
+    -------
+    :
+        The normalizer to run next and the number of normalizers it replaces.
+    """
+    # pylint: disable=protected-access
+    first = normalizers[0]
+    transforms, renames = [], []
+    frame = pd.DataFrame(columns=columns)
+    inputs = formants = None
+    for normalizer in normalizers:
+        transform = _fusable_transform(normalizer)
+        if transform is None:
+            break
+        rename = normalizer.default_options.get('rename') or '{}'
+        # Set up a copy, so the options and plans of the normalizer are unchanged.
+        normalizer = copy.copy(normalizer)
+        normalizer.formants = copy.deepcopy(normalizer.formants)
+        normalizer.plan, normalizer.plans = None, OrderedDict()
+        normalizer._setup(frame)
+        step_formants = [formant for formant in normalizer.formants if formant in columns]
+        if transforms and step_formants != formants:
+            break
+        if transforms and formants != inputs and keep_intermediate:
+            break
+        inputs = step_formants
+        formants = [rename.format(formant) for formant in inputs]
+        transforms.append(transform)
+        renames.append(rename)
+        frame = pd.DataFrame(columns=columns + [
+            column for column in formants if column not in columns])
+        columns = list(frame.columns)
+    if len(transforms) < 2:
+        return first, 1
+    rename = '{}'
+    for step_rename in reversed(renames):
+        rename = rename.format(step_rename)
+    fused = copy.copy(first)
+    fused.default_options = dict(
+        first.default_options, transform=_ComposedTransform(transforms), rename=rename)
+    fused.plan = None
+    fused.plans = OrderedDict()
+    return fused, len(transforms)
+
+
+def _output_columns(normalizer: Normalizer) -> List[str]:
+    """The columns written by the most recent normalization (as recorded in its plan)."""
+    plan = getattr(normalizer, 'plan', None)
+    if plan is None:
+        return []
+    return [column for names in plan.outputs.values() for _, column in names]
+
+
+def _fusable_transform(normalizer: Normalizer) -> Callable:
+    """The transform of a normalizer which can be fused (otherwise ``None``)."""
+    if not isinstance(normalizer, FormantsTransformNormalizer):
+        return None
+    transform = normalizer.default_options.get('transform') or normalizer.config.get('transform')
+    rename = normalizer.default_options.get('rename') or '{}'
+    if not transform or not _accepts_out(transform):
+        return None
+    if not isinstance(rename, str) or rename.count('{}') != 1:
+        return None
+    return transform
+
+
+def _copy_to(out: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Copy values into an output array."""
+    out[...] = values
+    return out
+
+
+def _accepts_out(func: Callable) -> bool:
+    """Whether a function accepts an ``out`` argument (like a NumPy ufunc)."""
+    if isinstance(func, np.ufunc):
+        return True
+    try:
+        return 'out' in inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+
 
 @docstring
 @uninstantiable
@@ -339,6 +1121,32 @@ class FormantsTransformNormalizer(TransformNormalizer):
             **kwargs):
         super().__init__(formants=formants, transform=transform, **kwargs)
 
+    def inverse_transform(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        """Convert transformed formant data back to Hz.
+
+        The inverse is looked up in the
+        :ref:`transform registry <vlnm.conversion>`
+        using the normalizer's transform.
+
+        Parameters
+        ----------
+        df:
+            DataFrame containing transformed formant data.
+        **kwargs:
+            Passed to the :meth:`normalize` method.
+
+        Returns
+        -------
+        :
+            A DataFrame containing the formant data in Hz.
+        """
+        transform = self.default_options.get('transform') or self.config.get('transform')
+        registered = get_transform(transform)
+        if registered is None:
+            raise ValueError(
+                '{} has no registered inverse transform'.format(type(self).__name__))
+        return Normalizer.normalize(self, df, transform=registered.inverse, **kwargs)
+
 
 @docstring
 @register('default')
@@ -376,6 +1184,9 @@ class DefaultNormalizer(FormantGenericNormalizer):
             **kwargs):
         super().__init__(formants=formants, rename=rename)
 
+    def _norm_arrays(self, values, arrays, out=None):
+        return values.copy() if out is None else _copy_to(out, values)
+
     @docstring
     def normalize(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
         return super().normalize(df, **kwargs)
@@ -388,10 +1199,20 @@ class ChainNormalizer(Normalizer):
     r"""
     Run multiple normalizers in sequence.
 
+    Consecutive transform normalizers
+    (e.g., :class:`.LogNormalizer` followed by :class:`.BarkNormalizer`)
+    where each transforms the output of the previous one
+    are fused into a single normalizer,
+    which applies the transforms in turn to a single working array.
+
     Parameters
     ----------
     normalizers:
         A list of normalizers.
+    keep_intermediate:
+        If :obj:`False`, columns added by any normalizer
+        except the last are removed from the output
+        (and transforms writing such columns can be fused).
 
 
     Examples
@@ -416,10 +1237,12 @@ class ChainNormalizer(Normalizer):
 
     def __init__(
             self,
-            normalizers: Union[List[str], List[Normalizer]] = None):
+            normalizers: Union[List[str], List[Normalizer]] = None,
+            keep_intermediate: bool = True):
 
         super().__init__()
         self.normalizers = normalizers
+        self.keep_intermediate = keep_intermediate
 
     def normalize(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -435,11 +1258,330 @@ class ChainNormalizer(Normalizer):
         :
             The normalized data.
         """
+        normalizers = [
+            get_normalizer(normalizer)() if isinstance(normalizer, str) else normalizer
+            for normalizer in self.normalizers]
         norm_df = df
+        columns = list(df.columns)
+        intermediate = []
+        i = 0
+        while i < len(normalizers):
+            normalizer, fused = _fuse_transforms(
+                normalizers[i:], list(norm_df.columns), self.keep_intermediate)
+            i += fused
+            if i == len(normalizers):
+                intermediate = [
+                    column for column in norm_df.columns if column not in columns]
+            norm_df = normalizer.normalize(norm_df)
+        if not self.keep_intermediate and intermediate:
+            outputs = _output_columns(normalizer)
+            norm_df = norm_df.drop(
+                columns=[column for column in intermediate if column not in outputs])
+        return norm_df
+
+    def required_columns(self, columns: List[str], **kwargs) -> List[str]:
+        """The columns of a data set required by any of the normalizers.
+
+        Columns added by a normalizer in the chain are
+        not in the data set, so are not included.
+        """
+        required = set()
         for normalizer in self.normalizers:
-            try:
-                norm_df = normalizer.normalize(norm_df)
-            except AttributeError:
-                normalizer = get_normalizer(normalizer)
-                norm_df = normalizer.normalize(norm_df)
+            if isinstance(normalizer, str):
+                normalizer = get_normalizer(normalizer)()
+            required.update(normalizer.required_columns(columns, **kwargs))
+        return [column for column in columns if column in required]
+
+    def _norm_arrays(self, values, arrays, out=None):
+        formants = self.params['formants']
+        for i, normalizer in enumerate(self.normalizers):
+            if isinstance(normalizer, str):
+                normalizer = get_normalizer(normalizer)()
+            last = i == len(self.normalizers) - 1
+            values = normalizer.normalize_arrays(
+                values,
+                speaker_codes=arrays['speaker'],
+                vowel_codes=arrays['vowel'],
+                gender_mask=arrays['gender'],
+                formants=formants if values.shape[1] == len(formants) else None,
+                out=out if last else None,
+                vowel_labels=arrays['vowel_labels'])
+        return values
+
+    def fit(self, df: pd.DataFrame, **kwargs) -> 'ChainNormalizer':
+        """
+        Fit each normalizer to the output of the previous normalizer.
+
+        Parameters
+        ----------
+        df:
+            The DataFrame containing the formant data.
+
+        Returns
+        -------
+        :
+            The normalizer instance.
+        """
+        self.normalizers = [
+            get_normalizer(normalizer)() if isinstance(normalizer, str) else normalizer
+            for normalizer in self.normalizers]
+        norm_df = df
+        for normalizer in self.normalizers:
+            norm_df = normalizer.fit(norm_df, **kwargs).transform(norm_df)
+        self.fitted = True
+        return self
+
+    def transform(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        """
+        Normalize a DataFrame using the fitted normalizers.
+
+        Parameters
+        ----------
+        df:
+            The DataFrame containing the formant data.
+
+        Returns
+        -------
+        :
+            The normalized data.
+        """
+        if not self.fitted:
+            raise ValueError(
+                '{} has not been fitted'.format(type(self).__name__))
+        norm_df = df
+        for normalizer in self.normalizers:
+            norm_df = normalizer.transform(norm_df, **kwargs)
         return norm_df
+
+
+class _SharedData:
+    """Arrays calculated once from a data frame and shared by a bundle's normalizers.
+
+    Group codes, formant blocks and speaker statistics
+    are calculated on first use and reused afterwards.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.cache = StatisticsCache()
+        self._codes = {}
+        self._values = {}
+        self._stats = {}
+
+    def codes(self, column):
+        """Integer codes and labels for a column (``None`` if it is missing)."""
+        if column not in self._codes:
+            self._codes[column] = factorize(self.df[column]) if column in self.df else None
+        return self._codes[column]
+
+    def values(self, formants):
+        """The formant columns as a single float block."""
+        key = tuple(formants)
+        if key not in self._values:
+            self._values[key] = self.df[list(formants)].to_numpy(dtype=np.float64)
+        return self._values[key]
+
+    def stats(self, speaker, formants):
+        """Speaker statistics for the formant columns."""
+        key = (speaker, tuple(formants))
+        if key not in self._stats:
+            codes, labels = self.codes(speaker)
+            self._stats[key] = GroupStatistics(
+                codes, len(labels), self.values(formants), labels=labels)
+        return self._stats[key]
+
+    def arrays(self, options, formants):
+        """The arrays passed to ``_norm_arrays`` given a normalizer's options."""
+        speaker = options.get('speaker') or 'speaker'
+        codes = self.codes(speaker)
+        return dict(
+            speaker=None if codes is None else codes[0],
+            vowel=None,
+            gender=None,
+            stats=None if codes is None else self.stats(speaker, formants))
+
+
+@docstring
+@classify(vowel=None, formant=None, speaker=None)
+class NormalizerBundle(Normalizer):
+    r"""
+    Run several normalizers on the same data in a single pass.
+
+    Unlike the :class:`ChainNormalizer`, each normalizer
+    normalizes the original data and its output columns
+    are added to the data frame (with a distinct suffix for each normalizer).
+    Work common to the normalizers is done once:
+    the speaker column is factorized once,
+    the formant columns are copied into a float block once,
+    and speaker statistics are calculated once
+    for all the normalizers which use them.
+    Normalizers which can normalize arrays
+    (see :meth:`Normalizer.normalize_arrays`)
+    use these directly; other normalizers normalize the data frame,
+    sharing speaker statistics through a :class:`vlnm.stats.StatisticsCache`.
+    Normalizers with a ``result_cache`` option also normalize the data frame,
+    so their results are looked up in and added to the cache.
+
+    Parameters
+    ----------
+    normalizers:
+        A list of normalizers or registered normalizer names.
+    rename:
+        The rename option for each normalizer,
+        as a list (in the same order as the normalizers)
+        or a dictionary keyed by normalizer name.
+        By default, the output columns of each normalizer
+        are suffixed with the name of the normalizer
+        (e.g., ``f1_lobanov``).
+    **kwargs:
+        Keyword arguments passed to the constructor
+        of normalizers given by name.
+
+
+    Examples
+    --------
+
+    .. ipython::
+
+        from vlnm import pb1952, NormalizerBundle
+
+        df = pb1952(['speaker', 'vowel', 'f1', 'f2'])
+        bundle = NormalizerBundle(['lobanov', 'neary', 'gerstman'])
+        norm_df = bundle.normalize(df)
+        norm_df.head()
+
+
+    """
+
+    def __init__(
+            self,
+            normalizers: Union[List[str], List[Normalizer]] = None,
+            rename: Union[List[str], Dict[str, str]] = None,
+            **kwargs):
+
+        super().__init__()
+        self.normalizers = [
+            get_normalizer(normalizer)(**kwargs) if isinstance(normalizer, str) else normalizer
+            for normalizer in normalizers or []]
+        self.names = _unique_names([
+            getattr(normalizer, 'name', None) or type(normalizer).__name__.lower()
+            for normalizer in self.normalizers])
+        self.rename = rename
+
+    def normalize(self, df: Union[pd.DataFrame, str]) -> pd.DataFrame:
+        """
+        Normalize a DataFrame with each normalizer.
+
+        Parameters
+        ----------
+        df:
+            The DataFrame containing the formant data.
+
+        Returns
+        -------
+        :
+            The data with the output columns of every normalizer added.
+        """
+        if isinstance(df, str):
+            df = pd.read_csv(df)
+        shared = _SharedData(df)
+        outputs = {}
+        for normalizer, name in zip(self.normalizers, self.names):
+            worker = _bundle_worker(
+                normalizer, rename=self._get_rename(name), stats_cache=shared.cache)
+            norm_outputs = None
+            if not worker.default_options.get('result_cache'):
+                # Cached results are looked up when normalizing the data frame.
+                norm_outputs = _normalize_shared_arrays(worker, shared)
+            if norm_outputs is None:
+                norm_df = worker.normalize(df.copy(deep=False))
+                if not norm_df.index.equals(df.index):
+                    norm_df = norm_df.reindex(df.index)
+                norm_outputs = {
+                    column: norm_df[column].values
+                    for column in norm_df.columns if column not in df.columns}
+            outputs.update(norm_outputs)
+        return self._assign_outputs(df, outputs)
+
+    def required_columns(self, columns: List[str], **kwargs) -> List[str]:
+        """The columns of a data set required by any of the normalizers."""
+        required = set()
+        for normalizer in self.normalizers:
+            required.update(normalizer.required_columns(columns, **kwargs))
+        return [column for column in columns if column in required]
+
+    def _get_rename(self, name):
+        """The rename option for a normalizer in the bundle."""
+        if self.rename is None:
+            return '{}_' + name
+        if isinstance(self.rename, dict):
+            return self.rename.get(name) or '{}_' + name
+        return self.rename[self.names.index(name)]
+
+
+def _unique_names(names: List[str]) -> List[str]:
+    """Number repeated names so each name is unique (e.g., ``lobanov2``)."""
+    unique = []
+    for name in names:
+        count = names[:len(unique)].count(name)
+        unique.append('{}{}'.format(name, count + 1) if count else name)
+    return unique
+
+
+def _bundle_worker(normalizer: Normalizer, **options) -> Normalizer:
+    """A copy of a normalizer with extra default options.
+
+    The ``stats_cache`` option is only set for normalizers
+    which use one (and have not been given one).
+    """
+    worker = copy.copy(normalizer)
+    worker.default_options = normalizer.default_options.copy()
+    worker.default_options['rename'] = options['rename']
+    if hasattr(worker, '_get_stats_cache') and worker.default_options.get('stats_cache') is None:
+        worker.default_options['stats_cache'] = options['stats_cache']
+    worker.plan = None
+    worker.plans = OrderedDict()
+    return worker
+
+
+def _normalize_shared_arrays(
+        normalizer: Normalizer,
+        shared: _SharedData) -> Dict[str, np.ndarray]:
+    """Normalize using arrays shared with other normalizers.
+
+    Only normalizers whose outputs are their formant columns,
+    which need no columns other than the speaker column
+    and which have a single formant specification
+    are normalized in this way.
+    Returns ``None`` if the normalizer cannot be
+    (in which case it should normalize the data frame).
+    """
+    config = normalizer.config
+    if (not isinstance(normalizer, (FormantGenericNormalizer, FormantSpecificNormalizer))
+            or config.get('outputs')
+            or set(config.get('columns', [])) - {'speaker'}
+            or normalizer.default_options.get('parameters') is not None
+            or (normalizer.default_options.get('groupby')
+                and not isinstance(normalizer, TransformNormalizer))
+            or normalizer.default_options.get('n_jobs')
+            or normalizer.default_options.get('executor')):
+        return None
+    # pylint: disable=protected-access
+    normalizer._setup(shared.df)
+    specs = list(normalizer._formant_iterator())
+    if len(specs) != 1:
+        return None
+    formant_spec = specs[0]
+    normalizer._set_params(shared.df, formant_spec)
+    formants = normalizer.params['formants']
+    if not formants:
+        return None
+    values = shared.values(formants)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = normalizer._norm_arrays(
+            values, shared.arrays(normalizer.options, formants))
+    if result is None or result.shape != values.shape:
+        return None
+    names = normalizer._get_output_names(
+        pd.DataFrame(columns=formants), formant_spec, formants)
+    return {new_column: result[:, formants.index(column)] for column, new_column in names}
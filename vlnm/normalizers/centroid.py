@@ -18,9 +18,10 @@ from typing import Any, Dict, List, Union
 
 import numpy as np
 import pandas as pd
-from scipy.spatial import ConvexHull
 
 from ..docstrings import docstring
+from ..geometry import ConvexHulls
+from ..stats import factorize, GroupStatistics
 from .base import classify, register, FormantGenericNormalizer, FormantSpecificNormalizer
 from .speaker import SpeakerNormalizer
 
@@ -54,6 +55,9 @@ LEXICAL_SET = [
     'comma'
 ]
 
+# Lexical set keywords of the vowels used by the Bigham normalizer.
+BIGHAM_POINTS = ['kit', 'goose', 'fleece', 'start', 'thought', 'trap']
+
 
 def _get_apice_formants(
         df: pd.DataFrame,
@@ -89,13 +93,7 @@ def _get_apice_formants(
         points = {key: key for key in df[vowel].unique()}
     vowels = list(points.values())
     vowels_df = df[df[vowel].isin(vowels)]
-    grouped = vowels_df.groupby(vowel)
-
-    def _agg(agg_df):
-        names = {f: agg_df[f].mean() for f in formants}
-        return pd.Series(names, index=formants)
-
-    apice_df = grouped.agg(_agg)[formants]
+    apice_df = vowels_df.groupby(vowel, observed=True)[formants].mean()
 
     # Rename the index using the apice map keys.
     secipa = {value: key for key, value in points.items()}
@@ -104,6 +102,56 @@ def _get_apice_formants(
     return apice_df
 
 
+def _get_points(points: Union[Dict[str, str], List[str]]) -> Dict[str, str]:
+    """Points of the vowel space as a dictionary mapping keywords on vowel labels."""
+    if isinstance(points, (list, tuple)):
+        return {point: point for point in points}
+    return points or {}
+
+
+def _get_point_means(
+        means: np.ndarray,
+        vowels: pd.Index,
+        points: Dict[str, str]) -> Dict[str, np.ndarray]:
+    """Formant means of the points of each speaker's vowel space.
+
+    Parameters
+    ----------
+    means:
+        Array of formant means with one row for each speaker,
+        one column for each vowel and one layer for each formant.
+    vowels:
+        The vowel labels of the columns of ``means``.
+    points:
+        A dictionary mapping keywords on vowel labels.
+
+    Returns
+    -------
+    :
+        A dictionary mapping each keyword on an array with
+        one row for each speaker and one column for each formant
+        (containing ``NaN`` if the vowel is not in the data).
+    """
+    index = vowels.get_indexer(list(points.values()))
+    missing = np.full((means.shape[0], means.shape[2]), np.nan)
+    return {
+        key: means[:, i] if i >= 0 else missing
+        for key, i in zip(points, index)}
+
+
+def _nanmean(values: np.ndarray, axis: int) -> np.ndarray:
+    """Mean ignoring missing values (``NaN`` if all values are missing)."""
+    count = np.sum(~np.isnan(values), axis=axis)
+    total = np.nansum(values, axis=axis)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def _get_formants(kwargs: Dict[str, Any]) -> List[str]:
+    """The formants in the options passed to a ``get_centroid`` method."""
+    return kwargs.get('formants') or [kwargs.get('f1') or 'f1', kwargs.get('f2') or 'f2']
+
+
 @docstring
 @register('centroid')
 @classify(vowel='extrinsic', formant='intrinsic', speaker='intrinsic')
@@ -140,6 +188,8 @@ class CentroidNormalizer(SpeakerNormalizer):
     ----------------
     rename:
     groupby:
+    n_jobs:
+    executor:
     kwargs:
 
 
@@ -158,7 +208,8 @@ class CentroidNormalizer(SpeakerNormalizer):
 
     config = dict(
         columns=['speaker', 'vowel'],
-        keywords=['speaker', 'vowel', 'points'])
+        keywords=['speaker', 'vowel', 'points'],
+        vectorized=True)
 
     def __init__(
             self,
@@ -178,23 +229,147 @@ class CentroidNormalizer(SpeakerNormalizer):
             groupby=groupby,
             **kwargs)
 
-    @staticmethod
+    @classmethod
     def get_centroid(
+            cls,
             df: pd.DataFrame,
             points: Dict[str, str] = None,
-            **kwargs):  # pylint: disable=missing-docstring
-        points = points or {}
-        formants = kwargs.get('formants', [])
-        vowel = kwargs.get('vowel', 'vowel')
-        apice_df = _get_apice_formants(df, points, vowel, formants)
-        centroid = apice_df.mean(axis=0)
-        return centroid
-
-    def _norm(self, df):
-        centroid = self.get_centroid(df, **self.params)
+            **kwargs) -> pd.Series:
+        """Calculate the centroid of a single speaker's vowel space.
+
+        Parameters
+        ----------
+        df:
+            The formant data for the speaker.
+        points:
+            The points of the vowel space.
+        **kwargs:
+            The normalizer options
+            (e.g., ``vowel`` and ``formants``).
+
+        Returns
+        -------
+        :
+            The formants of the centroid.
+        """
+        formants = _get_formants(kwargs)
+        stats = GroupStatistics.from_frame(df, kwargs.get('vowel') or 'vowel', formants)
+        means = stats.median() if kwargs.get('where') == 'median' else stats.mean()
+        centroids = cls.get_centroids(
+            means[np.newaxis], stats.labels, points,
+            **dict(kwargs, formants=formants))
+        return pd.Series(centroids[0], index=formants)
+
+    @staticmethod
+    def get_centroids(
+            means: np.ndarray,
+            vowels: pd.Index,
+            points: Dict[str, str] = None,
+            **kwargs) -> np.ndarray:
+        """Calculate the centroids of all speakers' vowel spaces.
+
+        Parameters
+        ----------
+        means:
+            Array of formant means with one row for each speaker,
+            one column for each vowel and one layer for each formant
+            (``NaN`` if a speaker did not produce the vowel).
+        vowels:
+            The vowel labels of the columns of ``means``.
+        points:
+            The points of the vowel space.
+        **kwargs:
+            The normalizer options.
+            The ``formants`` option names the formants in ``means``.
+
+        Returns
+        -------
+        :
+            An array with one row for each speaker and
+            one column for each formant.
+        """
+        points = _get_points(points)
+        if not points:
+            return _nanmean(means, axis=1)
+        point_means = _get_point_means(means, vowels, points)
+        return _nanmean(np.stack(list(point_means.values()), axis=1), axis=1)
+
+    def _get_vowel_means(self, stats, vowel_codes, n_vowels):
+        """Formant means of each vowel for each speaker."""
+        nested = stats.nested(vowel_codes, n_vowels)
+        if self.params.get('where') == 'median':
+            means = nested.median()
+        else:
+            means = nested.mean()
+        return means.reshape(stats.n_groups, n_vowels, stats.values.shape[1])
+
+    def _centroid_parameters(self, stats, vowel_codes, vowels):
+        """The centroid of each speaker, given the speaker statistics."""
+        means = self._get_vowel_means(stats, vowel_codes, len(vowels))
+        centroid = self.get_centroids(means, vowels, **self.params)
+        return dict(centroid=centroid)
+
+    def _point_labels(self) -> List:
+        """The vowel labels of the points of the vowel space."""
+        return list(_get_points(self.params.get('points')).values())
+
+    def _vowel_codes(self, df):
+        return factorize(df[self.params.get('vowel') or 'vowel'])
+
+    def _get_speaker_parameters(self, df, formants):
+        if self.params.get('parameters') is not None:
+            return super()._get_speaker_parameters(df, formants)
+        stats = self._speaker_stats(df, formants)
+        parameters = self._centroid_parameters(stats, *self._vowel_codes(df))
+        return {name: stats.broadcast(value) for name, value in parameters.items()}
+
+    def _fit(self, df):
+        formants = self.params['formants']
+        stats = self._speaker_stats(df, formants)
+        return self._parameter_table(
+            self._centroid_parameters(stats, *self._vowel_codes(df)),
+            stats.labels, formants)
+
+    def _partial_fit(self, df):
+        # Centroids cannot be calculated from merged speaker statistics.
+        raise NotImplementedError(
+            '{} cannot be fitted incrementally'.format(type(self).__name__))
+
+    def _norm_arrays(self, values, arrays, out=None):
+        codes, vowel_codes = arrays['speaker'], arrays['vowel']
+        if codes is None or vowel_codes is None:
+            raise ValueError(
+                '{} requires speaker and vowel codes'.format(type(self).__name__))
         formants = self.params['formants']
-        df[formants] /= centroid
-        return df
+        names = self._array_formants(formants)
+        columns = [j for j, formant in enumerate(formants) if formant in names]
+        if len(columns) < len(formants):
+            # Only the configured formants are normalized,
+            # and the other columns are passed through.
+            if out is None:
+                out = values.copy()
+            else:
+                out[...] = values
+            self.params['formants'] = [formants[j] for j in columns]
+            out[:, columns] = self._norm_arrays(values[:, columns], arrays)
+            return out
+        n_groups = int(codes.max()) + 1 if len(codes) else 0
+        stats = GroupStatistics(codes, n_groups, values)
+        vowels = arrays['vowel_labels']
+        if vowels is None:
+            vowels = pd.RangeIndex(int(vowel_codes.max()) + 1 if len(vowel_codes) else 0)
+            missing = [label for label in self._point_labels() if label not in vowels]
+            if missing:
+                raise ValueError(
+                    'Vowels {} are not vowel codes: '
+                    'vowel_labels must be given to resolve them'.format(missing))
+        parameters = {
+            name: stats.broadcast(value)
+            for name, value in self._centroid_parameters(stats, vowel_codes, vowels).items()}
+        return self._norm_values(values, parameters, out=out)
+
+    def _norm_values(self, values, parameters, out=None):
+        return np.divide(values, parameters['centroid'], out=out)
 
     @docstring
     def normalize(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
@@ -248,6 +423,8 @@ class ConvexHullNormalizer(CentroidNormalizer, FormantGenericNormalizer):
     ----------------
     rename:
     groupby:
+    n_jobs:
+    executor:
     kwargs:
 
 
@@ -283,22 +460,8 @@ class ConvexHullNormalizer(CentroidNormalizer, FormantGenericNormalizer):
             **kwargs)
 
     @staticmethod
-    def get_centroid(df, points=None, **kwargs):  # pylint: disable=missing-docstring
-        vowel = kwargs.get('vowel')
-        formants = kwargs.get('formants')
-        where = kwargs.get('where')
-
-        subset = [vowel]
-        subset.extend(formants)
-        if where == 'median':
-            means = df[subset].groupby(vowel).median().as_matrix()
-        else:
-            means = df[subset].groupby(vowel).mean().as_matrix()
-
-        hull = ConvexHull(means)
-        points = np.array([means[vertex] for vertex in hull.vertices])
-        centroid = points.mean(axis=0)
-        return centroid
+    def get_centroids(means, vowels, points=None, **kwargs):
+        return ConvexHulls(means).centroids()
 
     @docstring
     def normalize(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
@@ -368,6 +531,8 @@ class WattFabricius1Normalizer(CentroidNormalizer, FormantSpecificNormalizer):
     ----------------
     rename:
     groupby:
+    n_jobs:
+    executor:
     kwargs:
 
     Examples
@@ -414,17 +579,21 @@ class WattFabricius1Normalizer(CentroidNormalizer, FormantSpecificNormalizer):
             **kwargs)
 
     @staticmethod
-    def get_centroid(df, points=None, **kwargs):
+    def _get_apices(means, vowels, points, **kwargs):
+        """The fleece, trap and derived goose points of each speaker."""
         points = points or dict(fleece='fleece', trap='trap')
-        vowel = kwargs.get('vowel', 'vowel')
-        f1 = kwargs.get('f1', 'f1')
-        f2 = kwargs.get('f2', 'f2')
-        formants = [f1, f2]
-        apice_df = _get_apice_formants(df, points, vowel, formants)
-        apice_df.loc['goose'] = apice_df.loc['fleece']
-        apice_df.loc['goose', f2] = apice_df.loc['fleece', f1]
-        centroid = apice_df.mean(axis=0)
-        return centroid
+        formants = _get_formants(kwargs)
+        point_means = _get_point_means(means, vowels, points)
+        fleece, trap = point_means['fleece'], point_means['trap']
+        goose = fleece.copy()
+        goose[:, formants.index(kwargs.get('f2') or 'f2')] = (
+            fleece[:, formants.index(kwargs.get('f1') or 'f1')])
+        return fleece, trap, goose
+
+    @staticmethod
+    def get_centroids(means, vowels, points=None, **kwargs):
+        apices = WattFabricius1Normalizer._get_apices(means, vowels, points, **kwargs)
+        return _nanmean(np.stack(apices, axis=1), axis=1)
 
     @docstring
     def normalize(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
@@ -487,6 +656,8 @@ class WattFabricius2Normalizer(WattFabricius1Normalizer):
     ----------------
     rename:
     groupby:
+    n_jobs:
+    executor:
     kwargs:
 
     Examples
@@ -531,25 +702,13 @@ class WattFabricius2Normalizer(WattFabricius1Normalizer):
             **kwargs)
 
     @staticmethod
-    def get_centroid(df, points=None, **kwargs):
-        points = points or dict(fleece='fleece', trap='trap')
-        vowel = kwargs.get('vowel', 'vowel')
-        f1 = kwargs.get('f1', 'f1')
-        f2 = kwargs.get('f2', 'f2')
-
-        formants = [f1, f2]
-
-        apice_df = _get_apice_formants(df, points, vowel, formants)
-        apice_df.loc['goose'] = apice_df.loc['fleece']
-        apice_df.loc['goose', f2] = apice_df.loc['fleece', f1]
-
-        def _means(series):
-            if series.name == f2:
-                return series[['fleece', 'goose']].mean()
-            return series.mean()
-
-        centroid = apice_df.apply(_means)
-        return centroid
+    def get_centroids(means, vowels, points=None, **kwargs):
+        fleece, trap, goose = WattFabricius1Normalizer._get_apices(
+            means, vowels, points, **kwargs)
+        centroids = _nanmean(np.stack([fleece, trap, goose], axis=1), axis=1)
+        j = _get_formants(kwargs).index(kwargs.get('f2') or 'f2')
+        centroids[:, j] = _nanmean(np.stack([fleece[:, j], goose[:, j]], axis=1), axis=1)
+        return centroids
 
     @docstring
     def normalize(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
@@ -612,6 +771,8 @@ class WattFabricius3Normalizer(WattFabricius1Normalizer):
     ----------------
     rename:
     groupby:
+    n_jobs:
+    executor:
     kwargs:
 
 
@@ -653,20 +814,15 @@ class WattFabricius3Normalizer(WattFabricius1Normalizer):
             **kwargs)
 
     @staticmethod
-    def get_centroid(df, points=None, **kwargs):
-        formants = kwargs.get('formants')
-        vowel = kwargs.get('vowel', 'vowel')
-        apice_df = _get_apice_formants(df, points or {}, vowel, formants)
-
-        def _agg(agg_df):
-            names = {f: agg_df[f].mean() for f in formants}
-            return pd.Series(names, index=formants)
-
+    def get_centroids(means, vowels, points=None, **kwargs):
+        points = _get_points(points)
+        if points:
+            apices = list(_get_point_means(means, vowels, points).values())
+        else:
+            apices = list(np.moveaxis(means, 1, 0))
         # Minimum mean of all vowels (same as minimum mean of point vowels)
-        apice_df.loc['goose'] = df.groupby(vowel).apply(_agg).min(axis=0)
-
-        centroid = apice_df.mean(axis=0)
-        return centroid
+        apices.append(np.fmin.reduce(means, axis=1, initial=np.nan))
+        return _nanmean(np.stack(apices, axis=1), axis=1)
 
     @docstring
     def normalize(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
@@ -750,6 +906,8 @@ class BighamNormalizer(CentroidNormalizer, FormantSpecificNormalizer):
     ----------------
     rename:
     groupby:
+    n_jobs:
+    executor:
     kwargs:
 
 
@@ -796,31 +954,28 @@ class BighamNormalizer(CentroidNormalizer, FormantSpecificNormalizer):
         return super().normalize(df, **kwargs)
 
     @staticmethod
-    def get_centroid(
-            df: pd.DataFrame,
-            points: Dict[str, str] = None, **kwargs):
-
-        f1 = kwargs.get('f1')
-        f2 = kwargs.get('f2')
-        formants = [f1, f2]
-        vowel = kwargs.get('vowel')
-        apice_df = _get_apice_formants(df, points, vowel, formants)
+    def get_centroids(means, vowels, points=None, **kwargs):
+        formants = _get_formants(kwargs)
+        j = formants.index(kwargs.get('f1') or 'f1')
+        points = points or {key: key for key in BIGHAM_POINTS}
+        point_means = _get_point_means(means, vowels, points)
 
-        centroid_df = apice_df.copy()
+        goose = point_means['goose'].copy()
+        goose[:, j] = point_means['fleece'][:, j]
+        fleece = point_means['fleece'].copy()
+        fleece[:, j] = point_means['kit'][:, j]
+        start = _nanmean(
+            np.stack([point_means['start'], point_means['thought']], axis=1), axis=1)
 
-        centroid_df.loc['goose', f1] = centroid_df.loc['fleece', f1]
-        centroid_df.loc['fleece', f1] = centroid_df.loc['kit', f1]
-        centroid_df.loc['start'] = centroid_df.loc[
-            ['start', 'thought']].mean(axis=0)
+        apices = [goose, fleece, start, point_means['trap']]
+        return _nanmean(np.stack(apices, axis=1), axis=1)
 
-        centroid_df.drop(['kit', 'thought'], axis=0, inplace=True)
-        centroid = centroid_df.mean(axis=0)
-        return centroid
+    def _point_labels(self) -> List:
+        return super()._point_labels() or list(BIGHAM_POINTS)
 
     def _keyword_default(self, keyword: str, df: pd.DataFrame = None) -> Any:
         if keyword == 'points':
-            lexical_set = ['kit', 'goose', 'fleece', 'start', 'thought', 'trap']
-            return {key: key for key in lexical_set}
+            return {key: key for key in BIGHAM_POINTS}
         return super()._keyword_default(keyword, df=df)
 
 
@@ -849,6 +1004,8 @@ class SchwaNormalizer(CentroidNormalizer):
     ----------------
     rename:
     groupby:
+    n_jobs:
+    executor:
     kwargs:
 
 
@@ -886,16 +1043,18 @@ class SchwaNormalizer(CentroidNormalizer):
             groupby=groupby,
             **kwargs)
 
-    def _normalize(self, df):
-        schwa = self.options['schwa'] or 'ə'
-        self.options['points'] = {'letter': schwa}
-        return super()._normalize(df)
+    @staticmethod
+    def get_centroids(means, vowels, points=None, **kwargs):
+        points = points or {'letter': kwargs.get('schwa') or 'ə'}
+        return CentroidNormalizer.get_centroids(means, vowels, points)
 
-    def _norm(self, df):
-        df = super()._norm(df)
-        formants = self.params['formants']
-        df[formants] -= 1.
-        return df
+    def _point_labels(self) -> List:
+        return super()._point_labels() or [self.params.get('schwa') or 'ə']
+
+    def _norm_values(self, values, parameters, out=None):
+        values = super()._norm_values(values, parameters, out=out)
+        values -= 1.
+        return values
 
     @docstring
     def normalize(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
@@ -22,6 +22,8 @@ from .base import (
 from ..conversion import (
     hz_to_bark,
     hz_to_erb,
+    hz_to_log,
+    hz_to_log10,
     hz_to_mel)
 
 
@@ -188,7 +190,7 @@ class Log10Normalizer(FormantsTransformNormalizer):
         norm_df.head()
 
     """
-    config = dict(transform=np.log10)
+    config = dict(transform=hz_to_log10)
 
     def __init__(
             self,
@@ -245,7 +247,7 @@ class LogNormalizer(FormantsTransformNormalizer):
         norm_df.head()
 
     """
-    config = dict(transform=np.log)
+    config = dict(transform=hz_to_log)
 
     def __init__(
             self,
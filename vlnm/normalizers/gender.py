@@ -118,6 +118,12 @@ class BladenNormalizer(SpeakerNormalizer, FormantGenericNormalizer):
             axis=0).T
         return hz_to_bark(df[formants]) - indicator
 
+    def _norm_arrays(self, values, arrays, out=None):
+        female = _gender_mask(self, arrays)
+        out = hz_to_bark(values, out=np.empty_like(values) if out is None else out)
+        out -= female[:, np.newaxis]
+        return out
+
     @docstring
     def normalize(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
         return super().normalize(df, **kwargs)
@@ -215,8 +221,19 @@ class NordstromNormalizer(SpeakerNormalizer, FormantSpecificNormalizer):
         return super()._keyword_default(keyword, df=df)
 
     def _prenormalize(self, df):
+        table = self.options.get('parameters')
+        if table is not None:
+            self.options['constants'] = {
+                key: table.loc[key, 'f3'] for key in ['mu_female', 'mu_male']}
+            return df
         return self.get_f3_means(df)
 
+    def _fit(self, df):
+        constants = self.options['constants']
+        return pd.DataFrame(
+            dict(f3=list(constants.values())),
+            index=pd.Index(list(constants.keys()), name='parameter'))
+
     def get_f3_means(self, df):
         gender = self.options['gender']
         female = self.options['female']
@@ -249,9 +266,35 @@ class NordstromNormalizer(SpeakerNormalizer, FormantSpecificNormalizer):
                 1. + indicator * (mu_male / mu_female - 1.)))
         return df
 
+    def _norm_arrays(self, values, arrays, out=None):
+        female = _gender_mask(self, arrays)
+        formants = self.params['formants']
+        if 'f1' not in formants or 'f3' not in formants:
+            raise ValueError('{} requires f1 and f3'.format(type(self).__name__))
+        f1 = values[:, formants.index('f1')]
+        f3 = values[:, formants.index('f3')]
+        mu_female = _mean(f3[female & (f1 > 600)])
+        mu_male = _mean(f3[~female & (f1 > 600)])
+        scale = 1. + female.astype(float) * (mu_male / mu_female - 1.)
+        return np.multiply(values, scale[:, np.newaxis], out=out)
+
     @docstring
     def normalize(
             self,
             df: pd.DataFrame,
             **kwargs) -> pd.DataFrame:
         return super().normalize(df, **kwargs)
+
+
+def _gender_mask(normalizer, arrays):
+    """Return the gender mask required by :meth:`normalize_arrays`."""
+    if arrays['gender'] is None:
+        raise ValueError(
+            '{} requires a gender mask'.format(type(normalizer).__name__))
+    return arrays['gender']
+
+
+def _mean(values):
+    """Mean ignoring missing values (``NaN`` if there are none)."""
+    values = values[~np.isnan(values)]
+    return values.mean() if len(values) else np.nan
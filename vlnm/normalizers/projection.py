@@ -57,9 +57,21 @@ class SupervisedProjectionNormalizer(FormantGenericNormalizer):
         df[new_columns] = fit[:, :self.n_components]
         return df
 
+    def _norm_arrays(self, values, arrays, out=None):
+        if arrays['vowel'] is None:
+            raise ValueError(
+                '{} requires vowel codes'.format(type(self).__name__))
+        fit = self.estimator.fit_transform(values, arrays['vowel'])
+        return fit[:, :self.n_components]
+
     def _get_outputs(self):
         return ['f{}'.format(i + 1) for i in range(self.n_components)]
 
+    def _fit(self, df):
+        raise NotImplementedError(
+            '{} cannot be fitted separately from normalization'.format(
+                type(self).__name__))
+
 
 @uninstantiable
 class UnsupervisedProjectionNormalizer(FormantGenericNormalizer):
@@ -86,9 +98,17 @@ class UnsupervisedProjectionNormalizer(FormantGenericNormalizer):
         df[new_columns] = fit[:, :self.n_components]
         return df
 
+    def _norm_arrays(self, values, arrays, out=None):
+        return self.estimator.fit_transform(values)[:, :self.n_components]
+
     def _get_outputs(self):
         return ['f{}'.format(i + 1) for i in range(self.n_components)]
 
+    def _fit(self, df):
+        raise NotImplementedError(
+            '{} cannot be fitted separately from normalization'.format(
+                type(self).__name__))
+
 
 @docstring
 @register('lda')
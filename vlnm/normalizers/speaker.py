@@ -7,29 +7,248 @@ Speaker-based normalizers
     :module: vlnm.normalizers.speaker
 
 """
+from concurrent.futures import ProcessPoolExecutor
+import heapq
+import os
 from typing import List, Union
 
 import numpy as np
 import pandas as pd
 
 from ..docstrings import docstring
+from ..stats import (
+    factorize, GroupStatistics, RunningStatistics, StatisticsCache, STATISTICS_CACHE)
 from .base import register, classify
 from .base import uninstantiable, Normalizer, FormantGenericNormalizer, FormantSpecificNormalizer
 
 
 @uninstantiable
 class SpeakerNormalizer(Normalizer):
-    """Base class for speaker intrinsic normalizers."""
+    """Base class for speaker intrinsic normalizers.
+
+    Subclasses whose ``config`` sets ``vectorized`` to ``True``
+    normalize all speakers at once, using the parameters
+    returned by the :meth:`_speaker_parameters` method.
+    Otherwise, the ``_norm`` method is called for each speaker in turn.
+
+    As speakers are normalized independently, the data
+    can be split into shards of whole speakers
+    which are normalized in parallel,
+    by setting the ``n_jobs`` option
+    (or passing a :class:`concurrent.futures.Executor`
+    in the ``executor`` option).
+
+    Speaker statistics can be shared with other normalizers
+    by passing a :class:`vlnm.stats.StatisticsCache`
+    in the ``stats_cache`` option
+    (or ``True`` to use :data:`vlnm.stats.STATISTICS_CACHE`).
+
+    If the ``groupby`` option is given, speakers are
+    nested within the groups (so the same speaker label
+    in different groups is treated as a different speaker),
+    and vectorized subclasses normalize all the groups at once.
+    """
 
     config = dict(
-        columns=['speaker']
+        columns=['speaker'],
+        vectorized=False
     )
 
     def _normalize(self, df):
-        speaker = self.options.get('speaker') or 'speaker'
-        return df.groupby(by=speaker, as_index=False).apply(
+        n_jobs = self._get_n_jobs()
+        executor = self.options.get('executor')
+        if executor is not None or n_jobs > 1:
+            return self._normalize_parallel(df, n_jobs, executor)
+        return self._normalize_speakers(df)
+
+    def _normalize_groups(self, df, groups):
+        if not self.config.get('vectorized'):
+            return super()._normalize_groups(df, groups)
+        # The groups are nested in the speaker key (see _speaker_key).
+        self._prenormalize(df)
+        return self._normalize(df)
+
+    def _normalize_speakers(self, df):
+        """Normalize the speakers in a data frame in this process."""
+        if self.config.get('vectorized') or self.options.get('parameters') is not None:
+            return super()._normalize(df.copy())
+        speaker = self._speaker_key(self.options)
+        return df.groupby(by=speaker, as_index=False, group_keys=False).apply(
             super()._normalize)
 
+    @staticmethod
+    def _speaker_key(options: dict) -> Union[str, List[str]]:
+        """The speaker column, preceded by any ``groupby`` columns."""
+        speaker = options.get('speaker') or 'speaker'
+        groups = options.get('groupby') or []
+        groups = [groups] if isinstance(groups, str) else list(groups)
+        return groups + [speaker] if groups else speaker
+
+    def _get_n_jobs(self):
+        """Number of processes used for normalization."""
+        n_jobs = self.options.get('n_jobs') or 1
+        if n_jobs < 0:
+            n_jobs = max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+        return n_jobs
+
+    def _normalize_parallel(self, df, n_jobs, executor=None):
+        """Normalize shards of speakers in parallel.
+
+        The rows of each shard keep their relative order,
+        so the original row order is restored by sorting
+        on the row positions of the shards.
+        """
+        speaker = self._speaker_key(self.options)
+        if executor is not None and not self.options.get('n_jobs'):
+            n_jobs = getattr(executor, '_max_workers', None) or os.cpu_count() or 1
+        shards = _speaker_shards(df[speaker], n_jobs)
+        if len(shards) < 2:
+            return self._normalize_speakers(df)
+
+        worker = self._copy_for_worker()
+        own_executor = executor is None
+        if own_executor:
+            executor = ProcessPoolExecutor(max_workers=len(shards))
+        try:
+            frames = list(executor.map(
+                _normalize_shard,
+                [worker] * len(shards),
+                [df.take(shard) for shard in shards]))
+        finally:
+            if own_executor:
+                executor.shutdown()
+
+        norm_df = pd.concat(frames)
+        return norm_df.take(np.argsort(np.concatenate(shards), kind='stable'))
+
+    def _copy_for_worker(self):
+        """A copy of the normalizer to be sent to worker processes."""
+        worker = type(self).__new__(type(self))
+        worker.__dict__.update(self.__dict__)
+        worker.options = {
+            key: value for key, value in self.options.items()
+            if key not in ['n_jobs', 'executor', 'result_cache']}
+        worker.default_options = {
+            key: value for key, value in self.default_options.items()
+            if key not in ['n_jobs', 'executor', 'result_cache']}
+        return worker
+
+    def _speaker_stats(self, df, formants):
+        """Summary statistics of the formants for each speaker."""
+        speaker = self._speaker_key(self.params)
+        cache = self._get_stats_cache()
+        if cache is None:
+            return GroupStatistics.from_frame(df, speaker, formants)
+        return cache.statistics(df, speaker, formants)
+
+    def _get_stats_cache(self) -> StatisticsCache:
+        """The statistics cache given in the ``stats_cache`` option."""
+        cache = self.options.get('stats_cache')
+        if cache is True:
+            return STATISTICS_CACHE
+        if cache is False:
+            return None
+        return cache
+
+    def _speaker_parameters(self, stats):  # pylint: disable=no-self-use,unused-argument
+        """Speaker parameters calculated from the speaker statistics.
+
+        Implemented by vectorized subclasses, returning a
+        dictionary mapping parameter names on arrays with
+        one row for each speaker and one column for each formant.
+        """
+        return {}
+
+    def _norm_values(self, values, parameters, out=None):  # pylint: disable=no-self-use,unused-argument
+        """Normalize an array of formants given the speaker parameters for each row.
+
+        Implemented by vectorized subclasses.
+        """
+        return values
+
+    def _norm(self, df):
+        if not self.config.get('vectorized'):
+            return super()._norm(df)
+        formants = self.params['formants']
+        parameters = self._get_speaker_parameters(df, formants)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            df[formants] = self._norm_values(df[formants].values, parameters)
+        return df
+
+    def _norm_arrays(self, values, arrays, out=None):
+        if not self.config.get('vectorized'):
+            return None
+        codes = arrays['speaker']
+        if codes is None:
+            raise ValueError(
+                '{} requires speaker codes'.format(type(self).__name__))
+        stats = arrays.get('stats')
+        if stats is None:
+            n_groups = int(codes.max()) + 1 if len(codes) else 0
+            stats = GroupStatistics(codes, n_groups, values)
+        parameters = {
+            name: stats.broadcast(value)
+            for name, value in self._speaker_parameters(stats).items()}
+        return self._norm_values(values, parameters, out=out)
+
+    def _get_speaker_parameters(self, df, formants):
+        """Speaker parameters for each row of the data frame."""
+        table = self.params.get('parameters')
+        if table is None:
+            stats = self._speaker_stats(df, formants)
+            return {
+                name: stats.broadcast(value)
+                for name, value in self._speaker_parameters(stats).items()}
+        speaker = self._speaker_key(self.params)
+        return {
+            name: self._lookup_parameter(df, name, speaker, formants)
+            for name in table.index.get_level_values('parameter').unique()}
+
+    def _fit(self, df):
+        if not self.config.get('vectorized'):
+            return None
+        formants = self.params['formants']
+        stats = self._speaker_stats(df, formants)
+        return self._parameter_table(
+            self._speaker_parameters(stats), stats.labels, formants)
+
+    def _partial_fit(self, df):
+        if not self.config.get('vectorized'):
+            return super()._partial_fit(df)
+        formants = self.params['formants']
+        stats = self.partial_stats.setdefault(tuple(formants), RunningStatistics())
+        stats.update(self._speaker_stats(df, formants))
+        return self._parameter_table(
+            self._speaker_parameters(stats), stats.labels, formants)
+
+
+def _speaker_shards(
+        speakers: Union[pd.Series, pd.DataFrame],
+        n_shards: int) -> List[np.ndarray]:
+    """Partition rows into shards of whole speakers with similar numbers of rows.
+
+    Speakers are assigned, largest first, to the shard
+    with the fewest rows so far.
+    """
+    codes, labels = factorize(speakers)
+    counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+    n_shards = max(1, min(n_shards, len(labels)))
+    heap = [(0, shard) for shard in range(n_shards)]
+    assignment = np.zeros(len(labels), dtype=np.intp)
+    for code in np.argsort(-counts, kind='stable'):
+        size, shard = heapq.heappop(heap)
+        assignment[code] = shard
+        heapq.heappush(heap, (size + counts[code], shard))
+    row_shards = np.where(codes >= 0, assignment[np.where(codes >= 0, codes, 0)], 0)
+    return [
+        np.flatnonzero(row_shards == shard) for shard in range(n_shards)
+        if np.any(row_shards == shard)]
+
+
+def _normalize_shard(normalizer: SpeakerNormalizer, df: pd.DataFrame) -> pd.DataFrame:
+    """Normalize a shard of speakers (in a worker process)."""
+    return normalizer._normalize_speakers(df)  # pylint: disable=protected-access
+
 
 @docstring
 @register('gerstman')
@@ -56,6 +275,10 @@ class GerstmanNormalizer(SpeakerNormalizer, FormantGenericNormalizer):
     ----------------
     rename:
     groupby:
+    n_jobs:
+    executor:
+    stats_cache:
+    result_cache:
     kwargs:
 
 
@@ -71,6 +294,8 @@ class GerstmanNormalizer(SpeakerNormalizer, FormantGenericNormalizer):
         norm_df.head()
     """
 
+    config = dict(vectorized=True)
+
     def __init__(
             self,
             formants: List[str] = None,
@@ -89,12 +314,13 @@ class GerstmanNormalizer(SpeakerNormalizer, FormantGenericNormalizer):
     def normalize(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
         return super().normalize(df)
 
-    def _norm(self, df):
-        formants = self.params['formants']
-        fmin = df[formants].min(axis=0)
-        fmax = df[formants].max(axis=0)
-        df[formants] = 999 * (df[formants] - fmin) / (fmax - fmin)
-        return df
+    def _speaker_parameters(self, stats):
+        return dict(min=stats.min(), max=stats.max())
+
+    def _norm_values(self, values, parameters, out=None):
+        fmin, fmax = parameters['min'], parameters['max']
+        out = np.multiply(999, np.subtract(values, fmin, out=out), out=out)
+        return np.divide(out, fmax - fmin, out=out)
 
 
 @docstring
@@ -122,6 +348,10 @@ class LCENormalizer(SpeakerNormalizer, FormantGenericNormalizer):
     ----------------
     rename:
     groupby:
+    n_jobs:
+    executor:
+    stats_cache:
+    result_cache:
     kwargs:
 
 
@@ -138,6 +368,8 @@ class LCENormalizer(SpeakerNormalizer, FormantGenericNormalizer):
 
     """
 
+    config = dict(vectorized=True)
+
     def __init__(
             self, speaker: str = 'speaker', formants: List[str] = None,
             rename: Union[str, dict] = None,
@@ -154,10 +386,11 @@ class LCENormalizer(SpeakerNormalizer, FormantGenericNormalizer):
     def normalize(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
         return super().normalize(df)
 
-    def _norm(self, df):
-        formants = self.params['formants']
-        df[formants] = df[formants] / df[formants].max(axis=0)
-        return df
+    def _speaker_parameters(self, stats):
+        return dict(max=stats.max())
+
+    def _norm_values(self, values, parameters, out=None):
+        return np.divide(values, parameters['max'], out=out)
 
 
 @docstring
@@ -190,6 +423,10 @@ class LobanovNormalizer(SpeakerNormalizer, FormantGenericNormalizer):
     ----------------
     rename:
     groupby:
+    n_jobs:
+    executor:
+    stats_cache:
+    result_cache:
     kwargs:
 
 
@@ -206,6 +443,8 @@ class LobanovNormalizer(SpeakerNormalizer, FormantGenericNormalizer):
 
     """
 
+    config = dict(vectorized=True)
+
     def __init__(
             self, speaker: str = 'speaker', formants: List[str] = None,
             rename: Union[str, dict] = None,
@@ -222,12 +461,12 @@ class LobanovNormalizer(SpeakerNormalizer, FormantGenericNormalizer):
     def normalize(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
         return super().normalize(df)
 
-    def _norm(self, df):
-        formants = self.params['formants']
-        mean = df[formants].mean(axis=0)
-        std = df[formants].std(axis=0)
-        df[formants] = (df[formants] - mean) / std
-        return df
+    def _speaker_parameters(self, stats):
+        return dict(mean=stats.mean(), std=stats.std())
+
+    def _norm_values(self, values, parameters, out=None):
+        out = np.subtract(values, parameters['mean'], out=out)
+        return np.divide(out, parameters['std'], out=out)
 
 
 @docstring
@@ -260,6 +499,10 @@ class NearyNormalizer(SpeakerNormalizer, FormantGenericNormalizer):
     ----------------
     rename:
     groupby:
+    n_jobs:
+    executor:
+    stats_cache:
+    result_cache:
     kwargs:
 
 
@@ -277,7 +520,8 @@ class NearyNormalizer(SpeakerNormalizer, FormantGenericNormalizer):
     """
     config = dict(
         columns=['speaker'],
-        keywords=['speaker', 'exp']
+        keywords=['speaker', 'exp'],
+        vectorized=True
     )
 
     def __init__(
@@ -298,13 +542,14 @@ class NearyNormalizer(SpeakerNormalizer, FormantGenericNormalizer):
             return False
         return super()._keyword_default(keyword, df=df)
 
-    def _norm(self, df):
-        formants = self.params['formants']
-        logs = np.log(df[formants])
-        df[formants] = np.log(df[formants]) - logs.mean(axis=0)
-        if self.params['exp']:
-            df[formants] = np.exp(df[formants])
-        return df
+    def _speaker_parameters(self, stats):
+        return dict(log_mean=stats.log_mean())
+
+    def _norm_values(self, values, parameters, out=None):
+        out = np.subtract(np.log(values, out=out), parameters['log_mean'], out=out)
+        if self.params.get('exp'):
+            np.exp(out, out=out)
+        return out
 
 
 @docstring
@@ -326,6 +571,10 @@ class NearyExpNormalizer(NearyNormalizer):
     ----------------
     rename:
     groupby:
+    n_jobs:
+    executor:
+    stats_cache:
+    result_cache:
     kwargs:
 
 
@@ -393,6 +642,10 @@ class NearyGMNormalizer(SpeakerNormalizer, FormantSpecificNormalizer):
     ----------------
     rename:
     groupby:
+    n_jobs:
+    executor:
+    stats_cache:
+    result_cache:
     kwargs:
 
 
@@ -411,7 +664,8 @@ class NearyGMNormalizer(SpeakerNormalizer, FormantSpecificNormalizer):
 
     config = dict(
         columns=['speaker'],
-        keywords=['speaker', 'exp']
+        keywords=['speaker', 'exp'],
+        vectorized=True
     )
 
     def __init__(
@@ -439,13 +693,17 @@ class NearyGMNormalizer(SpeakerNormalizer, FormantSpecificNormalizer):
             return False
         return super()._keyword_default(keyword, df=df)
 
-    def _norm(self, df):
-        formants = self.params['formants']
-        logs = np.log(df[formants])
-        df[formants] = logs - logs.mean(axis=0).mean()
-        if self.params['exp']:
-            df[formants] = np.exp(df[formants])
-        return df
+    def _speaker_parameters(self, stats):
+        return dict(log_mean=stats.log_mean())
+
+    def _norm_values(self, values, parameters, out=None):
+        log_means = parameters['log_mean']
+        valid = ~np.isnan(log_means)
+        grand_mean = np.where(valid, log_means, 0.).sum(axis=1) / valid.sum(axis=1)
+        out = np.subtract(np.log(values, out=out), grand_mean[:, np.newaxis], out=out)
+        if self.params.get('exp'):
+            np.exp(out, out=out)
+        return out
 
 
 @docstring
@@ -467,6 +725,10 @@ class NearyGMExpNormalizer(NearyNormalizer):
     ----------------
     rename:
     groupby:
+    n_jobs:
+    executor:
+    stats_cache:
+    result_cache:
     kwargs:
 
 
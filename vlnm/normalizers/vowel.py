@@ -16,8 +16,9 @@ import pandas as pd
 
 from ..conversion import hz_to_bark
 from ..docstrings import docstring
+from ..stats import GroupStatistics
 from .base import register, classify
-from .base import FormantSpecificNormalizer
+from .base import _accepts_out, FormantSpecificNormalizer
 
 
 @docstring
@@ -98,19 +99,42 @@ class IEGMAGMNormalizer(FormantSpecificNormalizer):
             groupby=groupby,
             **kwargs)
 
-    def _norm(self, df):
+    def _fit(self, df):
         f1, f2, f3 = self.params['f1'], self.params['f2'], self.params['f3']
         vowel = self.params['vowel']
         gma_df = df[[f1, f2, f3, vowel]].groupby(vowel).mean()
+        return self._parameter_table(
+            dict(mean=gma_df.values), gma_df.index, [f1, f2, f3])
 
-        def _denorm(_vowel):
-            _df = gma_df.loc[_vowel, pd.IndexSlice[[f1, f2, f3]]]
-            return _df
-        df[[f1, f2]] = df[[f1, f2]].div(
-            np.cbrt(df[[f1, f2, f3]].apply(np.prod, axis=1)), axis=0).mul(
-                np.cbrt(np.prod(df[vowel].astype(object).apply(_denorm).values, axis=1)), axis=0)
+    def _norm(self, df):
+        f1, f2, f3 = self.params['f1'], self.params['f2'], self.params['f3']
+        vowel = self.params['vowel']
+        table = self.params.get('parameters')
+        if table is None:
+            table = self._fit(df)
+        gma_df = table.xs('mean', level='parameter')
+
+        # Geometric mean of the vowel means, gathered for each token.
+        gma = np.append(np.cbrt(np.prod(gma_df[[f1, f2, f3]].values, axis=1)), np.nan)
+        index = gma_df.index.get_indexer(df[vowel])
+
+        df[[f1, f2]] = (
+            df[[f1, f2]].values / _geometric_mean(df[[f1, f2, f3]].values) *
+            gma[index][:, np.newaxis])
         return df
 
+    def _norm_arrays(self, values, arrays, out=None):
+        codes = _require(self, arrays, 'vowel')
+        columns = _formant_indices(self.params['formants'], ['f1', 'f2', 'f3'])
+        n_groups = int(codes.max()) + 1 if len(codes) else 0
+        means = GroupStatistics(codes, n_groups, values[:, columns]).mean()
+        gma = np.append(np.cbrt(np.prod(means, axis=1)), np.nan)
+        out = _copy_values(values, out)
+        out[:, columns[:2]] = (
+            values[:, columns[:2]] / _geometric_mean(values[:, columns]) *
+            gma[codes][:, np.newaxis])
+        return out
+
 
 @docstring
 @register('ie-ht')
@@ -232,42 +256,125 @@ class IEHTNormalizer(FormantSpecificNormalizer):
             groupby=groupby,
             **kwargs)
 
-    def _norm(self, df):
+    def _fit(self, df):
         f1, f2, f3 = self.params['f1'], self.params['f2'], self.params['f3']
         vowel = self.params['vowel']
 
         bootstrap_df = df[[f1, f2, vowel]].groupby(vowel).mean()
-        beta = bootstrap_df.values
 
         # Normalize
-        df[[f1, f2]] = df[[f1, f2]].div(
-            np.cbrt(df[[f1, f2, f3]].apply(np.prod, axis=1)), axis=0)
+        dnm_df = df[[f1, f2, vowel]].copy()
+        dnm_df[[f1, f2]] = df[[f1, f2]].values / _geometric_mean(df[[f1, f2, f3]].values)
 
         # Bootstrap denormalization
-        def _denorm(_vowel):
-            _df = bootstrap_df.loc[_vowel, pd.IndexSlice[[f1, f2]]]
-            return _df
-        dnm_df = df.copy()
-        dnm_df[[f1, f2]] = dnm_df[[f1, f2]].mul(
-            dnm_df[vowel].astype(object).apply(_denorm).values, axis=0)
+        index = bootstrap_df.index.get_indexer(dnm_df[vowel])
+        dnm_df[[f1, f2]] = dnm_df[[f1, f2]].values * bootstrap_df[[f1, f2]].values[index]
         mu = dnm_df[[f1, f2, vowel]].groupby(vowel).mean().values
         sigma = dnm_df[[f1, f2, vowel]].groupby(vowel).std().values
-        vowels = [group[0] for group in dnm_df.groupby(vowel)]
-        del dnm_df
+        return self._parameter_table(
+            dict(mean=bootstrap_df.values, mu=mu, sigma=sigma),
+            bootstrap_df.index,
+            [f1, f2])
+
+    def _norm(self, df):
+        f1, f2, f3 = self.params['f1'], self.params['f2'], self.params['f3']
+        vowel = self.params['vowel']
+
+        table = self.params.get('parameters')
+        if table is None:
+            table = self._fit(df)
+        bootstrap_df = table.xs('mean', level='parameter')
+        beta = bootstrap_df[[f1, f2]].values
+        mu = table.xs('mu', level='parameter')[[f1, f2]].values
+        sigma = table.xs('sigma', level='parameter')[[f1, f2]].values
+        vowels = np.array(list(bootstrap_df.index), dtype=object)
+
+        # Normalize
+        normalized = df[[f1, f2]].values / _geometric_mean(df[[f1, f2, f3]].values)
 
         # Actual denormalization
-        def _test(_df):
-            dnm = _df[[f1, f2]].values * beta
-            distances = (((dnm - mu) / sigma) ** 2).sum(axis=1)
-            index = np.argmin(distances)
-            return pd.Series(dict(
-                f1=dnm[index, 0],
-                f2=dnm[index, 1],
-                vowel=vowels[index]))
-
-        df[[f1, f2, vowel]] = df[[f1, f2, vowel]].apply(_test, axis=1)
+        index = _nearest_vowels(normalized, beta, mu, sigma)
+        df[f1] = normalized[:, 0] * beta[index, 0]
+        df[f2] = normalized[:, 1] * beta[index, 1]
+        df[vowel] = vowels[index]
         return df
 
+    def _norm_arrays(self, values, arrays, out=None):
+        codes = _require(self, arrays, 'vowel')
+        columns = _formant_indices(self.params['formants'], ['f1', 'f2', 'f3'])
+        formants = values[:, columns[:2]]
+        n_groups = int(codes.max()) + 1 if len(codes) else 0
+        means = GroupStatistics(codes, n_groups, formants)
+        beta = np.append(means.mean(), np.full((1, formants.shape[1]), np.nan), axis=0)
+
+        normalized = formants / _geometric_mean(values[:, columns])
+        stats = GroupStatistics(codes, n_groups, normalized * beta[codes])
+        # Only vowels with tokens are candidates for relabelling.
+        vowels = np.flatnonzero(means.count().max(axis=1) > 0)
+        index = vowels[_nearest_vowels(
+            normalized, beta[vowels], stats.mean()[vowels], stats.std()[vowels])]
+
+        out = _copy_values(values, out)
+        out[:, columns[:2]] = normalized * beta[index]
+        return out
+
+
+def _require(normalizer, arrays, key):
+    """Return an array required by :meth:`normalize_arrays`."""
+    if arrays[key] is None:
+        raise ValueError(
+            '{} requires {} codes'.format(type(normalizer).__name__, key))
+    return arrays[key]
+
+
+def _formant_indices(formants: List[str], required: List[str]) -> List[int]:
+    """Positions of formants in the columns of an array."""
+    missing = [formant for formant in required if formant not in formants]
+    if missing:
+        raise ValueError('Formants {} not in the array'.format(', '.join(missing)))
+    return [formants.index(formant) for formant in required]
+
+
+def _copy_values(values: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """Copy values to an output array."""
+    if out is None:
+        return values.copy()
+    out[...] = values
+    return out
+
+
+def _geometric_mean(values: np.ndarray) -> np.ndarray:
+    """Geometric mean of each row, ignoring missing values."""
+    return np.cbrt(np.nanprod(values, axis=1))[:, np.newaxis]
+
+
+def _nearest_vowels(
+        values: np.ndarray,
+        beta: np.ndarray,
+        mu: np.ndarray,
+        sigma: np.ndarray,
+        block_size: int = 2 ** 20) -> np.ndarray:
+    """Index of the nearest vowel for each row of normalized formants.
+
+    For each row, the formants denormalized by the mean formants
+    of each vowel (``beta``) are standardized by the
+    distribution of the denormalized formants of that vowel
+    (``mu`` and ``sigma``), and the vowel with the smallest
+    squared distance is chosen.
+    The (rows × vowels) distance matrix is calculated in blocks
+    of at most ``block_size`` elements.
+    """
+    n_rows, n_vowels = values.shape[0], beta.shape[0]
+    index = np.zeros(n_rows, dtype=np.intp)
+    if n_vowels == 0:
+        return index
+    step = max(1, block_size // n_vowels)
+    for start in range(0, n_rows, step):
+        block = values[start:start + step, np.newaxis, :]
+        distances = (((block * beta - mu) / sigma) ** 2).sum(axis=2)
+        index[start:start + step] = np.argmin(distances, axis=1)
+    return index
+
 
 @docstring
 @register('barkdiff')
@@ -355,20 +462,37 @@ class BarkDifferenceNormalizer(FormantSpecificNormalizer):
 
     def _norm(self, df):
 
-        transform = self.config['transform']
+        transform = self.params.get('transform') or self.config['transform']
         f0 = self.params['f0']
         f1 = self.params['f1']
         f2 = self.params['f2']
         f3 = self.params['f3']
 
-        z0 = transform(df[f0]) if f0 in df else None
-        z1 = transform(df[f1])
-        z2 = transform(df[f2])
-        z3 = transform(df[f3])
+        formants = [f0, f1, f2, f3] if f0 in df else [f1, f2, f3]
+        if _accepts_out(transform):
+            values = df[formants].values
+            if values.dtype not in (np.float32, np.float64):
+                values = values.astype(np.float64)
+            z = transform(values, out=np.empty(values.shape, dtype=values.dtype))
+        else:
+            z = np.asarray(transform(df[formants]))
 
-        if z0 is not None:
-            df['f1'] = z1 - z0
-        df['f2'] = z2 - z1
-        df['f3'] = z3 - z2
+        # Differences between consecutive formants, in place.
+        np.subtract(z[:, 1:], z[:, :-1], out=z[:, 1:])
+        for i, column in enumerate(['f1', 'f2', 'f3'][4 - len(formants):]):
+            df[column] = z[:, i + 1]
 
         return df
+
+    def _norm_arrays(self, values, arrays, out=None):
+        transform = self.params.get('transform') or self.config['transform']
+        formants = self.params['formants']
+        required = ['f1', 'f2', 'f3']
+        if 'f0' in formants:
+            required.insert(0, 'f0')
+        z = values[:, _formant_indices(formants, required)]
+        if _accepts_out(transform):
+            z = transform(z, out=z)
+        else:
+            z = np.asarray(transform(z), dtype=float)
+        return np.subtract(z[:, 1:], z[:, :-1], out=out)
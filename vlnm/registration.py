@@ -4,11 +4,120 @@ helper functions for documenting normalizer classes
 and registering them for use with the :func:`normalize` function.
 """
 
+import importlib
 from typing import Callable, Dict, List, Type, Union
 
 from .utils import nameify
 
-NORMALIZERS = {}
+# The registered names of the normalizers distributed with vlnm
+# and the modules in which they are defined,
+# so that a module is only imported when one of its normalizers is used.
+MANIFEST = {
+    'bark': 'vlnm.normalizers.formant',
+    'barkdiff': 'vlnm.normalizers.vowel',
+    'bigham': 'vlnm.normalizers.centroid',
+    'bladen': 'vlnm.normalizers.gender',
+    'centroid': 'vlnm.normalizers.centroid',
+    'chain': 'vlnm.normalizers.base',
+    'convex-hull': 'vlnm.normalizers.centroid',
+    'default': 'vlnm.normalizers.base',
+    'erb': 'vlnm.normalizers.formant',
+    'factor-analysis': 'vlnm.normalizers.projection',
+    'fast-ica': 'vlnm.normalizers.projection',
+    'gerstman': 'vlnm.normalizers.speaker',
+    'ie-gmagm': 'vlnm.normalizers.vowel',
+    'ie-ht': 'vlnm.normalizers.vowel',
+    'lce': 'vlnm.normalizers.speaker',
+    'lda': 'vlnm.normalizers.projection',
+    'lobanov': 'vlnm.normalizers.speaker',
+    'log': 'vlnm.normalizers.formant',
+    'log10': 'vlnm.normalizers.formant',
+    'mel': 'vlnm.normalizers.formant',
+    'neary': 'vlnm.normalizers.speaker',
+    'neary-exp': 'vlnm.normalizers.speaker',
+    'nearygm': 'vlnm.normalizers.speaker',
+    'nearygm-exp': 'vlnm.normalizers.speaker',
+    'nmf': 'vlnm.normalizers.projection',
+    'nordstrom': 'vlnm.normalizers.gender',
+    'pca': 'vlnm.normalizers.projection',
+    'schwa': 'vlnm.normalizers.centroid',
+    'wattfab1': 'vlnm.normalizers.centroid',
+    'wattfab2': 'vlnm.normalizers.centroid',
+    'wattfab3': 'vlnm.normalizers.centroid',
+}
+
+
+class _Deferred:
+    """Placeholder for a normalizer whose module has not been imported."""
+
+    def __init__(self, module: str):
+        self.module = module
+
+    def __repr__(self):
+        return '<deferred {}>'.format(self.module)
+
+
+class NormalizerRegistry(dict):
+    """Register of normalizer classes which imports modules on demand.
+
+    Names in the manifest are available before
+    the modules defining them have been imported.
+    The module is imported the first time the class is looked up
+    (registering the class as a side effect);
+    otherwise the registry behaves like a dictionary.
+
+    Parameters
+    ----------
+    manifest:
+        A dictionary mapping normalizer names to the
+        (fully qualified) names of the modules which register them.
+    """
+
+    def __init__(self, manifest: Dict[str, str] = None):
+        super().__init__()
+        for name, module in (manifest or {}).items():
+            super().__setitem__(name, _Deferred(module))
+
+    def __getitem__(self, name):
+        value = super().__getitem__(name)
+        if isinstance(value, _Deferred):
+            importlib.import_module(value.module)
+            value = super().__getitem__(name)
+            if isinstance(value, _Deferred):
+                raise ImportError(
+                    'Module {} did not register normalizer {}'.format(
+                        value.module, nameify([name], quote='\'')))
+        return value
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    def values(self):
+        return [self[name] for name in self]
+
+    def items(self):
+        return [(name, self[name]) for name in self]
+
+    def module(self, name: str) -> str:
+        """Return the module defining a normalizer without importing it.
+
+        Parameters
+        ----------
+        name:
+            The name of a registered normalizer.
+
+        Returns
+        -------
+        :
+            The name of the module.
+        """
+        value = super().__getitem__(name)
+        if isinstance(value, _Deferred):
+            return value.module
+        return value.__module__
+
+
+NORMALIZERS = NormalizerRegistry(MANIFEST)
 
 
 def register_normalizer(
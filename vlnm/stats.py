@@ -0,0 +1,670 @@
+"""
+Grouped statistics
+~~~~~~~~~~~~~~~~~~
+
+The :mod:`vlnm.stats` module provides vectorized
+calculation of summary statistics for groups of rows
+(for example, all the tokens produced by a speaker).
+Group labels are factorized into integer codes
+and each statistic is calculated for all groups at once
+using segmented NumPy reductions,
+avoiding calling Python code for each group.
+
+Statistics for a data frame can be shared between normalizers
+using a :class:`StatisticsCache`.
+"""
+
+from collections import OrderedDict
+import hashlib
+import threading
+from typing import List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+def factorize(
+        keys: Union[pd.Series, pd.DataFrame, np.ndarray]) -> Tuple[np.ndarray, pd.Index]:
+    """Convert group labels to integer codes.
+
+    Parameters
+    ----------
+    keys:
+        The group labels.
+        If a data frame, each group is a unique combination
+        of the values in its columns (see :func:`factorize_columns`).
+
+    Returns
+    -------
+    :
+        A tuple containing an array of integer codes
+        (with ``-1`` for missing labels)
+        and the (sorted) unique labels.
+    """
+    if isinstance(keys, pd.DataFrame):
+        return factorize_columns(keys)
+    codes, uniques = pd.factorize(keys, sort=True)
+    return codes.astype(np.intp, copy=False), pd.Index(uniques, name=getattr(keys, 'name', None))
+
+
+def factorize_columns(df: pd.DataFrame) -> Tuple[np.ndarray, pd.MultiIndex]:
+    """Convert combinations of labels in several columns to integer codes.
+
+    Each column is factorized separately
+    and the column codes are combined into a single code
+    (as digits in a mixed radix number),
+    so the codes are in the lexicographic order of the labels.
+    Combinations which do not occur in the data are then removed.
+
+    Parameters
+    ----------
+    df:
+        The data frame containing the label columns.
+
+    Returns
+    -------
+    :
+        A tuple containing an array of integer codes
+        (with ``-1`` for rows where any label is missing)
+        and the (sorted) unique label combinations.
+    """
+    combined = np.zeros(len(df), dtype=np.int64)
+    missing = np.zeros(len(df), dtype=bool)
+    size = 1
+    levels, level_codes = [], []
+    for column in df.columns:
+        codes, uniques = factorize(df[column])
+        missing |= codes < 0
+        radix = max(len(uniques), 1)
+        if size * radix >= 2 ** 62:
+            # Renumber the codes so far to avoid overflow.
+            combined, first = _compact(combined, missing)
+            size = len(first)
+        combined = combined * radix + np.where(codes >= 0, codes, 0)
+        size *= radix
+        levels.append(uniques)
+        level_codes.append(codes)
+
+    combined, first = _compact(combined, missing)
+    labels = pd.MultiIndex(
+        levels=levels, codes=[codes[first] for codes in level_codes],
+        names=list(df.columns), verify_integrity=False)
+    return combined, labels
+
+
+def _compact(combined: np.ndarray, missing: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Renumber combined codes consecutively (``-1`` for missing rows).
+
+    Also returns the first row with each code.
+    """
+    rows = np.flatnonzero(~missing)
+    _, first, inverse = np.unique(
+        combined[rows], return_index=True, return_inverse=True)
+    codes = np.full(len(combined), -1, dtype=np.intp)
+    codes[rows] = inverse.ravel()
+    return codes, rows[first]
+
+
+class GroupStatistics:
+    r"""Summary statistics for groups of rows.
+
+    Statistics are calculated on first access
+    and missing values are ignored,
+    in the same way as the corresponding :class:`pandas.DataFrame` methods.
+    Each statistic is returned as an array with one row for each group
+    and one column for each column in the data.
+
+    Parameters
+    ----------
+    codes:
+        Integer group codes for each row, as returned by :func:`factorize`.
+        Rows with a code of ``-1`` are ignored.
+    n_groups:
+        The number of groups.
+    values:
+        Two-dimensional array with one row for each code.
+    labels:
+        Optional group labels, as returned by :func:`factorize`.
+
+    Examples
+    --------
+
+    .. ipython::
+
+        from vlnm import pb1952
+        from vlnm.stats import GroupStatistics
+
+        df = pb1952(['speaker', 'vowel', 'f1', 'f2'])
+        stats = GroupStatistics.from_frame(df, 'speaker', ['f1', 'f2'])
+        stats.mean()[:5]
+
+    """
+
+    def __init__(
+            self,
+            codes: np.ndarray,
+            n_groups: int,
+            values: np.ndarray,
+            labels: pd.Index = None):
+        self.codes = np.asarray(codes)
+        self.n_groups = n_groups
+        self.labels = labels
+        self.values = np.asarray(values, dtype=float)
+        if self.values.ndim == 1:
+            self.values = self.values[:, np.newaxis]
+        self._cache = {}
+
+    @classmethod
+    def from_frame(
+            cls,
+            df: pd.DataFrame,
+            by: Union[str, List[str]],
+            columns: List[str]) -> 'GroupStatistics':
+        """Create group statistics from a data frame.
+
+        Parameters
+        ----------
+        df:
+            The data frame.
+        by:
+            The column containing the group labels
+            (or a list of columns, whose combinations are the groups).
+        columns:
+            The columns for which statistics are calculated.
+
+        Returns
+        -------
+        :
+            A :class:`GroupStatistics` instance.
+        """
+        codes, labels = factorize(df[by])
+        return cls(codes, len(labels), df[columns].values, labels=labels)
+
+    def _cached(self, name, func):
+        if name not in self._cache:
+            self._cache[name] = func()
+        return self._cache[name]
+
+    def _flat_codes(self):
+        """Valid rows and a code for each (row, column) pair of the valid rows.
+
+        This allows all the columns to be summed with a single
+        call to :func:`numpy.bincount`.
+        """
+        def _flat():
+            valid = self.codes >= 0
+            codes = self.codes if valid.all() else self.codes[valid]
+            n_columns = self.values.shape[1]
+            flat = (codes[:, np.newaxis] * n_columns + np.arange(n_columns)).ravel()
+            return (None if codes is self.codes else valid), flat
+        return self._cached('flat_codes', _flat)
+
+    def _sum(self, values):
+        valid, flat = self._flat_codes()
+        if valid is not None:
+            values = values[valid]
+        weights = np.where(np.isnan(values), 0., values).ravel()
+        return np.bincount(
+            flat, weights=weights,
+            minlength=self.n_groups * values.shape[1]).reshape(self.n_groups, values.shape[1])
+
+    def _segments(self):
+        """Order of the valid rows sorted by group, and the start of each group."""
+        def _sort():
+            valid = np.flatnonzero(self.codes >= 0)
+            codes = self.codes[valid]
+            if np.any(codes[1:] < codes[:-1]):
+                order = np.argsort(codes, kind='stable')
+                valid, codes = valid[order], codes[order]
+            starts = np.flatnonzero(np.concatenate(([True], codes[1:] != codes[:-1]))[:len(codes)])
+            return valid, codes[starts], starts
+        return self._cached('segments', _sort)
+
+    def _reduce(self, ufunc, fill):
+        result = np.full((self.n_groups, self.values.shape[1]), np.nan)
+        rows, groups, starts = self._segments()
+        if not len(rows):
+            return result
+        values = self.values[rows]
+        values = np.where(np.isnan(values), fill, values)
+        result[groups] = ufunc.reduceat(values, starts, axis=0)
+        result[self.count() == 0] = np.nan
+        return result
+
+    def count(self) -> np.ndarray:
+        """Number of non-missing values in each group."""
+        return self._cached(
+            'count', lambda: self._sum((~np.isnan(self.values)).astype(float)))
+
+    def sum(self) -> np.ndarray:
+        """Sum of each group."""
+        return self._cached('sum', lambda: self._sum(self.values))
+
+    def mean(self) -> np.ndarray:
+        """Mean of each group."""
+        def _mean():
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return self.sum() / self.count()
+        return self._cached('mean', _mean)
+
+    def std(self, ddof: int = 1) -> np.ndarray:
+        """Standard deviation of each group.
+
+        Parameters
+        ----------
+        ddof:
+            Delta degrees of freedom.
+            Defaults to ``1``.
+        """
+        def _std():
+            dof = self.count() - ddof
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return np.where(
+                    dof > 0, np.sqrt(self.squared_deviations() / dof), np.nan)
+        return self._cached('std:{}'.format(ddof), _std)
+
+    def squared_deviations(self) -> np.ndarray:
+        """Sum of squared deviations from the mean of each group."""
+        def _squared_deviations():
+            deviations = self.values - self.broadcast(self.mean())
+            return self._sum(deviations ** 2)
+        return self._cached('squared_deviations', _squared_deviations)
+
+    def min(self) -> np.ndarray:
+        """Minimum of each group."""
+        return self._cached('min', lambda: self._reduce(np.minimum, np.inf))
+
+    def max(self) -> np.ndarray:
+        """Maximum of each group."""
+        return self._cached('max', lambda: self._reduce(np.maximum, -np.inf))
+
+    def median(self) -> np.ndarray:
+        """Median of each group."""
+        def _median():
+            result = np.full((self.n_groups, self.values.shape[1]), np.nan)
+            rows, groups, starts = self._segments()
+            if not len(rows):
+                return result
+            codes = self.codes[rows]
+            counts = self.count()[groups].astype(np.intp)
+            for j in range(self.values.shape[1]):
+                # Sort each group by value (missing values sort last).
+                column = self.values[rows, j]
+                column = column[np.lexsort((column, codes))]
+                lower = column[starts + np.maximum(counts[:, j] - 1, 0) // 2]
+                upper = column[starts + counts[:, j] // 2]
+                result[groups, j] = np.where(
+                    counts[:, j] > 0, (lower + upper) / 2., np.nan)
+            return result
+        return self._cached('median', _median)
+
+    def nested(
+            self,
+            codes: np.ndarray,
+            n_groups: int) -> 'GroupStatistics':
+        """Statistics for groups nested within these groups.
+
+        Each nested group is the combination of one of these groups
+        and one of the groups given by ``codes``
+        (e.g., the tokens of each vowel produced by each speaker).
+        Statistics of the nested groups can be reshaped
+        to an array with one row for each of these groups,
+        one column for each of the groups given by ``codes``
+        and one layer for each column of the data, using
+        ``stat.reshape(self.n_groups, n_groups, -1)``.
+
+        Parameters
+        ----------
+        codes:
+            Integer codes for each row, as returned by :func:`factorize`.
+        n_groups:
+            The number of groups given by ``codes``.
+
+        Returns
+        -------
+        :
+            A :class:`GroupStatistics` instance.
+        """
+        codes = np.asarray(codes)
+        combined = np.where(
+            (self.codes >= 0) & (codes >= 0), self.codes * n_groups + codes, -1)
+        return GroupStatistics(combined, self.n_groups * n_groups, self.values)
+
+    def logs(self) -> 'GroupStatistics':
+        """Statistics for the natural logarithm of the data."""
+        def _logs():
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return GroupStatistics(
+                    self.codes, self.n_groups, np.log(self.values),
+                    labels=self.labels)
+        return self._cached('logs', _logs)
+
+    def log_mean(self) -> np.ndarray:
+        """Mean of the natural logarithm of each group."""
+        return self._cached('log_mean', lambda: self.logs().mean())
+
+    def broadcast(self, stat: np.ndarray) -> np.ndarray:
+        """Expand a group statistic to one row for each row of the data.
+
+        Parameters
+        ----------
+        stat:
+            An array with one row for each group.
+
+        Returns
+        -------
+        :
+            An array with one row for each row of the data.
+            Rows without a group are set to ``NaN``.
+        """
+        stat = np.asarray(stat, dtype=float)
+        if stat.shape[0] == 0:
+            return np.full((len(self.codes),) + stat.shape[1:], np.nan)
+        valid, _ = self._flat_codes()
+        if valid is None:
+            return stat[self.codes]
+        expanded = stat[np.where(valid, self.codes, 0)]
+        expanded[~valid] = np.nan
+        return expanded
+
+
+def fingerprint(df: pd.DataFrame, columns: List[str] = None) -> str:
+    """Fingerprint the contents of a data frame.
+
+    Data frames with the same values in the same columns
+    have the same fingerprint, whatever their index.
+
+    Parameters
+    ----------
+    df:
+        The data frame.
+    columns:
+        The columns included in the fingerprint.
+        If omitted, all columns are included.
+
+    Returns
+    -------
+    :
+        A hexadecimal digest.
+    """
+    if columns is not None:
+        df = df[list(columns)]
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(list(df.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+class StatisticsCache:
+    r"""A cache of group statistics shared between normalizers.
+
+    Statistics are keyed by a :func:`fingerprint` of the grouping
+    and data columns, so normalizing the same data
+    (or a copy of it) with several normalizers
+    calculates each group statistic at most once.
+    As the key depends on the contents of the data,
+    statistics are never reused after the data are modified.
+    The least recently used statistics are discarded
+    when the cache is full.
+
+    Parameters
+    ----------
+    maxsize:
+        The maximum number of data sets
+        for which statistics are kept.
+
+    Examples
+    --------
+
+    .. ipython::
+
+        from vlnm import pb1952, LobanovNormalizer, NearyNormalizer
+        from vlnm.stats import StatisticsCache
+
+        df = pb1952(['speaker', 'vowel', 'f1', 'f2'])
+        cache = StatisticsCache()
+        lobanov_df = LobanovNormalizer(stats_cache=cache).normalize(df)
+        neary_df = NearyNormalizer(stats_cache=cache).normalize(df)
+        cache.hits, cache.misses
+
+    """
+
+    def __init__(self, maxsize: int = 16):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Cached statistics are not sent to other processes.
+        state = self.__dict__.copy()
+        state.update(_entries=OrderedDict(), _lock=None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def statistics(
+            self,
+            df: pd.DataFrame,
+            by: Union[str, List[str]],
+            columns: List[str]) -> GroupStatistics:
+        """Return the group statistics for a data frame.
+
+        Parameters
+        ----------
+        df:
+            The data frame.
+        by:
+            The column containing the group labels
+            (or a list of columns, whose combinations are the groups).
+        columns:
+            The columns for which statistics are calculated.
+
+        Returns
+        -------
+        :
+            A :class:`GroupStatistics` instance
+            (which calculates each statistic on first access).
+        """
+        columns = list(columns)
+        by = by if isinstance(by, str) else tuple(by)
+        key = (fingerprint(df, _by_columns(by) + columns), by, tuple(columns))
+        with self._lock:
+            stats = self._entries.get(key)
+            if stats is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return stats
+            self.misses += 1
+        stats = GroupStatistics.from_frame(
+            df, by if isinstance(by, str) else list(by), columns)
+        with self._lock:
+            stats = self._entries.setdefault(key, stats)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return stats
+
+    def invalidate(self, df: pd.DataFrame = None):
+        """Discard cached statistics.
+
+        Parameters
+        ----------
+        df:
+            Discard the statistics for this data frame.
+            If omitted, all statistics are discarded.
+        """
+        with self._lock:
+            if df is None:
+                self._entries.clear()
+                return
+            for key in list(self._entries):
+                _, by, columns = key
+                columns = _by_columns(by) + list(columns)
+                if all(column in df for column in columns):
+                    if key[0] == fingerprint(df, columns):
+                        del self._entries[key]
+
+    def clear(self):
+        """Discard all cached statistics and reset the counters."""
+        self.invalidate()
+        self.hits = self.misses = 0
+
+
+def _by_columns(by: Union[str, Tuple[str]]) -> List[str]:
+    """The grouping columns as a list."""
+    return [by] if isinstance(by, str) else list(by)
+
+
+#: Cache used by speaker normalizers created with ``stats_cache=True``.
+STATISTICS_CACHE = StatisticsCache()
+
+
+class RunningStatistics:
+    r"""Group statistics accumulated over chunks of data.
+
+    The statistics stored for each group
+    (count, mean, sum of squared deviations, minimum, maximum
+    and the count and sum of the logarithms)
+    can be merged without access to the original data,
+    so data can be processed in chunks of bounded size.
+    Means and deviations are merged using the method of
+    :citet:`chan_etal_1979`.
+    The statistics are available through the same methods
+    as :class:`GroupStatistics`.
+
+    Examples
+    --------
+
+    .. ipython::
+
+        from vlnm import pb1952
+        from vlnm.stats import GroupStatistics, RunningStatistics
+
+        df = pb1952(['speaker', 'vowel', 'f1', 'f2'])
+        running = RunningStatistics()
+        for i in range(0, len(df), 500):
+            running.update(
+                GroupStatistics.from_frame(df[i:i + 500], 'speaker', ['f1', 'f2']))
+        running.mean()[:5]
+
+    """
+
+    def __init__(self):
+        self.labels = pd.Index([])
+        self._stats = {}
+
+    def update(self, stats: GroupStatistics) -> 'RunningStatistics':
+        """Merge the statistics for a chunk of data.
+
+        Parameters
+        ----------
+        stats:
+            Statistics for a chunk of data,
+            which must have group labels.
+
+        Returns
+        -------
+        :
+            The running statistics.
+        """
+        logs = stats.logs()
+        chunk = dict(
+            count=stats.count(),
+            mean=np.nan_to_num(stats.mean()),
+            squared_deviations=stats.squared_deviations(),
+            min=np.where(stats.count() > 0, stats.min(), np.inf),
+            max=np.where(stats.count() > 0, stats.max(), -np.inf),
+            log_count=logs.count(),
+            log_sum=logs.sum())
+
+        if not self._stats:
+            # Copy the statistics, which are merged in place
+            # (and may be cached by the chunk statistics).
+            self.labels = stats.labels
+            self._stats = {name: np.array(value, copy=True) for name, value in chunk.items()}
+            return self
+
+        new_labels = stats.labels.difference(self.labels)
+        if not new_labels.empty:
+            self.labels = self.labels.append(new_labels)
+            initial = dict(min=np.inf, max=-np.inf)
+            for name, value in self._stats.items():
+                padding = np.full(
+                    (len(new_labels), value.shape[1]), initial.get(name, 0.))
+                self._stats[name] = np.vstack([value, padding])
+
+        index = self.labels.get_indexer(stats.labels)
+        merged = {name: value[index] for name, value in self._stats.items()}
+
+        count = merged['count'] + chunk['count']
+        delta = chunk['mean'] - merged['mean']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight = np.where(count > 0, chunk['count'] / count, 0.)
+        merged['squared_deviations'] = (
+            merged['squared_deviations'] + chunk['squared_deviations'] +
+            delta ** 2 * merged['count'] * weight)
+        merged['mean'] = merged['mean'] + delta * weight
+        merged['count'] = count
+        merged['min'] = np.minimum(merged['min'], chunk['min'])
+        merged['max'] = np.maximum(merged['max'], chunk['max'])
+        merged['log_count'] = merged['log_count'] + chunk['log_count']
+        merged['log_sum'] = merged['log_sum'] + chunk['log_sum']
+
+        for name, value in merged.items():
+            self._stats[name][index] = value
+        return self
+
+    def _missing(self, value, count=None):
+        count = self._stats['count'] if count is None else count
+        return np.where(count > 0, value, np.nan)
+
+    def count(self) -> np.ndarray:
+        """Number of non-missing values in each group."""
+        return self._stats['count']
+
+    def sum(self) -> np.ndarray:
+        """Sum of each group."""
+        return self._stats['mean'] * self._stats['count']
+
+    def mean(self) -> np.ndarray:
+        """Mean of each group."""
+        return self._missing(self._stats['mean'])
+
+    def squared_deviations(self) -> np.ndarray:
+        """Sum of squared deviations from the mean of each group."""
+        return self._stats['squared_deviations']
+
+    def std(self, ddof: int = 1) -> np.ndarray:
+        """Standard deviation of each group.
+
+        Parameters
+        ----------
+        ddof:
+            Delta degrees of freedom.
+            Defaults to ``1``.
+        """
+        dof = self._stats['count'] - ddof
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(
+                dof > 0, np.sqrt(self._stats['squared_deviations'] / dof), np.nan)
+
+    def min(self) -> np.ndarray:
+        """Minimum of each group."""
+        return self._missing(self._stats['min'])
+
+    def max(self) -> np.ndarray:
+        """Maximum of each group."""
+        return self._missing(self._stats['max'])
+
+    def log_mean(self) -> np.ndarray:
+        """Mean of the natural logarithm of each group."""
+        count = self._stats['log_count']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self._missing(self._stats['log_sum'] / count, count=count)